@@ -28,6 +28,7 @@ python3 manage.py migrate
 
 echo "Updating Wireshark Ethernet database..."
 python3 lib/manuf/manuf/manuf.py --update
+python3 lib/manuf/manuf/index.py
 
 echo "Initialization done!"
 
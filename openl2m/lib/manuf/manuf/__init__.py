@@ -1,2 +1,3 @@
 from . import manuf
 from .manuf import MacParser
+from .index import OuiIndex, get_oui_index
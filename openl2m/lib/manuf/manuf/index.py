@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+#
+# This file is part of Open Layer 2 Management (OpenL2M).
+#
+# OpenL2M is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.  You should have received a copy of the GNU General Public
+# License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
+#
+"""Compiled, memory-mapped index of Wireshark's OUI database.
+
+MacParser() reads and parses the whole manuf file every time it is created. This index is built once from
+the manuf file, and stored in a binary file next to it ("manuf.idx"). The index file is memory-mapped,
+so all (web server) processes on a host share the same memory pages.
+
+For each mask length in the database, the index has a sorted array of the MAC prefixes (the MAC address
+shifted right by the mask bits), and an array of the vendor of each prefix. A lookup is a binary search
+in each array, most specific mask first. Recent lookups are kept in a LRU cache.
+
+The index stores the size and modification time of the manuf file it was built from. If the manuf file
+changes (e.g. "manuf.py --update"), the index is rebuilt when loaded. To rebuild it ahead of time, run:
+
+    python3 index.py [--manuf <manuf file>]
+"""
+import argparse
+import bisect
+import functools
+import mmap
+import os
+import struct
+import sys
+import threading
+
+try:
+    from .manuf import MacParser, Vendor
+except ImportError:
+    # when run as a script:
+    from manuf import MacParser, Vendor
+
+# file layout, all little-endian:
+#   header: magic, manuf file size, manuf file mtime_ns, number of masks, number of vendors
+#   masks: for each mask (most specific first): mask bits, number of prefixes, offset of prefixes, offset of vendors
+#   vendor offsets: number of vendors + 1 offsets into the vendor strings
+#   vendor strings: utf-8, 'manuf\tmanuf_long\tcomment'
+#   prefix arrays (uint64) and vendor arrays (uint32), 8-byte aligned
+_MAGIC = b'OL2MOUI1'
+_HEADER = struct.Struct('<8sQQII')
+_MASK = struct.Struct('<IIQQ')
+
+INDEX_FILE_EXTENSION = '.idx'
+
+# the number of recent lookups to remember:
+LRU_CACHE_SIZE = 4096
+
+
+class OuiIndex(object):
+    """A compiled OUI index, see module description. Lookups are compatible with MacParser().
+
+    Args:
+        manuf_name (str): Location of the manuf database file. Defaults to the manuf file of MacParser().
+        index_name (str): Location of the index file. Defaults to the manuf file name with ".idx" added.
+            If missing or out of date, it is (re)built. If it cannot be written, the index is kept in memory.
+
+    Raises:
+        IOError: If the manuf file could not be found.
+    """
+
+    def __init__(self, manuf_name=None, index_name=None):
+        self._manuf_name = manuf_name or MacParser.get_packaged_manuf_file_path()
+        self._index_name = index_name or self._manuf_name + INDEX_FILE_EXTENSION
+        self._mmap = None
+        data = self._open()
+        if data is None:
+            data = build_index(manuf_name=self._manuf_name)
+            try:
+                write_index(data=data, index_name=self._index_name)
+                data = self._open()
+            except OSError:
+                # read-only install, use from memory
+                pass
+        self._load(data)
+        self._lookup = functools.lru_cache(maxsize=LRU_CACHE_SIZE)(self._search)
+
+    def _open(self):
+        """Memory-map the index file, if it exists and matches the manuf file. Returns None if not."""
+        try:
+            manuf_stat = os.stat(self._manuf_name)
+            with open(self._index_name, 'rb') as index_file:
+                data = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(data) < _HEADER.size:
+            data.close()
+            return None
+        (magic, size, mtime_ns, mask_count, vendor_count) = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC or size != manuf_stat.st_size or mtime_ns != manuf_stat.st_mtime_ns:
+            data.close()
+            return None
+        self._mmap = data
+        return data
+
+    def _load(self, data):
+        """Set the arrays from the index data (bytes or mmap)."""
+        (magic, size, mtime_ns, mask_count, vendor_count) = _HEADER.unpack_from(data, 0)
+        view = memoryview(data)
+        self._masks = []
+        position = _HEADER.size
+        for _ in range(mask_count):
+            (mask, count, prefixes_offset, vendors_offset) = _MASK.unpack_from(data, position)
+            position += _MASK.size
+            prefixes = view[prefixes_offset : prefixes_offset + 8 * count].cast('Q')
+            vendors = view[vendors_offset : vendors_offset + 4 * count].cast('I')
+            self._masks.append((mask, prefixes, vendors))
+        self._vendor_offsets = view[position : position + 4 * (vendor_count + 1)].cast('I')
+        self._strings = view[position + 4 * (vendor_count + 1) :]
+
+    def _get_vendor(self, index):
+        """Return the Vendor() tuple at index in the vendor strings."""
+        data = bytes(self._strings[self._vendor_offsets[index] : self._vendor_offsets[index + 1]])
+        fields = [field if field else None for field in data.decode('utf-8').split('\t')]
+        return Vendor(manuf=fields[0], manuf_long=fields[1], comment=fields[2])
+
+    def _search(self, mac_int, bits_left):
+        """Find the most specific Vendor() for a 48-bit MAC integer with bits_left unknown bits, or None."""
+        for mask, prefixes, vendors in self._masks:
+            # If the user only gave us X bits, check X bits. No partial matching!
+            if mask < bits_left:
+                continue
+            prefix = mac_int >> mask
+            position = bisect.bisect_left(prefixes, prefix)
+            if position < len(prefixes) and prefixes[position] == prefix:
+                return self._get_vendor(vendors[position])
+        return None
+
+    def get_all(self, mac):
+        """Get a Vendor tuple containing (manuf, manuf_long, comment) from a MAC address.
+
+        Args:
+            mac (str): MAC address in standard format.
+
+        Returns:
+            Vendor: Vendor namedtuple. All fields are None if not found.
+
+        Raises:
+            ValueError: If the MAC could not be parsed.
+        """
+        mac_str = MacParser._pattern.sub("", mac)
+        bits_left = MacParser._bits_left(mac_str)
+        try:
+            if bits_left < 0:
+                raise ValueError
+            # Fill in missing bits with zeroes
+            mac_int = int(mac_str, 16) << bits_left
+        except ValueError:
+            raise ValueError("Could not parse MAC: {0}".format(mac_str))
+        vendor = self._lookup(mac_int, bits_left)
+        if vendor is None:
+            return Vendor(manuf=None, manuf_long=None, comment=None)
+        return vendor
+
+    def get_manuf(self, mac):
+        """Returns manufacturer from a MAC address, or None if not found."""
+        return self.get_all(mac).manuf
+
+    def get_manuf_long(self, mac):
+        """Returns manufacturer long name from a MAC address, or None if not found."""
+        return self.get_all(mac).manuf_long
+
+    def get_comment(self, mac):
+        """Returns comment from a MAC address, or None if not found."""
+        return self.get_all(mac).comment
+
+
+def build_index(manuf_name=None):
+    """Parse the manuf file, and return the index data (bytes).
+
+    Args:
+        manuf_name (str): Location of the manuf database file. Defaults to the manuf file of MacParser().
+
+    Raises:
+        IOError: If manuf file could not be found.
+    """
+    manuf_name = manuf_name or MacParser.get_packaged_manuf_file_path()
+    manuf_stat = os.stat(manuf_name)
+    parser = MacParser(manuf_name=manuf_name)
+
+    # unique vendors, and the prefixes per mask:
+    vendor_ids = {}
+    masks = {}
+    for (mask, prefix), vendor in parser._masks.items():
+        key = '\t'.join(field or '' for field in vendor)
+        vendor_id = vendor_ids.setdefault(key, len(vendor_ids))
+        masks.setdefault(mask, []).append((prefix, vendor_id))
+
+    strings = bytearray()
+    vendor_offsets = []
+    for key in vendor_ids.keys():
+        vendor_offsets.append(len(strings))
+        strings += key.encode('utf-8')
+    vendor_offsets.append(len(strings))
+
+    header = _HEADER.pack(_MAGIC, manuf_stat.st_size, manuf_stat.st_mtime_ns, len(masks), len(vendor_ids))
+    tables_size = _MASK.size * len(masks) + 4 * len(vendor_offsets) + len(strings)
+    # the arrays start 8-byte aligned after the tables:
+    offset = (len(header) + tables_size + 7) & ~7
+    mask_table = bytearray()
+    arrays = bytearray()
+    # the lowest mask is the most specific, so search that first:
+    for mask in sorted(masks.keys()):
+        entries = sorted(masks[mask])
+        prefixes = struct.pack(f'<{len(entries)}Q', *(prefix for prefix, vendor_id in entries))
+        vendors = struct.pack(f'<{len(entries)}I', *(vendor_id for prefix, vendor_id in entries))
+        mask_table += _MASK.pack(mask, len(entries), offset + len(arrays), offset + len(arrays) + len(prefixes))
+        arrays += prefixes + vendors
+        # keep the next prefix array aligned:
+        arrays += b'\0' * (-len(arrays) % 8)
+    data = header + mask_table + struct.pack(f'<{len(vendor_offsets)}I', *vendor_offsets) + strings
+    data += b'\0' * (offset - len(data))
+    return bytes(data + arrays)
+
+
+def write_index(data, index_name):
+    """Write the index data to a file. The file is replaced atomically, so running processes are not affected.
+
+    Raises:
+        OSError: If the file could not be written.
+    """
+    temp_name = f"{index_name}.{os.getpid()}.tmp"
+    with open(temp_name, 'wb') as index_file:
+        index_file.write(data)
+    os.replace(temp_name, index_name)
+
+
+# the process-wide index, see get_oui_index()
+_oui_index = None
+_oui_index_lock = threading.Lock()
+
+
+def get_oui_index():
+    """Return the process-wide OuiIndex() of the packaged manuf file. It is loaded on the first call.
+
+    Raises:
+        IOError: If the manuf file could not be found.
+    """
+    global _oui_index
+    if _oui_index is None:
+        with _oui_index_lock:
+            if _oui_index is None:
+                _oui_index = OuiIndex()
+    return _oui_index
+
+
+def main(*input_args):
+    """Command line to (re)build the index file."""
+    argparser = argparse.ArgumentParser(description="Build the compiled index of Wireshark's OUI database.")
+    argparser.add_argument(
+        "-m",
+        "--manuf",
+        help="manuf file path. Defaults to manuf file packaged with manuf.py installation",
+        action="store",
+        default=None,
+    )
+    argparser.add_argument("mac_address", nargs="?", help="MAC address to check")
+    args = argparser.parse_args(args=input_args or None)
+
+    manuf_name = args.manuf or MacParser.get_packaged_manuf_file_path()
+    index_name = manuf_name + INDEX_FILE_EXTENSION
+    write_index(data=build_index(manuf_name=manuf_name), index_name=index_name)
+    print(f"Index written to {index_name}")
+    if args.mac_address:
+        print(OuiIndex(manuf_name=manuf_name, index_name=index_name).get_all(args.mac_address))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -427,6 +427,116 @@ SNMP_RETRIES = 3
 # note that some devices cannot handle the default 25, and you may need to lower this e.g. 10
 # see the references in the documentation for more information.
 SNMP_MAX_REPETITIONS = 25
+# OpenL2M learns the best max-repetitions value for each device, starting with the above SNMP_MAX_REPETITIONS.
+# If a device returns large tables quickly, the value is increased, up to SNMP_MAX_REPETITIONS_LIMIT.
+# On 'response too big' errors, or slow replies, it is lowered, down to half of SNMP_MAX_REPETITIONS.
+# The learned values are shown, and can be reset, in the admin page of each device.
+# You can also set a fixed value for a device there.
+# Set to False to always use SNMP_MAX_REPETITIONS.
+SNMP_MAX_REPETITIONS_LEARNING = True
+SNMP_MAX_REPETITIONS_LIMIT = 100
+# when reading the basic device information, OpenL2M reads several mib branches at the same time.
+# The per-vlan ethernet tables of Cisco devices are also read this way.
+# this is the maximum number of concurrent reads (snmp sessions) to a single device.
+# Some older or busy devices may not like this, set to 1 to read one branch at a time.
+SNMP_MAX_CONCURRENT_WALKS = 4
+# large tables (e.g. the ethernet or arp tables of a core switch) are parsed while they are read.
+# A single table read stops after SNMP_WALK_MAX_ROWS entries, or SNMP_WALK_MAX_TIME seconds, and shows a warning
+# that the data is incomplete. This protects the web server process memory and time. Set to 0 for no limit.
+SNMP_WALK_MAX_ROWS = 200000
+SNMP_WALK_MAX_TIME = 0
+# the background refresh of the device data (see DEVICE_CACHE_SOFT_TTL and the poller below) can read only
+# the interfaces that changed since the data was cached. This reads the system uptime and the time of the
+# last link change of each interface (ifLastChange), and then only the interfaces that changed.
+# Changes that do not change the link state, e.g. vlans or descriptions changed on the device itself,
+# are only found by a full read. This is the number of seconds after which a full read is done again.
+# A reboot of the device, or interfaces that are added or removed, also cause a full read. Set to 0 to disable.
+SNMP_INCREMENTAL_REFRESH = 0
+# snmp sessions are kept and re-used across web requests, in each web server (worker) process.
+# This saves the SNMPv3 engine discovery and key setup on every page.
+# This is the maximum number of idle sessions kept per process, set to 0 to disable re-use,
+# and the number of seconds after which an idle session is discarded.
+SNMP_SESSION_POOL_SIZE = 20
+SNMP_SESSION_POOL_IDLE_TIME = 300
+# the vendor of an snmp device (i.e. the driver to use) is detected from the system OID,
+# and stored with the switch. This is the number of seconds before we check the vendor again.
+# Set to 0 to check on every request.
+SNMP_DRIVER_RECHECK_INTERVAL = 86400
+# optional mib branches (e.g. PoE, LACP, the newer interface names and speeds) that return nothing
+# several times in a row are learned per device, and not read again. This saves requests on devices that
+# do not implement these mibs. The learned data is probed again after this many seconds, or when the
+# system OID or description (i.e. model or firmware) changes. Set to 0 to disable.
+SNMP_CAPABILITY_RECHECK_INTERVAL = 86400
+
+# The data read from a device is shared by all users that look at the device, in a Django cache.
+# See https://docs.djangoproject.com/en/5.0/topics/cache/
+# The cache needs to be shared by all web server worker processes, and the poller. The default is a file-based
+# cache in /var/tmp/openl2m_cache, which needs to be writable by the web server user. On busy servers,
+# a Redis cache is faster, e.g.:
+# CACHES = {
+#     'default': {
+#         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+#         'LOCATION': 'redis://127.0.0.1:6379',
+#     }
+# }
+# For the file-based and database caches, set 'OPTIONS': {'MAX_ENTRIES': ...} to at least about 20 times the number
+# of devices in use. The Django default of 300 is too small, as each device uses a few entries
+# (more for devices with many interfaces), and cached device data is no longer found when entries are removed.
+# Do NOT use a local memory cache ('LocMemCache'), it is NOT shared between web server worker processes.
+# the name of the cache in CACHES to use for device data:
+DEVICE_CACHE_ALIAS = 'default'
+# the number of seconds device data is cached. Use the "Reload" button to read the device again.
+DEVICE_CACHE_TIMEOUT = 1800
+# compress the cached device data (zlib). This uses less memory in the cache, at the cost of some cpu time.
+# If the 'msgpack' package is installed, it is used to store the cached data even more compactly.
+DEVICE_CACHE_COMPRESS = False
+# if the cached device data is older than this many seconds, the device page is still shown right away
+# from the cache, with the age of the data. The data is then read again in the background, and the interface
+# table in the page is updated when this is done. Set to 0 to disable, and only read again with "Reload All".
+DEVICE_CACHE_SOFT_TTL = 120
+
+# The poller reads all active devices in the background, so pages can be shown from the device cache.
+# Run it as a service with "python3 manage.py poll_switches". This needs a device cache that is shared between
+# processes (see CACHES above), and DEVICE_CACHE_TIMEOUT needs to be longer than POLLER_INTERVAL.
+# the number of devices read at the same time:
+POLLER_WORKERS = 8
+# each device is read every POLLER_INTERVAL seconds, devices viewed in the last POLLER_RECENT_VIEWS seconds
+# are read every POLLER_RECENT_INTERVAL seconds:
+POLLER_INTERVAL = 900
+POLLER_RECENT_INTERVAL = 120
+POLLER_RECENT_VIEWS = 3600
+# each interval is randomly changed by up to this fraction, to spread the load on the network and devices:
+POLLER_JITTER = 0.2
+# also read the client data (ethernet, arp and lldp tables):
+POLLER_CLIENT_DATA = False
+# cached client data younger than this many seconds is shown in the "Arp/LLDP" tab, instead of reading the device.
+# Set this to e.g. POLLER_RECENT_INTERVAL when POLLER_CLIENT_DATA is used. 0 always reads the device.
+CLIENT_DATA_CACHE_MAX_AGE = 0
+
+# Run bulk edits as background tasks, outside of the web request. The page then shows the progress of the task.
+# This avoids web server timeouts on large changes, e.g. a PoE Down/Up of many interfaces (see POE_TOGGLE_DELAY).
+# The tasks are run by the task worker, run it as a service with "python3 manage.py run_tasks"
+BULKEDIT_TASKS = False
+# the number of tasks run at the same time. Tasks on the same device always run one at a time.
+TASK_WORKERS = 4
+# tasks running longer than this many seconds are marked as errors, e.g. when the worker was stopped:
+TASK_TIMEOUT = 3600
+
+# The poller can keep an index of where each ethernet address is connected: the device, interface and vlan it is
+# heard on, and its IP address from the arp tables. Only "edge" interfaces are included, i.e. not trunks,
+# LACP aggregates, or interfaces with a switch or router as LLDP neighbor. The index is searched with
+# the "Locate" menu option, and the API. This reads the client data of every device, see POLLER_CLIENT_DATA.
+LOCATIONS_HARVEST = False
+# ethernet addresses not heard in this many days are removed from the index:
+LOCATIONS_MAX_AGE = 30
+# interfaces with more ethernet addresses than this are not edge interfaces, e.g. an unmanaged switch. 0 disables:
+LOCATIONS_MAX_PER_INTERFACE = 0
+# the maximum number of locations shown for a search:
+LOCATIONS_MAX_RESULTS = 100
+
+# the groups and devices each user has access to are kept in the same cache, for this many seconds.
+# This is cleared when groups, devices or their members change. Set to 0 to always read from the database.
+PERMISSIONS_CACHE_TIMEOUT = 300
 
 # Syslog settings
 # if SYSLOG_HOST is defined (default=False), log entries will also be sent here, to the 'user' facility:
@@ -481,6 +591,17 @@ LOOKUP_HOSTNAME_ARP = False
 LOOKUP_HOSTNAME_LLDP = False
 # lookup hostnames for routed interface IP addresses.
 LOOKUP_HOSTNAME_ROUTED_IP = False
+# the hostname lookups of a page run in parallel, using this many threads per web server process.
+DNS_RESOLVER_WORKERS = 16
+# the maximum number of seconds a page waits for hostname lookups. Lookups that take longer
+# are shown without hostname, and are cached when done, so they show on the next page.
+DNS_RESOLVE_TIME_BUDGET = 10
+# found hostnames are cached for this many seconds, in the memory of each web server process.
+DNS_CACHE_TIMEOUT = 3600
+# addresses without hostname are cached for this many seconds.
+DNS_NEGATIVE_CACHE_TIMEOUT = 300
+# the maximum number of addresses in the hostname cache of each process. The least recently used are removed.
+DNS_CACHE_SIZE = 10000
 
 # REST API Settings
 #
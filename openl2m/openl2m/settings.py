@@ -157,6 +157,65 @@ SWITCH_SEARCH_FORM = getattr(configuration, "SWITCH_SEARCH_FORM", True)
 SNMP_TIMEOUT = getattr(configuration, 'SNMP_TIMEOUT', 4)  # seconds before retry, see EasySNMP docs
 SNMP_RETRIES = getattr(configuration, 'SNMP_RETRIES', 3)  # retries before fail
 SNMP_MAX_REPETITIONS = getattr(configuration, 'SNMP_MAX_REPETITIONS', 10)  # SNMP get_bulk max_repetitions
+# learn the best max_repetitions per device, starting at SNMP_MAX_REPETITIONS, up to the limit:
+SNMP_MAX_REPETITIONS_LEARNING = getattr(configuration, 'SNMP_MAX_REPETITIONS_LEARNING', True)
+SNMP_MAX_REPETITIONS_LIMIT = getattr(configuration, 'SNMP_MAX_REPETITIONS_LIMIT', 100)
+# the number of mib branches read at the same time from a single device, 1 = one at a time.
+SNMP_MAX_CONCURRENT_WALKS = getattr(configuration, 'SNMP_MAX_CONCURRENT_WALKS', 4)
+# a single mib branch walk stops after this many entries, or seconds, with a warning. 0 means no limit:
+SNMP_WALK_MAX_ROWS = getattr(configuration, 'SNMP_WALK_MAX_ROWS', 200000)
+SNMP_WALK_MAX_TIME = getattr(configuration, 'SNMP_WALK_MAX_TIME', 0)
+# background refreshes only read the interfaces that changed, with a full read after this many seconds. 0 disables:
+SNMP_INCREMENTAL_REFRESH = getattr(configuration, 'SNMP_INCREMENTAL_REFRESH', 0)
+# idle snmp sessions kept per worker process for re-use, and the seconds before an idle session is discarded:
+SNMP_SESSION_POOL_SIZE = getattr(configuration, 'SNMP_SESSION_POOL_SIZE', 20)
+SNMP_SESSION_POOL_IDLE_TIME = getattr(configuration, 'SNMP_SESSION_POOL_IDLE_TIME', 300)
+# seconds before the vendor of an snmp device is read again to select the driver, 0 means read on every request:
+SNMP_DRIVER_RECHECK_INTERVAL = getattr(configuration, 'SNMP_DRIVER_RECHECK_INTERVAL', 86400)
+# seconds before the learned mib branches that an snmp device does not support are probed again, 0 disables this:
+SNMP_CAPABILITY_RECHECK_INTERVAL = getattr(configuration, 'SNMP_CAPABILITY_RECHECK_INTERVAL', 86400)
+
+# the Django caches. The default is a file-based cache, which is shared by all web server and poller processes.
+# Note: a local memory cache is per (worker) process, and does not work with multiple workers!
+CACHES = getattr(
+    configuration,
+    'CACHES',
+    {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': '/var/tmp/openl2m_cache',
+            # the Django default of 300 entries is too small for the device data of more than a few devices:
+            'OPTIONS': {'MAX_ENTRIES': 20000},
+        }
+    },
+)
+# the device data read is shared by all users, in this cache, for this many seconds (None means no expiration):
+DEVICE_CACHE_ALIAS = getattr(configuration, 'DEVICE_CACHE_ALIAS', 'default')
+DEVICE_CACHE_TIMEOUT = getattr(configuration, 'DEVICE_CACHE_TIMEOUT', 1800)
+# compress the cached device data, uses less memory at the cost of some cpu time:
+DEVICE_CACHE_COMPRESS = getattr(configuration, 'DEVICE_CACHE_COMPRESS', False)
+# cached device data older than this many seconds is shown, and refreshed in the background. 0 disables this:
+DEVICE_CACHE_SOFT_TTL = getattr(configuration, 'DEVICE_CACHE_SOFT_TTL', 120)
+# the poller ("manage.py poll_switches") reads active devices into the device cache, see configuration.example.py
+POLLER_WORKERS = getattr(configuration, 'POLLER_WORKERS', 8)
+POLLER_INTERVAL = getattr(configuration, 'POLLER_INTERVAL', 900)
+POLLER_RECENT_INTERVAL = getattr(configuration, 'POLLER_RECENT_INTERVAL', 120)
+POLLER_RECENT_VIEWS = getattr(configuration, 'POLLER_RECENT_VIEWS', 3600)
+POLLER_JITTER = getattr(configuration, 'POLLER_JITTER', 0.2)
+POLLER_CLIENT_DATA = getattr(configuration, 'POLLER_CLIENT_DATA', False)
+# cached client data (ethernet, arp, lldp) younger than this many seconds is shown in the Arp/LLDP tab, 0 disables:
+CLIENT_DATA_CACHE_MAX_AGE = getattr(configuration, 'CLIENT_DATA_CACHE_MAX_AGE', 0)
+# run bulk edits as background tasks, by the task worker ("manage.py run_tasks"), see configuration.example.py
+BULKEDIT_TASKS = getattr(configuration, 'BULKEDIT_TASKS', False)
+TASK_WORKERS = getattr(configuration, 'TASK_WORKERS', 4)
+TASK_TIMEOUT = getattr(configuration, 'TASK_TIMEOUT', 3600)
+# the poller stores the ethernet addresses on edge interfaces in the location index, see configuration.example.py
+LOCATIONS_HARVEST = getattr(configuration, 'LOCATIONS_HARVEST', False)
+LOCATIONS_MAX_AGE = getattr(configuration, 'LOCATIONS_MAX_AGE', 30)
+LOCATIONS_MAX_PER_INTERFACE = getattr(configuration, 'LOCATIONS_MAX_PER_INTERFACE', 0)
+LOCATIONS_MAX_RESULTS = getattr(configuration, 'LOCATIONS_MAX_RESULTS', 100)
+# the groups and devices a user has access to are cached for this many seconds, 0 disables:
+PERMISSIONS_CACHE_TIMEOUT = getattr(configuration, 'PERMISSIONS_CACHE_TIMEOUT', 300)
 
 # Syslog related fields:
 SYSLOG_HOST = getattr(configuration, "SYSLOG_HOST", False)
@@ -426,6 +485,15 @@ LOOKUP_HOSTNAME_ARP = getattr(configuration, "LOOKUP_HOSTNAME_ARP", False)
 LOOKUP_HOSTNAME_LLDP = getattr(configuration, "LOOKUP_HOSTNAME_LLDP", False)
 # lookup hostnames for routed interface IP addresses.
 LOOKUP_HOSTNAME_ROUTED_IP = getattr(configuration, "LOOKUP_HOSTNAME_ROUTED_IP", False)
+# the lookups run in parallel, with this many threads per process:
+DNS_RESOLVER_WORKERS = getattr(configuration, "DNS_RESOLVER_WORKERS", 16)
+# the maximum number of seconds a page waits for hostname lookups:
+DNS_RESOLVE_TIME_BUDGET = getattr(configuration, "DNS_RESOLVE_TIME_BUDGET", 10)
+# found hostnames, and not found addresses, are cached for this many seconds:
+DNS_CACHE_TIMEOUT = getattr(configuration, "DNS_CACHE_TIMEOUT", 3600)
+DNS_NEGATIVE_CACHE_TIMEOUT = getattr(configuration, "DNS_NEGATIVE_CACHE_TIMEOUT", 300)
+# the maximum number of addresses in the hostname cache of each process:
+DNS_CACHE_SIZE = getattr(configuration, "DNS_CACHE_SIZE", 10000)
 
 # SSH command read timeout, default = 15 (Netmiko library default = 10)
 SSH_COMMAND_TIMEOUT = getattr(configuration, 'SSH_COMMAND_TIMEOUT', 15)
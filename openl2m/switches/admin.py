@@ -56,7 +56,7 @@ class SwitchAdmin(admin.ModelAdmin):
     save_on_top = True
     save_as = True
     list_display = ('name', 'get_switchgroups')
-    readonly_fields = ('hostname',)
+    readonly_fields = ('hostname', 'snmp_enterprise_checked')
     filter_horizontal = ('command_templates',)
     search_fields = ['name']
     inlines = (SwitchInline,)
@@ -103,6 +103,18 @@ class SwitchAdmin(admin.ModelAdmin):
                 )
             },
         ),
+        (
+            'SNMP Options',
+            {
+                'fields': (
+                    'snmp_max_repetitions',
+                    'snmp_bulk_tuning',
+                    'snmp_capabilities',
+                    'snmp_enterprise_id',
+                    'snmp_enterprise_checked',
+                )
+            },
+        ),
         ('Other Options', {'fields': ('nms_id',)}),
         ('Read-Only Fields', {'fields': ('hostname',)}),
     )
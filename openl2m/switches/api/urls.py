@@ -27,6 +27,11 @@ from switches.api.views import (
     APIInterfaceSetState,
     APIInterfaceSetPoE,
     APIInterfaceSetDescription,
+    APITaskStatus,
+    APIFleetEdit,
+    APIFleetStatus,
+    APILocationSearch,
+    APIInterfaceDetails,
 )
 
 app_name = 'switches-api'
@@ -43,6 +48,21 @@ urlpatterns = [
         APISwitchMenuView.as_view(),
         name="api_switch_menu_view",
     ),
+    path(
+        "fleet/",
+        APIFleetEdit.as_view(),
+        name="api_fleet_edit",
+    ),
+    path(
+        "fleet/<str:batch>/",
+        APIFleetStatus.as_view(),
+        name="api_fleet_status",
+    ),
+    path(
+        "locate/",
+        APILocationSearch.as_view(),
+        name="api_location_search",
+    ),
     path(
         "<int:group_id>/<int:switch_id>/",
         APISwitchBasicView.as_view(),
@@ -73,6 +93,16 @@ urlpatterns = [
         APISwitchVlanDelete.as_view(),
         name="api_switch_vlan_delete",
     ),
+    path(
+        "<int:group_id>/<int:switch_id>/task/<int:task_id>/",
+        APITaskStatus.as_view(),
+        name="api_task_status",
+    ),
+    path(
+        "<int:group_id>/<int:switch_id>/interface/<ifname:interface_id>/details/",
+        APIInterfaceDetails.as_view(),
+        name="api_interface_details",
+    ),
     path(
         "<int:group_id>/<int:switch_id>/interface/<ifname:interface_id>/vlan/",
         APIInterfaceSetVlan.as_view(),
@@ -15,6 +15,7 @@
 #
 # Here we implement all API views as classes
 #
+from django.conf import settings
 
 # Use the Django Rest Framework:
 from rest_framework import status as http_status
@@ -33,8 +34,17 @@ from switches.actions import (
     perform_switch_vlan_delete,
 )
 from switches.connect.connect import get_connection_object
-from switches.permissions import get_my_device_groups, get_group_and_switch
-from switches.utils import dprint
+from switches.constants import BULKEDIT_ALIAS_TYPE_REPLACE, BULKEDIT_POE_NONE, INTERFACE_STATUS_NONE
+from switches.fleet import (
+    check_fleet_arguments,
+    create_fleet_tasks,
+    get_fleet_arguments,
+    get_fleet_results,
+    get_fleet_targets,
+)
+from switches.locations import find_ethernet_locations
+from switches.permissions import get_my_device_groups, get_group_and_switch, get_task_if_permitted
+from switches.utils import dprint, get_remote_ip
 
 on_values = ["on", "yes", "y", "enabled", "enable", "true", "1"]
 
@@ -70,6 +80,130 @@ class APISwitchMenuView(
         )
 
 
+class APITaskStatus(
+    APIView,
+):
+    """
+    Return the status, progress and results of a background task, e.g. a bulk edit.
+    """
+
+    def get(
+        self,
+        request,
+        group_id,
+        switch_id,
+        task_id,
+    ):
+        task = get_task_if_permitted(request=request, group_id=group_id, switch_id=switch_id, task_id=task_id)
+        if task is None:
+            return respond(status=http_status.HTTP_404_NOT_FOUND, text="Task not found!")
+        return Response(
+            data=task.as_dict(),
+            status=http_status.HTTP_200_OK,
+        )
+
+
+class APIFleetEdit(
+    APIView,
+):
+    """
+    Make the same interface changes on many devices, see switches/fleet.py
+    The changes are run in the background, use APIFleetStatus() to get the results.
+    """
+
+    def post(
+        self,
+        request,
+    ):
+        dprint("APIFleetEdit(POST)")
+        data = request.data
+        try:
+            arguments = get_fleet_arguments(
+                interface_regex=str(data.get('interface_regex', '')),
+                interface_names=get_list_parameter(data, 'interface_names'),
+                interface_change=int(data.get('interface_change', INTERFACE_STATUS_NONE)),
+                poe_choice=int(data.get('poe_choice', BULKEDIT_POE_NONE)),
+                new_pvid=int(data.get('vlan', -1)),
+                new_description=str(data.get('description', '')),
+                new_description_type=int(data.get('description_type', BULKEDIT_ALIAS_TYPE_REPLACE)),
+            )
+            switches = get_list_parameter(data, 'switches')
+        except Exception:
+            return respond_error("Invalid parameter value!")
+        errors = check_fleet_arguments(arguments)
+        if errors:
+            return respond_error(" ".join(errors))
+        group = str(data.get('group', ''))
+        if not group and not switches:
+            return respond_error("Missing required parameter: 'group' and/or 'switches'")
+        targets, skipped = get_fleet_targets(user=request.user, group=group, switches=switches)
+        if not targets:
+            return respond_error(f"No devices to change! {' '.join(skipped)}")
+        batch = create_fleet_tasks(
+            user=request.user, targets=targets, arguments=arguments, ip_address=get_remote_ip(request)
+        )
+        return Response(
+            data={
+                "batch": batch,
+                "url": rest_reverse("switches-api:api_fleet_status", request=request, kwargs={"batch": batch}),
+                "switches": [switch.name for group, switch in targets],
+                "skipped": skipped,
+            },
+            status=http_status.HTTP_202_ACCEPTED,
+        )
+
+
+class APIFleetStatus(
+    APIView,
+):
+    """
+    Return the aggregated results of a fleet edit, and the status and results of each device.
+    """
+
+    def get(
+        self,
+        request,
+        batch,
+    ):
+        results = get_fleet_results(user=request.user, batch=batch)
+        if results is None:
+            return respond(status=http_status.HTTP_404_NOT_FOUND, text="Fleet edit not found!")
+        return Response(
+            data=results,
+            status=http_status.HTTP_200_OK,
+        )
+
+
+class APILocationSearch(
+    APIView,
+):
+    """
+    Return the locations of an ethernet or IP address, from the location index, see switches/locations.py
+    """
+
+    def get(
+        self,
+        request,
+    ):
+        if not settings.LOCATIONS_HARVEST:
+            return respond(status=http_status.HTTP_404_NOT_FOUND, text="The location index is not enabled!")
+        search = str(request.GET.get('search', '')).strip()
+        if not search:
+            return respond(status=http_status.HTTP_400_BAD_REQUEST, text="Missing required parameter: 'search'")
+        results = find_ethernet_locations(search=search, groups=get_my_device_groups(request=request))
+        if results is None:
+            return respond(
+                status=http_status.HTTP_400_BAD_REQUEST, text=f"{search} - This is not an ethernet or IP address!"
+            )
+        return Response(
+            data={
+                "search": search,
+                "locations": results,
+            },
+            status=http_status.HTTP_200_OK,
+        )
+
+
 def switch_info(request, group_id, switch_id, details):
     connection, response_error = get_connection_to_switch(
         request=request, group_id=group_id, switch_id=switch_id, details=details
@@ -129,6 +263,42 @@ class APISwitchDetailsView(
         return switch_info(request=request, group_id=group_id, switch_id=switch_id, details=True)
 
 
+class APIInterfaceDetails(
+    APIView,
+):
+    """
+    Return the information for a single interface, with its mac-address and lldp details.
+    Only the parts of the device tables for this interface are read, see Connector.get_interface_client_data()
+    """
+
+    def get(
+        self,
+        request,
+        group_id,
+        switch_id,
+        interface_id,
+    ):
+        dprint("APIInterfaceDetails(GET)")
+        connection, response_error = get_connection_to_switch(request=request, group_id=group_id, switch_id=switch_id)
+        if response_error:
+            return response_error
+        if not connection.get_basic_info():
+            return respond_error(connection.error.description)
+        interface = connection.get_interface_by_key(interface_id)
+        if not interface or not interface.visible:
+            return respond(status=http_status.HTTP_404_NOT_FOUND, text=f"Interface '{interface_id}' not found!")
+        if not connection.get_interface_client_data(interface):
+            dprint(f"ERROR getting interface details: {connection.error.description}")
+            return respond_error(connection.error.description)
+        connection.save_cache()  # this only works for SessionAuthentication !
+        return Response(
+            data={
+                "interface": interface.as_dict(),
+            },
+            status=http_status.HTTP_200_OK,
+        )
+
+
 class APISwitchSaveConfig(
     APIView,
 ):
@@ -413,6 +583,18 @@ def get_connection_to_switch(request, group_id, switch_id, details=False):
     return connection, None
 
 
+def get_list_parameter(data, name: str) -> list:
+    """
+    Get a parameter with a list of values, from form data (repeated parameter), or JSON data (a list).
+    """
+    if hasattr(data, 'getlist'):
+        return data.getlist(name)
+    value = data.get(name, [])
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
 def respond(status, text):
     if status == http_status.HTTP_200_OK:
         data = {"result": text}
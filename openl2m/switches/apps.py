@@ -16,3 +16,7 @@ from django.apps import AppConfig
 
 class SwitchesConfig(AppConfig):
     name = 'switches'
+
+    def ready(self):
+        # here we handle the signals to clear the cached user permissions
+        import switches.signals  # noqa: F401
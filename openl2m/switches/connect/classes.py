@@ -154,11 +154,15 @@ class IPNetworkHostname(netaddr.IPNetwork):
         self.hostname: str = ''
         super().__init__(network)
 
-    def resolve_ip_address(self) -> None:
-        '''Use dns resolution to resolve the IP address to a hostname.'''
+    def resolve_ip_address(self, names: dict = None) -> None:
+        '''Use dns resolution to resolve the IP address to a hostname.
+        If given, names is the result of resolve_ip_dns_names() for many addresses at once.'''
         # if hostname not already set:
         if not self.hostname:
-            self.hostname = get_ip_dns_name(self.ip)
+            if names is None:
+                self.hostname = get_ip_dns_name(self.ip)
+            else:
+                self.hostname = names.get(str(self.ip), '')
 
 
 class Vlan:
@@ -750,6 +754,7 @@ class Interface:
         self.manageable: bool = False  # if True, this interface is manageable by the current user
         self.disabled: bool = False  # if True, this interface is disabled by the Connector() driver.
         self.unmanage_reason: str = "Access denied!"  # string with reason why interface is not manageable or disabled
+        self.driver_unmanage_reason: str = ""  # reason set by the Connector() driver, kept for every user
         self.can_edit_description: bool = False  # if True, can change interface description (snmp ifAlias)
         self.index = key  # ifIndex, the key to all MIB-2 data!
         # self.ifDescr = ""           # the old name of the interface, NOT the "description" attribute which is the ifAlias !!!
@@ -814,8 +819,7 @@ class Interface:
             self.addresses_ip4[address] = IPNetworkHostname(f"{address}/{prefix_len}")
         else:
             self.addresses_ip4[address] = IPNetworkHostname(address)
-        if settings.LOOKUP_HOSTNAME_ROUTED_IP:
-            self.addresses_ip4[address].resolve_ip_address()
+        # Note: if settings.LOOKUP_HOSTNAME_ROUTED_IP, hostnames are resolved in Connector.get_basic_info()
         # return True
 
     def add_ip6_network(self, address: str, prefix_len: int) -> None:
@@ -825,8 +829,7 @@ class Interface:
         return True on success, False on failure.
         '''
         self.addresses_ip6[address] = IPNetworkHostname(f"{address}/{prefix_len}")
-        if settings.LOOKUP_HOSTNAME_ROUTED_IP:
-            self.addresses_ip6[address].resolve_ip_address()
+        # Note: if settings.LOOKUP_HOSTNAME_ROUTED_IP, hostnames are resolved in Connector.get_basic_info()
         # return True
 
     def add_tagged_vlan(self, vlan_id: int) -> None:
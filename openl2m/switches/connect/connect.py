@@ -17,6 +17,7 @@ but could end up using something else (e.g. Netmiko(ssh))
 if we cannot do it all using snmp.
 """
 
+from django.conf import settings
 from django.http.request import HttpRequest
 from django.utils import timezone
 
@@ -64,11 +65,24 @@ from switches.connect.dummy.connector import DummyConnector
 
 from switches.models import Switch, SwitchGroup
 
+# the vendor-specific snmp driver classes, by snmp enterprise id.
+# Anything not listed here uses the generic SnmpConnector()
+snmp_drivers = {
+    ENTERPRISE_ID_CISCO: SnmpConnectorCisco,
+    ENTERPRISE_ID_JUNIPER: SnmpConnectorJuniper,
+    ENTERPRISE_ID_HP: SnmpConnectorProcurve,
+    ENTERPRISE_ID_H3C: SnmpConnectorComware,
+    ENTERPRISE_ID_HP_ENTERPRISE: SnmpConnectorArubaCx,
+    # Dell is yet to be tested!
+    # ENTERPRISE_ID_DELL: SnmpConnectorDell,
+}
+
 
 def get_connection_object(request: HttpRequest, group: SwitchGroup, switch: Switch) -> Connector:
     """
     Function to get the proper type of Connector() object, based on device connector_type settings.
-    For SNMP devices, we probe the 'system' mib, and then a vendor-specific Connector() object will be returned.
+    For SNMP devices, we find the vendor (see get_snmp_enterprise_id()),
+    and then a vendor-specific Connector() object will be returned.
     If vendor is unknown, we return a generic snmp object.
     If probing fails, we raise an exception!
     """
@@ -76,43 +90,9 @@ def get_connection_object(request: HttpRequest, group: SwitchGroup, switch: Swit
 
     # What type of connector are we using?
     if switch.connector_type == CONNECTOR_TYPE_SNMP:
-        # go probe to find vendor type
-        conn = SnmpConnector(request, group, switch)
-        snmp_oid = conn.get_system_oid()
-        if snmp_oid:
-            # we have the ObjectID, what kind of vendor is it:
-            dprint(f"   Checking device type for {snmp_oid}")
-            sub_oid = oid_in_branch(enterprises, snmp_oid)
-            if sub_oid:
-                parts = sub_oid.split('.', 1)  # 1 means one split, two elements!
-                enterprise_id = int(parts[0])
-                # here we go:
-                if enterprise_id == ENTERPRISE_ID_CISCO:
-                    connection = SnmpConnectorCisco(request, group, switch)
-
-                elif enterprise_id == ENTERPRISE_ID_JUNIPER:
-                    connection = SnmpConnectorJuniper(request, group, switch)
-
-                elif enterprise_id == ENTERPRISE_ID_HP:
-                    connection = SnmpConnectorProcurve(request, group, switch)
-
-                elif enterprise_id == ENTERPRISE_ID_H3C:
-                    connection = SnmpConnectorComware(request, group, switch)
-
-                elif enterprise_id == ENTERPRISE_ID_HP_ENTERPRISE:
-                    connection = SnmpConnectorArubaCx(request, group, switch)
-
-                # Dell is yet to be tested!
-                # elif enterprise_id == ENTERPRISE_ID_DELL:
-                #    connection = SnmpConnectorDell(request, group, switch)
-
-                else:
-                    # system oid found, but unknown vendor:
-                    connection = SnmpConnector(request, group, switch)
-
-        # no system oid found, return a "generic" SNMP object
-        else:
-            connection = SnmpConnector(request, group, switch)
+        # find the vendor type, unknown vendors or no system oid found return a "generic" SNMP object
+        enterprise_id = get_snmp_enterprise_id(request, group, switch)
+        connection = snmp_drivers.get(enterprise_id, SnmpConnector)(request, group, switch)
 
     # This is the "custom" Aruba AOS CX connector, using the device REST API.
     elif switch.connector_type == CONNECTOR_TYPE_AOSCX:
@@ -150,3 +130,35 @@ def get_connection_object(request: HttpRequest, group: SwitchGroup, switch: Swit
     # then return object
     dprint("  Returning connection() from get_connection_object()")
     return connection
+
+
+def get_snmp_enterprise_id(request: HttpRequest, group: SwitchGroup, switch: Switch) -> int:
+    """
+    Get the snmp enterprise id (ie. vendor) of a device, to select the driver class.
+    The id is stored in the Switch() object, so we only probe the 'system' mib of the device
+    if it is not known, or was last checked more then settings.SNMP_DRIVER_RECHECK_INTERVAL seconds ago.
+    Returns the enterprise id, or 0 if not found.
+    """
+    if settings.SNMP_DRIVER_RECHECK_INTERVAL and switch.snmp_enterprise_id and switch.snmp_enterprise_checked:
+        age = (timezone.now() - switch.snmp_enterprise_checked).total_seconds()
+        if 0 <= age < settings.SNMP_DRIVER_RECHECK_INTERVAL:
+            dprint(f"   Using stored enterprise id {switch.snmp_enterprise_id}")
+            return switch.snmp_enterprise_id
+
+    # go probe to find vendor type
+    conn = SnmpConnector(request, group, switch)
+    snmp_oid = conn.get_system_oid()
+    if not snmp_oid:
+        return 0
+    # we have the ObjectID, what kind of vendor is it:
+    dprint(f"   Checking device type for {snmp_oid}")
+    sub_oid = oid_in_branch(enterprises, snmp_oid)
+    if not sub_oid:
+        return 0
+    parts = sub_oid.split('.', 1)  # 1 means one split, two elements!
+    enterprise_id = int(parts[0])
+    # and remember for next time:
+    switch.snmp_enterprise_id = enterprise_id
+    switch.snmp_enterprise_checked = timezone.now()
+    switch.save(update_fields=['snmp_enterprise_id', 'snmp_enterprise_checked'])
+    return enterprise_id
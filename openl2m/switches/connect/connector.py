@@ -14,19 +14,22 @@
 from collections import OrderedDict
 import lib.manuf.manuf as manuf
 import natsort
-import jsonpickle
 import re
+import threading
 import time
+import traceback
 from typing import Any, Dict, List
 
 from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
 from django.http.request import HttpRequest
 
-from switches.models import Switch, SwitchGroup, Command, Log
+from switches.models import Switch, SwitchGroup, Command, Log, VLAN
 from switches.connect.classes import StackMember, SyslogMsg, PoePSE
 from switches.connect.constants import LLDP_CHASSIC_TYPE_ETH_ADDR
 from switches.constants import LOG_TYPE_WARNING, LOG_CONNECTION_ERROR, LOG_TYPE_ERROR, CMD_TYPE_INTERFACE
-from switches.utils import dprint, get_remote_ip, get_ip_dns_name
+from switches.utils import dprint, get_remote_ip, resolve_ip_dns_names
 from switches.connect.classes import (
     Error,
     PoePort,
@@ -50,10 +53,28 @@ from switches.connect.constants import (
     visible_interfaces,
 )
 from switches.connect.netmiko.execute import NetmikoExecute
+import switches.connect.serializer as serializer
 from django.contrib.auth.models import User
 
 from rest_framework.reverse import reverse as rest_reverse
 
+# the version of the shared device cache format. Increase when the cached data changes in incompatible ways!
+# Note: changes to the cached classes are detected by the serializer, see serializer.get_schema_version()
+DEVICE_CACHE_VERSION = 4
+# the interfaces of a device are stored in the device cache in groups of this many, see set_device_cache()
+DEVICE_CACHE_INTERFACES_PER_ITEM = 50
+# the maximum time in seconds a background refresh of the device data can take, see start_device_refresh()
+DEVICE_REFRESH_LOCK_TIMEOUT = 300
+
+# the Interface() attributes that depend on the current user, see Connector._set_interfaces_permissions()
+PER_USER_INTERFACE_ATTRIBUTES = (
+    'manageable',
+    'visible',
+    'allow_poe_toggle',
+    'can_edit_description',
+    'unmanage_reason',
+)
+
 '''
 Base Connector() class for OpenL2M.
 This implements the interface that is expected by the higher level code
@@ -93,6 +114,13 @@ class Connector:
         # caching related. All attributes but these will be cached:
         self._do_not_cache = [
             "_do_not_cache",
+            "_per_user_attributes",
+            "_cached_attribute_data",
+            "_cached_interface_keys",
+            "_cached_interface_data",
+            "_changed_interfaces",
+            "_all_interfaces_changed",
+            "cache_generation",
             "request",
             "group",
             "switch",
@@ -100,6 +128,17 @@ class Connector:
             "eth_addr_count",
             "neighbor_count",
         ]
+        # change tracking of the cached data, see save_cache(). If not loaded from cache, write everything:
+        self._cached_attribute_data: Dict[str, bytes] = {}  # serialized attribute data as found in the cache
+        self._cached_interface_keys: List[str] = []  # the interface keys as found in the cache
+        self._cached_interface_data: Dict[str, bytes] = {}  # serialized interface data as found in the cache
+        self._changed_interfaces = set()  # keys of interfaces that changed since loaded from the cache
+        self._all_interfaces_changed = True
+        # attributes that depend on the current user. These are not in the shared device cache,
+        # but stored in the HTTP session, see save_cache(). See also PER_USER_INTERFACE_ATTRIBUTES
+        self._per_user_attributes = [
+            "allowed_vlans",
+        ]
 
         self.hostname = ""  # system hostname, typically set in sub-class
         self.vendor_name = ""  # typically set in sub-classes
@@ -116,8 +155,10 @@ class Connector:
         )  # the IPv4 addresses as keys, with stored value if_index; needed to map netmask to interface
         # some flags:
         self.cache_loaded = False  # if True, system data was loaded from cache
+        self.cache_generation = 0.0  # the version of the cached device data, see save_device_cache()
         # some timestamps:
         self.basic_info_read_timestamp = 0  # when the last 'basic' read occured
+        self.client_data_read_timestamp = 0  # when the last client data (ethernet, arp, lldp) read occured
 
         # data we calculate or collect without caching:
         self.allowed_vlans: Dict[int, Vlan] = (
@@ -302,8 +343,16 @@ class Connector:
                         self.add_warning(f"Connection Error: {self.error.details}")
                 else:
                     self.add_more_info('System', 'Basic Info Read', f"{read_duration} seconds")
-                    # All OK, now set the permissions to the interfaces:
-                    self._set_interfaces_permissions()
+                    # are we resolving the IP addresses of interfaces to hostnames?
+                    if settings.LOOKUP_HOSTNAME_ROUTED_IP:
+                        dns_start = time.time()
+                        self._lookup_hostname_from_routed_ip()
+                        dns_duration = int((time.time() - dns_start) + 0.5)
+                        self.add_more_info('System', 'DNS Read (routed ip)', f"{dns_duration} seconds")
+                    # All OK, now set the permissions to the interfaces.
+                    # Without a request (e.g. the poller), these are set when a user loads the data from the cache:
+                    if self.request:
+                        self._set_interfaces_permissions()
 
             else:
                 self.add_warning("WARNING: device driver does not support 'get_my_basic_info()' !")
@@ -325,6 +374,45 @@ class Connector:
 
     '''
 
+    def refresh_basic_info(self) -> bool:
+        '''
+        Update the device data with only what changed on the device, instead of reading all basic info.
+        The driver function refresh_my_basic_info() starts from the data in the shared device cache,
+        see read_device_cache() and apply_device_cache(). This is used by refresh_device_cache().
+
+        Args:
+            none
+
+        Returns:
+            True if the data was refreshed (errors are set in self.error variables),
+            False if the driver cannot refresh the data, and get_basic_info() needs to read everything.
+            In that case this object is not changed.
+        '''
+        if self.cache_loaded or not hasattr(self, 'refresh_my_basic_info'):
+            return False
+        dprint("Connector.refresh_basic_info()")
+        self.error.clear()
+        start_time = time.time()
+        if not self.refresh_my_basic_info():  # to be implemented by device/vendor class!
+            dprint("  => Full read needed!")
+            return False
+        self.basic_info_read_timestamp = start_time
+        read_duration = int((time.time() - start_time) + 0.5)
+        self.add_more_info('System', 'Basic Info Refresh', f"{read_duration} seconds")
+        if self.request and not self.error.status:
+            self._set_interfaces_permissions()
+        return True
+
+    '''
+    This placeholder can be implemented by drivers that can find what changed since the data was cached.
+    return False if everything needs to be read (without changing the object), or True if the cached data
+    was loaded and updated (on errors, set self.error variables)
+
+    def refresh_my_basic_info(self):
+        return False
+
+    '''
+
     def get_client_data(self) -> bool:
         '''
         This loads the layer 2 switch tables, any ARP tables available,
@@ -339,31 +427,16 @@ class Connector:
         '''
         # clear previous client data
         self.clear_client_data()
+        self.set_all_interfaces_changed()
 
         # call the implementation-specific function:
         if hasattr(self, 'get_my_client_data'):
             start_time = time.time()
+            self.client_data_read_timestamp = start_time
             self.get_my_client_data()  # to be implemented by device/vendor class!
             read_duration = int((time.time() - start_time) + 0.5)
             self.add_more_info('System', 'Client Info Read', f"{read_duration} seconds")
-            # are we resolving IP addresses to hostnames?
-            if settings.LOOKUP_HOSTNAME_ARP:
-                dns_start = time.time()
-                self._lookup_hostname_from_arp()
-                dns_duration = int((time.time() - dns_start) + 0.5)
-                self.add_more_info('System', 'DNS Read (arp)', f"{dns_duration} seconds")
-            # are we resolving IP addresses for LLDP neighbors?
-            if settings.LOOKUP_HOSTNAME_LLDP:
-                dns_start = time.time()
-                self._lookup_hostname_from_lldp()
-                dns_duration = int((time.time() - dns_start) + 0.5)
-                self.add_more_info('System', 'DNS Read (lldp)', f"{dns_duration} seconds")
-            # resolve the ethernet OUI to vendor
-            oui_start = time.time()
-            self._lookup_ethernet_vendors()
-            oui_duration = int((time.time() - oui_start) + 0.5)
-            self.add_more_info('System', 'Ethernet Vendor Search', f"{oui_duration} seconds")
-
+            self._lookup_client_info()
             return True
         self.add_warning("WARNING: device driver does not support 'get_my_basic_info()'' !")
         return False
@@ -383,6 +456,84 @@ class Connector:
         return True
     '''
 
+    def get_interface_client_data(self, interface: Interface) -> bool:
+        '''
+        Load the client data (ethernet addresses, arp and lldp neighbors) of a single interface.
+        Drivers that implement get_my_interface_client_data() only read the parts of the device tables
+        for this interface, e.g. the ethernet addresses in the vlans of the interface.
+        Other drivers read all client data, and keep the data of this interface.
+        The client data of all other interfaces is cleared, so this is not a full client data read,
+        and client_data_read_timestamp is reset.
+
+        Args:
+            interface (Interface): the Interface() object to read the client data for.
+
+        Returns:
+            return True on success, False on error and set self.error variables
+        '''
+        dprint(f"get_interface_client_data() for {interface.name}")
+        self.clear_client_data()
+        self.set_all_interfaces_changed()
+        self.client_data_read_timestamp = 0
+        start_time = time.time()
+        if hasattr(self, 'get_my_interface_client_data'):
+            retval = self.get_my_interface_client_data(interface)  # implemented by device/vendor class
+        elif hasattr(self, 'get_my_client_data'):
+            retval = self.get_my_client_data()
+            for iface in self.interfaces.values():
+                if iface.key != interface.key:
+                    iface.eth = {}
+                    iface.lldp = {}
+        else:
+            self.add_warning("WARNING: device driver does not support 'get_my_client_data()' !")
+            return False
+        read_duration = int((time.time() - start_time) + 0.5)
+        self.add_more_info('System', 'Client Info Read', f"{read_duration} seconds ({interface.name} only)")
+        self.eth_addr_count = len(interface.eth)
+        self.neighbor_count = len(interface.lldp)
+        self._lookup_client_info()
+        return retval is not False
+
+    def _lookup_client_info(self):
+        '''
+        Add the information about the client data that is not read from the device:
+        the hostnames of arp and lldp addresses (if enabled), and the vendors of the ethernet addresses.
+
+        Args:
+            none
+
+        Returns:
+            none
+        '''
+        # the arp and lldp lookups share the time we wait for dns answers:
+        dns_deadline = time.time() + settings.DNS_RESOLVE_TIME_BUDGET
+        # are we resolving IP addresses to hostnames?
+        if settings.LOOKUP_HOSTNAME_ARP:
+            dns_start = time.time()
+            self._lookup_hostname_from_arp(deadline=dns_deadline)
+            dns_duration = int((time.time() - dns_start) + 0.5)
+            self.add_more_info('System', 'DNS Read (arp)', f"{dns_duration} seconds")
+        # are we resolving IP addresses for LLDP neighbors?
+        if settings.LOOKUP_HOSTNAME_LLDP:
+            dns_start = time.time()
+            self._lookup_hostname_from_lldp(deadline=dns_deadline)
+            dns_duration = int((time.time() - dns_start) + 0.5)
+            self.add_more_info('System', 'DNS Read (lldp)', f"{dns_duration} seconds")
+        # resolve the ethernet OUI to vendor
+        oui_start = time.time()
+        self._lookup_ethernet_vendors()
+        oui_duration = int((time.time() - oui_start) + 0.5)
+        self.add_more_info('System', 'Ethernet Vendor Search', f"{oui_duration} seconds")
+
+    '''
+    placeholder for an optional class-specific implementation, to read only the client data
+    of a single interface, see get_interface_client_data()
+    return True on success, False on error and set self.error variables
+
+    def get_my_interface_client_data(self, interface):
+        return True
+    '''
+
     def clear_client_data(self):
         '''
         Clear out all client data, ie arp, lldp, etc.
@@ -415,6 +566,8 @@ class Connector:
             # set the flag to indicate we read this already, and store in session
             # if flag is set, the button will not be shown in menu bar!
             self.hardware_details_needed = False
+            # vendor drivers may add hardware details to interfaces:
+            self.set_all_interfaces_changed()
             # and cache it:
             # self.save_cache()
             return True
@@ -457,7 +610,7 @@ class Connector:
         # interface.admin_status = new_state
         dprint(f"Connector.set_interface_admin_status() for {interface.name} to {bool(new_state)}")
         interface.admin_status = bool(new_state)
-        # self.save_cache()
+        self.set_interface_changed(interface)
         return True
 
     def set_interface_description(self, interface: Interface, description: str) -> bool:
@@ -473,7 +626,7 @@ class Connector:
         '''
         dprint(f"Connector.set_interface_description() for {interface.name} to '{description}'")
         interface.description = description
-        # self.save_cache()
+        self.set_interface_changed(interface)
         return True
 
     def set_interface_poe_status(self, interface: Interface, new_state: int) -> bool:
@@ -493,7 +646,7 @@ class Connector:
             dprint("   PoE admin_status set OK")
             if new_state == POE_PORT_ADMIN_DISABLED:
                 interface.poe_entry.power_consumed = 0
-            # self.save_cache()
+            self.set_interface_changed(interface)
         else:
             dprint("WARNING: set_interface_poe_status() called on Non-PoE interface!")
         return True
@@ -517,7 +670,7 @@ class Connector:
         interface.poe_entry.admin_status = POE_PORT_ADMIN_ENABLED
         interface.poe_entry.power_consumption_supported = True
         interface.poe_entry.power_available = int(power_available)
-        # self.save_cache()
+        self.set_interface_changed(interface)
         dprint("   PoE available power set OK")
         return True
 
@@ -542,7 +695,7 @@ class Connector:
             interface.poe_entry.detect_status = POE_PORT_DETECT_DELIVERING
         interface.poe_entry.power_consumption_supported = True
         interface.poe_entry.power_consumed = int(power_consumed)
-        # self.save_cache()
+        self.set_interface_changed(interface)
         dprint("   PoE consumed power set OK")
         return True
 
@@ -563,6 +716,7 @@ class Connector:
             self.poe_capable = True
             self.poe_enabled = True
         interface.poe_entry.detect_status = status
+        self.set_interface_changed(interface)
         return True
 
     def set_interface_untagged_vlan(self, interface: Interface, new_vlan_id: int) -> bool:
@@ -578,7 +732,7 @@ class Connector:
         '''
         dprint(f"Connector.set_interface_untagged_vlan() for {interface.name} to vlan {new_vlan_id}")
         interface.untagged_vlan = int(new_vlan_id)
-        # self.save_cache()
+        self.set_interface_changed(interface)
         return True
 
     def add_interface_tagged_vlan(self, interface: Interface, new_vlan: int) -> bool:
@@ -593,7 +747,7 @@ class Connector:
             True on success, False on error and set self.error variables
         '''
         interface.vlans.append(int(new_vlan))
-        # self.save_cache()
+        self.set_interface_changed(interface)
         return True
 
     def remove_interface_tagged_vlan(self, interface: Interface, old_vlan: int) -> bool:
@@ -608,7 +762,7 @@ class Connector:
             True on success, False on error and set self.error variables
         '''
         interface.vlans.remove(int(old_vlan))
-        # self.save_cache()
+        self.set_interface_changed(interface)
         return True
 
     def vlan_create(self, vlan_id: int, vlan_name: str) -> bool:
@@ -811,6 +965,7 @@ class Connector:
         dprint(f"set_interface_attribute_by_key() for {key} ({type(key)}), {attribute} = {value} ({type(value)})")
         try:
             setattr(self.interfaces[key], attribute, value)
+            self.set_interface_changed(self.interfaces[key])
             return True
         except Exception as e:
             dprint(f"   ERROR: {e}")
@@ -847,6 +1002,7 @@ class Connector:
             dprint(f"   add_vlan_to_interface(): Adding Vlan {vlan_id} to {iface.name}!")
             iface.vlans.append(vlan_id)
             iface.is_tagged = True
+            self.set_interface_changed(iface)
 
     def set_interfaces_natural_sort_order(self):
         '''
@@ -1077,49 +1233,107 @@ class Connector:
     def load_cache(self) -> bool:
         '''
         Load cached data to improve performance.
+        The device data is read from the shared device cache (see save_cache()),
+        and the permissions of the current user from the HTTP session. If the permissions are not
+        found, or were set for an older version of the device data, they are calculated again.
 
         Args:
             none
         Returns:
             True if cache was read and variables set.
-            False if this fails, primarily when the switch id is not correct!
+            False if this fails, primarily when the device data is not cached (anymore).
         '''
         dprint("load_cache()")
 
-        if self.request and 'switch_id' in self.request.session.keys():
-            # is the cached data for the current switch ?
-            if self.request.session['switch_id'] != self.switch.id:
-                # wrong switch id, i.e. we changed switches, clear session data!
-                dprint("load_cache() for new switch! so clearing cache...")
-                self.clear_cache()
-                return False
+        if not self.request:
+            return False
 
-            # Yes - read it
-            dprint("load_cache() for current switch!")
-            start_time = time.time()
-            count = 0
-            # get myself from cache :-)
-            for attr_name, value in self.__dict__.items():
-                dprint(f"Reading cached attribute '{attr_name}'")
-                if attr_name not in self._do_not_cache:
-                    if attr_name in self.request.session.keys():
-                        dprint("   Valid attribute!")
-                        # with Django 5, Pickle serialization is no longer supported, so to use the JSON session cache
-                        # we use jsonpickle to make sure we can store *any* class object in the sesssion!
-                        # keys=True ensures that integer dictionary keys are maintained! (e.g self.vlans)
-                        self.__setattr__(attr_name, jsonpickle.decode(self.request.session[attr_name], keys=True))
-                        count += 1
-                else:
-                    dprint("   Ignoring (_do_not_cache)!")
+        if self.request.session.get('switch_id', None) != self.switch.id:
+            # we changed switches, clear session data!
+            dprint("load_cache() for new switch! so clearing session cache...")
+            self.clear_cache()
 
-            # call the child-class specific load_my_cache()
-            self.load_my_cache()
-            self.cache_loaded = True
-            stop_time = time.time()
-            self.add_timing("Cache load", count, stop_time - start_time)
-            return True
-        dprint("  NO cache found!")
-        return False
+        start_time = time.time()
+        cached = self.read_device_cache()
+        if not cached:
+            return False
+        # get myself from cache :-)
+        dprint("load_cache() for current switch!")
+        count = self.apply_device_cache(cached)
+
+        # now add the permissions of the current user:
+        if not self._load_permissions(generation=self.cache_generation):
+            dprint("   Setting interface permissions for this user")
+            self._set_interfaces_permissions()
+        self.request.session['switch_id'] = self.switch.id
+        # the cached data may have been read via another group:
+        self.add_more_info('System', 'Group', self.group.name)
+
+        # call the child-class specific load_my_cache()
+        self.load_my_cache()
+        self.cache_loaded = True
+        stop_time = time.time()
+        self.add_timing("Cache load", count, stop_time - start_time)
+        return True
+
+    def read_device_cache(self) -> dict | None:
+        '''
+        Read the device data of this driver from the shared device cache, without changing this object.
+        See apply_device_cache() to use the data.
+
+        Args:
+            none
+
+        Returns:
+            (dict) with the cache 'entry', and the 'attributes' and 'interfaces' data,
+            or None if the device data is not cached (anymore).
+        '''
+        entry = get_device_cache(self.switch.id)
+        if (
+            not entry
+            or entry['driver'] != self.__class__.__name__
+            or entry['schema'] != serializer.get_schema_version()
+        ):
+            dprint("  NO cache found!")
+            return None
+        try:
+            attributes = {name: serializer.loads(data) for name, data in entry['attributes'].items()}
+            interfaces = {key: serializer.loads(data) for key, data in entry['interfaces'].items()}
+        except Exception as err:
+            dprint(f"  Cannot read cached data: {err}")
+            return None
+        return {'entry': entry, 'attributes': attributes, 'interfaces': interfaces}
+
+    def apply_device_cache(self, cached: dict) -> int:
+        '''
+        Set the device data read from the shared device cache, see read_device_cache().
+        From here on, changes are tracked so save_cache() only writes what changed.
+
+        Args:
+            cached (dict): the data returned by read_device_cache()
+
+        Returns:
+            (int) the number of attributes set.
+        '''
+        entry = cached['entry']
+        attributes = dict(cached['attributes'], interfaces=cached['interfaces'])
+        count = 0
+        for attr_name, value in attributes.items():
+            dprint(f"Reading cached attribute '{attr_name}'")
+            if attr_name in self.__dict__ and attr_name not in self._do_not_cache:
+                self.__setattr__(attr_name, value)
+                count += 1
+            else:
+                dprint("   Ignoring (_do_not_cache)!")
+
+        # from here on, track changes so save_cache() only writes what changed:
+        self._cached_attribute_data = entry['attributes']
+        self._cached_interface_keys = list(cached['interfaces'].keys())
+        self._cached_interface_data = dict(entry['interfaces'])
+        self._changed_interfaces = set()
+        self._all_interfaces_changed = False
+        self.cache_generation = entry['generation']
+        return count
 
     def load_my_cache(self):
         '''
@@ -1137,9 +1351,15 @@ class Connector:
     def save_cache(self) -> bool:
         '''
         Save various data in a cache for access by the next page.
-        By default, we store in the HTTP request session, see also
-        add_to_cache() below.
-        Can be overriden by sub-class to use other cache mechanisms, eg Redis.
+        The device data is stored in the shared device cache, so all users of this device can use it,
+        see set_device_cache() below. The permissions of the current user on the device data
+        (i.e. allowed vlans, and manageable interfaces) are stored in the HTTP request session.
+        See also add_to_cache() below.
+        Can be overriden by sub-class to use other cache mechanisms.
+
+        If the data was loaded from the cache, only the changes are written: attributes that serialize
+        to different data than what was loaded, and the interfaces marked as changed,
+        see set_interface_changed() and set_all_interfaces_changed().
 
         Args:
             none
@@ -1154,20 +1374,10 @@ class Connector:
         if self.request:
             # save switch ID, it all triggers around that!
             start_time = time.time()
-            count = 0
             self.request.session['switch_id'] = self.switch.id
-            # can I cache myself :-) ?
-            for attr_name, value in self.__dict__.items():
-                if attr_name not in self._do_not_cache:
-                    # with Django 5, Pickle serialization is no longer supported, so to use the JSON session cache
-                    # we use jsonpickle to make sure we can store *any* class object in the sesssion!
-                    # keys=True ensures that integer dictionary keys are maintained! (e.g self.vlans)
-                    dprint(f"  Caching Attrib = {attr_name}")
-                    self.request.session[attr_name] = jsonpickle.encode(value, keys=True)
-                    count += 1
-                else:
-                    dprint(f"  NOT caching attrib = {attr_name}")
-            dprint("  End of for-loop)")
+            count = self.save_device_cache()
+            # and the permissions of this user, for this version of the data:
+            self._save_permissions(generation=self.cache_generation)
             # now notify we changed the session data:
             self.request.session.modified = True
 
@@ -1181,6 +1391,149 @@ class Connector:
         dprint("save_cache() DONE!")
         return True
 
+    def save_device_cache(self) -> int:
+        '''
+        Save the device data in the shared device cache, without the data of the current user.
+        This is called from save_cache(), and from a background refresh, see start_device_refresh() below.
+
+        Args:
+            none
+
+        Returns:
+            (int) the number of items written to the cache.
+        '''
+        dprint("Connector.save_device_cache()")
+        compress = settings.DEVICE_CACHE_COMPRESS
+        # can I cache myself :-) ?
+        # the compact serializer handles our class objects, and keeps integer dictionary keys (e.g self.vlans)
+        attributes = {}
+        changed_attributes = {}
+        for attr_name, value in self.__dict__.items():
+            if (
+                attr_name not in self._do_not_cache
+                and attr_name not in self._per_user_attributes
+                and attr_name != 'interfaces'
+            ):
+                data = serializer.dumps(value, compress=compress)
+                attributes[attr_name] = data
+                if data != self._cached_attribute_data.get(attr_name, None):
+                    dprint(f"  Caching Attrib = {attr_name}")
+                    changed_attributes[attr_name] = data
+            else:
+                dprint(f"  NOT caching attrib = {attr_name}")
+        dprint("  End of for-loop)")
+        # the interfaces are cached in groups, only the groups with changed interfaces are written:
+        interface_keys = list(self.interfaces.keys())
+        if self._all_interfaces_changed or interface_keys != self._cached_interface_keys:
+            changed_keys = interface_keys
+            interface_data = {}
+        else:
+            changed_keys = [key for key in self._changed_interfaces if key in self.interfaces]
+            interface_data = self._cached_interface_data
+        for key in changed_keys:
+            interface_data[key] = serializer.dumps(self.interfaces[key], compress=compress)
+        positions = {key: position for position, key in enumerate(interface_keys)}
+        changed_groups = {positions[key] // DEVICE_CACHE_INTERFACES_PER_ITEM for key in changed_keys}
+        interface_groups = {}
+        for group in changed_groups:
+            start = group * DEVICE_CACHE_INTERFACES_PER_ITEM
+            group_keys = interface_keys[start : start + DEVICE_CACHE_INTERFACES_PER_ITEM]
+            interface_groups[group] = {key: interface_data[key] for key in group_keys}
+        # the generation identifies this version of the device data:
+        self.cache_generation = time.time()
+        set_device_cache(
+            switch_id=self.switch.id,
+            entry={
+                'driver': self.__class__.__name__,
+                'generation': self.cache_generation,
+                'schema': serializer.get_schema_version(),
+                'interfaces': interface_keys,
+            },
+            attributes=attributes if changed_attributes else None,
+            interface_groups=interface_groups,
+        )
+        # the cache now has the current data:
+        self._cached_attribute_data = attributes
+        self._cached_interface_keys = interface_keys
+        self._cached_interface_data = interface_data
+        self._changed_interfaces = set()
+        self._all_interfaces_changed = False
+        return len(changed_attributes) + len(changed_keys)
+
+    def set_interface_changed(self, interface: Interface):
+        '''
+        Mark an interface as changed, so it will be written to the cache in save_cache().
+        This needs to be called when an interface changes after the data was loaded from the cache.
+        The base-class set_interface_*() functions already do this.
+
+        Args:
+            interface: the Interface() object that changed.
+
+        Returns:
+            none
+        '''
+        self._changed_interfaces.add(interface.key)
+
+    def set_all_interfaces_changed(self):
+        '''
+        Mark all interfaces as changed, so they will all be written to the cache in save_cache().
+        E.g. after reading the client data (ethernet, arp, lldp), which changes all interfaces.
+
+        Args:
+            none
+
+        Returns:
+            none
+        '''
+        self._all_interfaces_changed = True
+
+    def _save_permissions(self, generation: float):
+        '''
+        Save the permissions of the current user on the device data in the HTTP session.
+
+        Args:
+            generation (float): the version of the device data these permissions are for.
+
+        Returns:
+            none
+        '''
+        self.request.session['device_permissions'] = {
+            'switch_id': self.switch.id,
+            'group_id': self.group.id,
+            'generation': generation,
+            'allowed_vlans': serializer.encode(self.allowed_vlans),
+            'interfaces': {
+                key: [getattr(iface, name) for name in PER_USER_INTERFACE_ATTRIBUTES]
+                for key, iface in self.interfaces.items()
+            },
+        }
+
+    def _load_permissions(self, generation: float) -> bool:
+        '''
+        Load the permissions of the current user on the device data from the HTTP session.
+
+        Args:
+            generation (float): the version of the device data loaded from the cache.
+
+        Returns:
+            True if permissions were found for this device, group and version of the data, False if not.
+        '''
+        permissions = self.request.session.get('device_permissions', None)
+        if (
+            not permissions
+            or permissions['switch_id'] != self.switch.id
+            or permissions['group_id'] != self.group.id
+            or permissions['generation'] != generation
+        ):
+            return False
+        self.allowed_vlans = serializer.decode(permissions['allowed_vlans'])
+        for key, values in permissions['interfaces'].items():
+            iface = self.interfaces.get(key, None)
+            if iface:
+                for name, value in zip(PER_USER_INTERFACE_ATTRIBUTES, values):
+                    setattr(iface, name, value)
+        return True
+
     def save_my_cache(self):
         '''
         To be implemented by child classes.
@@ -1304,7 +1657,7 @@ class Connector:
             return True
         return False
 
-    def add_timing(self, name: str, count: int, time):
+    def add_timing(self, name: str, count: int, time, add_to_total: bool = True):
         '''
         Function to track response time of the switch
         This add/updates self.timing {}, dictionary to track how long various calls
@@ -1314,11 +1667,15 @@ class Connector:
             name (str): name of timed item
             count(int): number of occurances of item
             time:  time() is took for this item.
+            add_to_total (bool): if True, also add count and time to the "Total" entry.
+                                 Set to False for summary entries of already timed items.
 
         Returns:
             none
         '''
         self.timing[name] = (count, time)
+        if not add_to_total:
+            return
         (total_count, total_time) = self.timing["Total"]
         total_count += count
         total_time += time
@@ -1388,6 +1745,7 @@ class Connector:
         set the list of vlans defined on the switch that are allowed per the SwitchGroup.vlangroups/vlans
         self.vlans = {} dictionary of vlans on the current switch, i.e. Vlan() objects, but
         self.group.vlans and self.group.vlangroups is a list of allowed VLAN() Django objects (see switches/models.py)
+        The allowed vlan ids of the group are cached, see get_group_allowed_vlans() below.
 
         Args:
             none
@@ -1403,31 +1761,23 @@ class Connector:
             # Read-Only group or user, no vlan allowed!
             dprint("  read-only, no vlans allowed!")
             return
-        for switch_vlan_id in self.vlans.keys():
-            # if allow_all is set, or we are staff or supervisor, allow this vlan:
-            if self.group.allow_all_vlans or (
-                self.request and (self.request.user.is_superuser or self.request.user.is_staff)
-            ):
-                self.allowed_vlans[int(switch_vlan_id)] = self.vlans[switch_vlan_id]
-                dprint(f"  {switch_vlan_id}: allowed per allow-all or superuser or staff")
-            else:
-                # 'regular' user, first check the switchgroup.vlan_groups:
-                found_vlan = False
-                for vlan_group in self.group.vlan_groups.all():
-                    for group_vlan in vlan_group.vlans.all():
-                        if int(group_vlan.vid) == int(switch_vlan_id):
-                            self.allowed_vlans[int(switch_vlan_id)] = self.vlans[switch_vlan_id]
-                            found_vlan = True
-                            dprint(f"  {switch_vlan_id}: allowed per group.vlan_groups")
-                            continue
-                # check if this switch vlan is in the list of allowed vlans
-                if not found_vlan:
-                    for group_vlan in self.group.vlans.all():
-                        if int(group_vlan.vid) == int(switch_vlan_id):
-                            # save using the switch vlan name, which is possibly different from the VLAN group name!
-                            self.allowed_vlans[int(switch_vlan_id)] = self.vlans[switch_vlan_id]
-                            dprint(f"  {switch_vlan_id}: allowed per group.vlans(individual)")
-                            continue
+        # if we are staff or supervisor, allow all vlans:
+        if self.request and (self.request.user.is_superuser or self.request.user.is_staff):
+            dprint("  all vlans allowed per superuser or staff")
+            self.allowed_vlans = {int(vlan_id): vlan for vlan_id, vlan in self.vlans.items()}
+            return
+        # 'regular' user, get the vlans allowed in the group (None means all):
+        group_vlans = get_group_allowed_vlans(self.group)
+        if group_vlans is None:
+            dprint("  all vlans allowed per group allow-all")
+            self.allowed_vlans = {int(vlan_id): vlan for vlan_id, vlan in self.vlans.items()}
+            return
+        # the intersection of the switch vlans and the group vlans, in the order of the switch vlans.
+        # Note: save using the switch vlan name, which is possibly different from the VLAN group name!
+        self.allowed_vlans = {
+            int(vlan_id): vlan for vlan_id, vlan in self.vlans.items() if int(vlan_id) in group_vlans
+        }
+        dprint(f"  {len(self.allowed_vlans)} vlans allowed per group.vlan_groups and group.vlans")
         return
 
     def _set_interfaces_permissions(self):
@@ -1448,9 +1798,17 @@ class Connector:
         # find allowed vlans for this user
         self._set_allowed_vlans()
 
+        # the shared device data can hold the permissions of another user, so start from the defaults,
+        # and the reason set by the driver, if any:
+        defaults = Interface(key='')
+
         # apply the permission rules to all interfaces
         for iface in self.interfaces.values():
             # dprint(f"  checking {iface.name}")
+            for name in PER_USER_INTERFACE_ATTRIBUTES:
+                setattr(iface, name, getattr(defaults, name))
+            if iface.driver_unmanage_reason:
+                iface.unmanage_reason = iface.driver_unmanage_reason
 
             # if disabled by the Connector() driver:
             if iface.disabled:
@@ -1691,47 +2049,77 @@ class Connector:
             return True
         return False
 
-    def _lookup_hostname_from_arp(self):
+    def _lookup_hostname_from_arp(self, deadline: float = 0):
         """Look up the hostnames for found ethernet/arp pairs on all interfaces.
         Fill the hostname attribute for all arp IP's found, using dns resolution of
-        the PTR reverse lookup.
+        the PTR reverse lookup. All addresses are resolved at once, see resolve_ip_dns_names().
 
         Args:
-            none
+            deadline (float): the time.time() when we stop waiting for answers, 0 is the default budget.
 
         Returns:
             none
         """
         dprint("_lookup_hostname_from_arp() called.")
-        for interface in self.interfaces.values():
-            for eth in interface.eth.values():
-                if eth.address_ip4:
-                    eth.hostname = get_ip_dns_name(eth.address_ip4)
-                # only resolve IPv6 if IPv4 did not resolve hostname
-                if not eth.hostname and eth.address_ip6:
-                    eth.hostname = get_ip_dns_name(eth.address_ip6)
+        eth_addresses = [eth for interface in self.interfaces.values() for eth in interface.eth.values()]
+        names = resolve_ip_dns_names(
+            ips=[eth.address_ip4 for eth in eth_addresses if eth.address_ip4], deadline=deadline
+        )
+        for eth in eth_addresses:
+            if eth.address_ip4:
+                eth.hostname = names.get(str(eth.address_ip4), '')
+        # only resolve IPv6 if IPv4 did not resolve hostname
+        eth_addresses = [eth for eth in eth_addresses if not eth.hostname and eth.address_ip6]
+        names = resolve_ip_dns_names(ips=[eth.address_ip6 for eth in eth_addresses], deadline=deadline)
+        for eth in eth_addresses:
+            eth.hostname = names.get(str(eth.address_ip6), '')
         return
 
-    def _lookup_hostname_from_lldp(self):
+    def _lookup_hostname_from_lldp(self, deadline: float = 0):
         """Look up the hostnames for found lldp neigbors on all interfaces,
         if the chassis address type an ip address.
         Fill the hostname attribute using dns resolution of
-        the PTR reverse lookup.
+        the PTR reverse lookup. All addresses are resolved at once, see resolve_ip_dns_names().
 
         Args:
-            none
+            deadline (float): the time.time() when we stop waiting for answers, 0 is the default budget.
 
         Returns:
             none
         """
         dprint("_lookup_hostname_from_lldp() called.")
+        neighbors = []
         for interface in self.interfaces.values():
             for neighbor in interface.lldp.values():
                 if neighbor.chassis_type == LLDP_CHASSIC_TYPE_NET_ADDR:
                     # networkAddress(5), first byte is address type, next bytes are address.
                     # see https://www.iana.org/assignments/address-family-numbers/address-family-numbers.xhtml
                     if neighbor.chassis_string_type in [IANA_TYPE_IPV4, IANA_TYPE_IPV6]:
-                        neighbor.hostname = get_ip_dns_name(neighbor.chassis_string)
+                        neighbors.append(neighbor)
+        names = resolve_ip_dns_names(ips=[neighbor.chassis_string for neighbor in neighbors], deadline=deadline)
+        for neighbor in neighbors:
+            neighbor.hostname = names.get(str(neighbor.chassis_string), '')
+        return
+
+    def _lookup_hostname_from_routed_ip(self, deadline: float = 0):
+        """Look up the hostnames for the IPv4 and IPv6 addresses on all interfaces.
+        All addresses are resolved at once, see resolve_ip_dns_names().
+
+        Args:
+            deadline (float): the time.time() when we stop waiting for answers, 0 is the default budget.
+
+        Returns:
+            none
+        """
+        dprint("_lookup_hostname_from_routed_ip() called.")
+        addresses = []
+        for interface in self.interfaces.values():
+            addresses.extend(interface.addresses_ip4.values())
+            addresses.extend(interface.addresses_ip6.values())
+        addresses = [address for address in addresses if not address.hostname]
+        names = resolve_ip_dns_names(ips=[address.ip for address in addresses], deadline=deadline)
+        for address in addresses:
+            address.resolve_ip_address(names=names)
         return
 
     def _lookup_ethernet_vendors(self):
@@ -1746,8 +2134,8 @@ class Connector:
         """
         dprint("_lookup_ethernet_vendors() called.")
 
-        # load the Wireshark ethernet OUI parser
-        parser = manuf.manuf.MacParser()
+        # get the process-wide Wireshark ethernet OUI index, this is loaded only once
+        parser = manuf.get_oui_index()
         # go through the list of ethernet addresses on each interface
         for interface in self.interfaces.values():
             for eth in interface.eth.values():
@@ -1763,7 +2151,7 @@ class Connector:
         '''Look up an ethernet address in the OUI database, and return vendor information.
 
         Args:
-            parser: a pre-loaded manuf.MacParser() object.
+            parser: a pre-loaded manuf.OuiIndex() or manuf.MacParser() object.
             ethernet_address (str): the string representing the ethernet address
 
         Returns:
@@ -1824,8 +2212,334 @@ def clear_switch_cache(request: HttpRequest):
     '''
     dprint("clear_switch_cache() called:")
     if request:
-        # all we have to do it clear the 'switch_id' !
+        # all we have to do it clear the 'switch_id' and user permissions!
+        # note that the device data stays in the shared device cache, see clear_device_cache()
         if 'switch_id' in request.session:
             del request.session['switch_id']
             request.session.modified = True
+        if 'device_permissions' in request.session:
+            del request.session['device_permissions']
+            request.session.modified = True
         # if not found, we had not selected a switch before. ie upon login!
+
+
+def get_device_cache_key(switch_id: int, item: str = '') -> str:
+    '''
+    Get the key of a device, or an item of the device data, in the shared device cache.
+
+    Args:
+        switch_id (int): the id of the Switch() object.
+        item (str): the name of the item, if not set the key for the device entry.
+
+    Returns:
+        (str) the cache key.
+    '''
+    if item:
+        return f"openl2m:device:{switch_id}:v{DEVICE_CACHE_VERSION}:{item}"
+    return f"openl2m:device:{switch_id}:v{DEVICE_CACHE_VERSION}"
+
+
+def get_device_cache_items(entry: dict) -> List[str]:
+    '''
+    Get the names of the items a device entry in the shared device cache consists of:
+    all attributes are stored in one item, and the interfaces in groups of DEVICE_CACHE_INTERFACES_PER_ITEM.
+    This keeps the number of cache keys per device small.
+
+    Args:
+        entry (dict): the device entry, see Connector.save_device_cache()
+
+    Returns:
+        (list) of the item names, see get_device_cache_key()
+    '''
+    groups = (len(entry['interfaces']) + DEVICE_CACHE_INTERFACES_PER_ITEM - 1) // DEVICE_CACHE_INTERFACES_PER_ITEM
+    return ['attributes'] + [f"interfaces:{group}" for group in range(groups)]
+
+
+def get_device_cache(switch_id: int) -> dict | None:
+    '''
+    Get the cached data of a device from the shared device cache.
+    This uses the Django cache framework, the cache is configured with settings.DEVICE_CACHE_ALIAS
+    The device entry lists the keys of the interfaces, the data is stored in separate items
+    in the cache, see set_device_cache().
+
+    Args:
+        switch_id (int): the id of the Switch() object.
+
+    Returns:
+        (dict) the device entry, see Connector.save_device_cache(), with 'attributes' and 'interfaces'
+        dictionaries of the serialized data of each attribute and interface. Or None if not found, or incomplete.
+    '''
+    cache = caches[settings.DEVICE_CACHE_ALIAS]
+    entry = cache.get(get_device_cache_key(switch_id), None)
+    if not entry:
+        return None
+    item_keys = {get_device_cache_key(switch_id, item): item for item in get_device_cache_items(entry)}
+    items = cache.get_many(list(item_keys.keys()))
+    if len(items) != len(item_keys):
+        # some items expired:
+        return None
+    interfaces = {}
+    for cache_key, item in item_keys.items():
+        if item != 'attributes':
+            interfaces.update(items[cache_key])
+    if any(key not in interfaces for key in entry['interfaces']):
+        return None
+    entry = dict(entry)
+    entry['attributes'] = items[get_device_cache_key(switch_id, 'attributes')]
+    entry['interfaces'] = {key: interfaces[key] for key in entry['interfaces']}
+    return entry
+
+
+def set_device_cache(switch_id: int, entry: dict, attributes: dict | None, interface_groups: dict):
+    '''
+    Store the data of a device in the shared device cache, for settings.DEVICE_CACHE_TIMEOUT seconds.
+    Only the given (changed) items are written, and the device entry is always written.
+    The expiry of the other items of the device is extended, so these do not expire before the device entry.
+
+    Args:
+        switch_id (int): the id of the Switch() object.
+        entry (dict): the device entry, see Connector.save_device_cache()
+        attributes (dict): the serialized data of all attributes, key is the attribute name. None if not changed.
+        interface_groups (dict): the groups of interfaces to write, key is the group number,
+                                 value is a dictionary with the serialized data of each interface in the group.
+
+    Returns:
+        none
+    '''
+    cache = caches[settings.DEVICE_CACHE_ALIAS]
+    items = {}
+    if attributes is not None:
+        items[get_device_cache_key(switch_id, 'attributes')] = attributes
+    for group, data in interface_groups.items():
+        items[get_device_cache_key(switch_id, f"interfaces:{group}")] = data
+    if items:
+        cache.set_many(items, timeout=settings.DEVICE_CACHE_TIMEOUT)
+    for item in get_device_cache_items(entry):
+        cache_key = get_device_cache_key(switch_id, item)
+        if cache_key not in items and not cache.touch(cache_key, timeout=settings.DEVICE_CACHE_TIMEOUT):
+            # this item is gone, the device data cannot be read from the cache anymore:
+            dprint(f"set_device_cache(): item '{item}' not found, removing device {switch_id}")
+            cache.delete(get_device_cache_key(switch_id))
+            return
+    cache.set(get_device_cache_key(switch_id), entry, timeout=settings.DEVICE_CACHE_TIMEOUT)
+
+
+def clear_device_cache(switch_id: int):
+    '''
+    Remove the data of a device from the shared device cache, so it gets read again from the device.
+    Only the device entry is removed, the items of the device data are no longer used, and will expire.
+
+    Args:
+        switch_id (int): the id of the Switch() object.
+
+    Returns:
+        none
+    '''
+    dprint(f"clear_device_cache() for switch {switch_id}")
+    caches[settings.DEVICE_CACHE_ALIAS].delete(get_device_cache_key(switch_id))
+
+
+def get_device_cache_generation(switch_id: int) -> float:
+    '''
+    Get the version ("generation") of the device data in the shared device cache.
+    This changes every time the device data is written to the cache.
+
+    Args:
+        switch_id (int): the id of the Switch() object.
+
+    Returns:
+        (float) the generation, or 0.0 if the device is not cached.
+    '''
+    entry = caches[settings.DEVICE_CACHE_ALIAS].get(get_device_cache_key(switch_id), None)
+    if not entry:
+        return 0.0
+    return entry['generation']
+
+
+def is_device_refreshing(switch_id: int) -> bool:
+    '''
+    Check if the device data is being refreshed in the background, see start_device_refresh()
+
+    Args:
+        switch_id (int): the id of the Switch() object.
+
+    Returns:
+        True if a refresh is running, False if not.
+    '''
+    return caches[settings.DEVICE_CACHE_ALIAS].get(get_device_cache_key(switch_id, 'refresh'), False)
+
+
+def lock_device_refresh(switch_id: int) -> bool:
+    '''
+    Take the refresh lock of a device, so only one refresh of the device data runs at a time, across all
+    web server and poller processes that share the device cache. The lock expires after DEVICE_REFRESH_LOCK_TIMEOUT.
+
+    Args:
+        switch_id (int): the id of the Switch() object.
+
+    Returns:
+        True if the lock was taken, False if another refresh is running.
+    '''
+    return caches[settings.DEVICE_CACHE_ALIAS].add(
+        get_device_cache_key(switch_id, 'refresh'), True, timeout=DEVICE_REFRESH_LOCK_TIMEOUT
+    )
+
+
+def unlock_device_refresh(switch_id: int):
+    '''
+    Release the refresh lock of a device, see lock_device_refresh()
+
+    Args:
+        switch_id (int): the id of the Switch() object.
+
+    Returns:
+        none
+    '''
+    caches[settings.DEVICE_CACHE_ALIAS].delete(get_device_cache_key(switch_id, 'refresh'))
+
+
+def start_device_refresh(connection: Connector) -> bool:
+    '''
+    Read the basic device data again in a background thread, and update the shared device cache when done.
+    This is used to show cached data right away, even if it is somewhat old (see settings.DEVICE_CACHE_SOFT_TTL),
+    and refresh it for the next page. Only one refresh per device runs at a time, see lock_device_refresh()
+
+    Args:
+        connection (Connector): the connection with the cached data, the refresh uses a new object of the same class.
+
+    Returns:
+        True if a refresh is running (started now, or by another request), False if not started.
+    '''
+    switch_id = connection.switch.id
+    if not lock_device_refresh(switch_id):
+        dprint(f"start_device_refresh() for switch {switch_id}: already running")
+        return True
+    dprint(f"start_device_refresh() for switch {switch_id}")
+    try:
+        thread = threading.Thread(
+            target=_refresh_device,
+            args=(connection.__class__, connection.request, connection.group, connection.switch),
+            name=f"refresh-device-{switch_id}",
+            daemon=True,
+        )
+        thread.start()
+    except Exception as err:
+        dprint(f"  Cannot start refresh thread: {err}")
+        unlock_device_refresh(switch_id)
+        return False
+    return True
+
+
+def _refresh_device(connector_class: type, request: HttpRequest, group: SwitchGroup, switch: Switch):
+    '''
+    Thread function, see start_device_refresh(). This does not touch the HTTP session of the request,
+    that belongs to the (finished) web request. The request is only used for request.user.
+    '''
+    try:
+        # a new object does not load the cache, so the device is read (or only what changed, if supported):
+        refresh_device_cache(connection=connector_class(request, group, switch))
+    except Exception as err:
+        dprint(f"_refresh_device() for switch {switch.id} ERROR: {err}\n{traceback.format_exc()}")
+    finally:
+        unlock_device_refresh(switch.id)
+        # the database connections of this thread are not re-used:
+        connections.close_all()
+
+
+def refresh_device_cache(connection: Connector, client_data: bool = False) -> bool:
+    '''
+    Read the device data, and write it to the shared device cache. If the read fails, the cached data is kept.
+    If the driver supports it, only what changed since the data was cached is read, see Connector.refresh_basic_info()
+    The caller needs to hold the refresh lock of the device, see lock_device_refresh()
+    This is used by the background refresh, and the poller (see "manage.py poll_switches").
+
+    Args:
+        connection (Connector): a new connection object, that has not loaded the cache.
+        client_data (bool): if True, also read the client data (ethernet, arp and lldp tables).
+
+    Returns:
+        True if the data was read and cached, False if not.
+    '''
+    switch_id = connection.switch.id
+    dprint(f"refresh_device_cache() for switch {switch_id} STARTING")
+    if not connection.refresh_basic_info():
+        connection.get_basic_info()
+    if connection.error.status:
+        # keep the cached data, it is better than nothing:
+        dprint(f"  Refresh failed, not caching: {connection.error.description}")
+        return False
+    if client_data:
+        if not connection.get_client_data() or connection.error.status:
+            # the basic data is fine, but do not cache partial client data:
+            dprint(f"  Client data read failed: {connection.error.description}")
+            connection.clear_client_data()
+            connection.client_data_read_timestamp = 0
+    connection.save_device_cache()
+    dprint(f"refresh_device_cache() for switch {switch_id} DONE")
+    return True
+
+
+def get_group_allowed_vlans(group: SwitchGroup) -> set | None:
+    '''
+    Get the vlan ids that users of a SwitchGroup() are allowed to manage, from the "allow_all_vlans" setting,
+    the vlans in the vlan_groups, and the individual vlans of the group.
+    These are cached for settings.PERMISSIONS_CACHE_TIMEOUT seconds, and the cache is cleared when
+    the group or any vlan settings change, see switches/signals.py
+
+    Args:
+        group (SwitchGroup): the group to check.
+
+    Returns:
+        (set) of integer vlan ids, or None if all vlans are allowed.
+    '''
+    cache = caches[settings.DEVICE_CACHE_ALIAS]
+    version = get_group_vlans_version()
+    cache_key = f"openl2m:group_vlans:{group.id}"
+    if settings.PERMISSIONS_CACHE_TIMEOUT:
+        entry = cache.get(cache_key, None)
+        if entry and entry['version'] == version:
+            return entry['vlans']
+    dprint(f"get_group_allowed_vlans() reading group {group.id}")
+    if group.allow_all_vlans:
+        vlans = None
+    else:
+        vlans = set(VLAN.objects.filter(vlangroups__vlangroups=group).values_list('vid', flat=True))
+        vlans.update(group.vlans.values_list('vid', flat=True))
+    if settings.PERMISSIONS_CACHE_TIMEOUT:
+        cache.set(cache_key, {'version': version, 'vlans': vlans}, timeout=settings.PERMISSIONS_CACHE_TIMEOUT)
+    return vlans
+
+
+def get_group_vlans_version() -> float:
+    '''
+    Get the current version of the cached allowed vlans of the groups. Cached data of another version is not used.
+
+    Args:
+        none
+
+    Returns:
+        (float) the version.
+    '''
+    cache = caches[settings.DEVICE_CACHE_ALIAS]
+    version = cache.get("openl2m:group_vlans:version", None)
+    if version is None:
+        version = time.time()
+        # another process may have just set it, so use that:
+        if not cache.add("openl2m:group_vlans:version", version, timeout=None):
+            version = cache.get("openl2m:group_vlans:version", version)
+    return version
+
+
+def clear_group_vlans_cache():
+    '''
+    Clear the cached allowed vlans of all groups, see get_group_allowed_vlans()
+
+    Args:
+        none
+
+    Returns:
+        none
+    '''
+    dprint("clear_group_vlans_cache()")
+    # a new version makes all cached data invalid:
+    caches[settings.DEVICE_CACHE_ALIAS].set("openl2m:group_vlans:version", time.time(), timeout=None)
@@ -0,0 +1,248 @@
+#
+# This file is part of Open Layer 2 Management (OpenL2M).
+#
+# OpenL2M is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.  You should have received a copy of the GNU General Public
+# License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Compact serializer for the Connector() cache data, see Connector.save_cache() and load_cache()
+
+The classes in switches/connect/classes.py are stored as a list with a class code,
+followed by the values of the object attributes in a fixed order (the "schema" of the class).
+The schema of each class is found from the attributes of a new object, so it follows changes
+to these classes. The schema version is a hash of all class schemas, and is stored with the cached data.
+If the classes change, the cached data will not be used.
+
+Other containers are also encoded as lists with a type code, so dictionaries keep their integer keys
+(e.g. Connector().vlans). Anything else we do not know is encoded with jsonpickle.
+
+encode() and decode() convert to and from a tree of lists and simple values, that can be stored as JSON,
+e.g. in the HTTP session. dumps() and loads() convert to and from bytes, using msgpack if installed,
+or JSON if not, and optionally zlib compression.
+"""
+import datetime
+import hashlib
+import json
+import jsonpickle
+import netaddr
+import zlib
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from switches.connect.classes import (
+    StackMember,
+    VendorData,
+    IPNetworkHostname,
+    Vlan,
+    PortList,
+    EthernetAddress,
+    NeighborDevice,
+    PoePSE,
+    PoePort,
+    SyslogMsg,
+    Interface,
+)
+
+# increase this if the encoding below changes.
+SERIALIZER_VERSION = 1
+
+# type codes of the containers and special values:
+TYPE_LIST = 0
+TYPE_TUPLE = 1
+TYPE_DICT = 2
+TYPE_SET = 3
+TYPE_BYTES = 4
+TYPE_DATETIME = 5
+TYPE_PORTLIST = 6
+TYPE_JSONPICKLE = 7
+# the first code used for the classes below:
+TYPE_CLASS_BASE = 16
+
+# the classes we encode with a schema. Codes are assigned in this order, so only add at the end!
+# Each entry is the class, and a function to create a "default" object to find the attributes (schema).
+_schema_classes = (
+    (StackMember, lambda: StackMember(id=0, type=0)),
+    (VendorData, lambda: VendorData(name='', value='')),
+    (IPNetworkHostname, lambda: IPNetworkHostname(netaddr.IPNetwork('0.0.0.0/0'))),
+    (Vlan, lambda: Vlan()),
+    (EthernetAddress, lambda: EthernetAddress('00:00:00:00:00:00')),
+    (NeighborDevice, lambda: NeighborDevice(lldp_index='')),
+    (PoePSE, lambda: PoePSE(index=0)),
+    (PoePort, lambda: PoePort(index='', admin_status=0)),
+    (SyslogMsg, lambda: SyslogMsg(index=0)),
+    (Interface, lambda: Interface(key='0')),
+)
+
+# these are found the first time they are needed, see _get_schemas():
+_class_codes = {}  # class -> (code, tuple of attribute names)
+_code_classes = {}  # code -> (class, tuple of attribute names)
+_schema_version = ''
+
+
+def _get_schemas() -> dict:
+    """
+    Find the attribute names of each class, and the schema version.
+    Returns the dictionary of class to (code, attributes)
+    """
+    global _schema_version
+    if not _class_codes:
+        fingerprint = hashlib.sha1(f"serializer-{SERIALIZER_VERSION}".encode())
+        for offset, (cls, create) in enumerate(_schema_classes):
+            code = TYPE_CLASS_BASE + offset
+            attributes = tuple(vars(create()).keys())
+            _class_codes[cls] = (code, attributes)
+            _code_classes[code] = (cls, attributes)
+            fingerprint.update(f"{code}:{cls.__name__}:{','.join(attributes)};".encode())
+        _schema_version = fingerprint.hexdigest()[:16]
+    return _class_codes
+
+
+def get_schema_version() -> str:
+    """
+    Return the version of the current schema (as a string). This changes when the classes change.
+    """
+    _get_schemas()
+    return _schema_version
+
+
+def encode(value):
+    """
+    Encode a value into a tree of lists and simple values (str, int, float, bool, None), that can be stored as JSON.
+    """
+    value_type = type(value)
+    if value is None or value_type in (str, int, float, bool):
+        return value
+    if value_type is list:
+        return [TYPE_LIST] + [encode(item) for item in value]
+    if isinstance(value, dict):
+        encoded = [TYPE_DICT]
+        for key, item in value.items():
+            encoded.append(encode(key))
+            encoded.append(encode(item))
+        return encoded
+    schema = _get_schemas().get(value_type, None)
+    if schema:
+        (code, attributes) = schema
+        encoded = [code]
+        # the netaddr base classes keep their value in __slots__, so store that first:
+        if value_type is EthernetAddress:
+            encoded.append(int(value))
+        elif value_type is IPNetworkHostname:
+            encoded.append(str(value))
+        data = value.__dict__
+        encoded.extend(encode(data.get(name, None)) for name in attributes)
+        if len(data) > len(attributes):
+            # attributes added outside of __init__(), e.g. by a driver:
+            encoded.append(encode({name: item for name, item in data.items() if name not in attributes}))
+        return encoded
+    if value_type is tuple:
+        return [TYPE_TUPLE] + [encode(item) for item in value]
+    if value_type is PortList:
+        return [TYPE_PORTLIST, value.to_hex_string()]
+    if value_type in (set, frozenset):
+        return [TYPE_SET] + [encode(item) for item in value]
+    if value_type is bytes:
+        return [TYPE_BYTES, value.hex()]
+    if value_type is datetime.datetime:
+        return [TYPE_DATETIME, value.isoformat()]
+    # anything else:
+    return [TYPE_JSONPICKLE, jsonpickle.encode(value, keys=True)]
+
+
+def decode(encoded):
+    """
+    Decode a tree created by encode() back into the original value.
+    """
+    if type(encoded) is not list:
+        return encoded
+    code = encoded[0]
+    if code == TYPE_LIST:
+        return [decode(item) for item in encoded[1:]]
+    if code == TYPE_DICT:
+        return {decode(encoded[i]): decode(encoded[i + 1]) for i in range(1, len(encoded), 2)}
+    if code >= TYPE_CLASS_BASE:
+        _get_schemas()
+        (cls, attributes) = _code_classes[code]
+        value = cls.__new__(cls)
+        position = 1
+        if cls is EthernetAddress:
+            netaddr.EUI.__init__(value, encoded[1])
+            position = 2
+        elif cls is IPNetworkHostname:
+            netaddr.IPNetwork.__init__(value, encoded[1])
+            position = 2
+        data = value.__dict__
+        for name in attributes:
+            data[name] = decode(encoded[position])
+            position += 1
+        if position < len(encoded):
+            data.update(decode(encoded[position]))
+        return value
+    if code == TYPE_TUPLE:
+        return tuple(decode(item) for item in encoded[1:])
+    if code == TYPE_PORTLIST:
+        value = PortList()
+        value.portlist.frombytes(bytes.fromhex(encoded[1]))
+        return value
+    if code == TYPE_SET:
+        return set(decode(item) for item in encoded[1:])
+    if code == TYPE_BYTES:
+        return bytes.fromhex(encoded[1])
+    if code == TYPE_DATETIME:
+        return datetime.datetime.fromisoformat(encoded[1])
+    if code == TYPE_JSONPICKLE:
+        return jsonpickle.decode(encoded[1], keys=True)
+    raise ValueError(f"Unknown type code {code} in serialized data!")
+
+
+# the header of the data returned by dumps(), format and compression:
+_FORMAT_JSON = b'J'
+_FORMAT_MSGPACK = b'M'
+_COMPRESSION_NONE = b'-'
+_COMPRESSION_ZLIB = b'Z'
+
+
+def dumps(value, compress: bool = False, use_msgpack: bool = True) -> bytes:
+    """
+    Serialize a value to bytes. This uses msgpack if installed (and use_msgpack is True), or JSON if not.
+    If compress is True, the data is also compressed with zlib.
+    """
+    encoded = encode(value)
+    if use_msgpack and msgpack:
+        header = _FORMAT_MSGPACK
+        data = msgpack.packb(encoded, use_bin_type=True)
+    else:
+        header = _FORMAT_JSON
+        data = json.dumps(encoded, separators=(',', ':')).encode()
+    if compress:
+        return header + _COMPRESSION_ZLIB + zlib.compress(data, 1)
+    return header + _COMPRESSION_NONE + data
+
+
+def loads(data: bytes):
+    """
+    De-serialize bytes created by dumps().
+    Raises ValueError if the data cannot be read, e.g. msgpack data when msgpack is not installed.
+    """
+    (format, compression, data) = (data[0:1], data[1:2], data[2:])
+    if compression == _COMPRESSION_ZLIB:
+        data = zlib.decompress(data)
+    elif compression != _COMPRESSION_NONE:
+        raise ValueError("Unknown compression of serialized data!")
+    if format == _FORMAT_MSGPACK:
+        if not msgpack:
+            raise ValueError("Serialized data is msgpack format, but msgpack is not installed!")
+        return decode(msgpack.unpackb(data, raw=False, strict_map_key=False))
+    if format == _FORMAT_JSON:
+        return decode(json.loads(data))
+    raise ValueError("Unknown format of serialized data!")
@@ -113,6 +113,22 @@ class SnmpConnectorArubaCx(SnmpConnector):
 
         return False
 
+    def _get_basic_info_walks(self) -> dict:
+        """
+        Add the AOS-CX IEEE Q-Bridge and PoE branches to the list of branches read concurrently for the basic info.
+        """
+        walks = super()._get_basic_info_walks()
+        walks.update(
+            {
+                'ieee8021QBridgeVlanStaticName': (),
+                'ieee8021QBridgePortVlanEntry': (),
+                'ieee8021QBridgeVlanCurrentEgressPorts': (),
+                'ieee8021QBridgeVlanCurrentUntaggedPorts': (),
+                'arubaWiredPoePethPsePortPowerDrawn': ('pethMainPseEntry',),
+            }
+        )
+        return walks
+
     def _get_poe_data(self) -> int:
         """
         Aruba(HP) used both the standard PoE MIB, and their own ARUBAWIRED-POE mib.
@@ -199,6 +215,9 @@ class SnmpConnectorArubaCx(SnmpConnector):
                 if not self.set(f"{dot1qPvid}.{interface.index}", int(new_vlan_id), 'u'):
                     dprint("   ERROR!")
                     return False
+                # update interface() for view and caching
+                interface.untagged_vlan = int(new_vlan_id)
+                self.set_interface_changed(interface)
                 return True
             else:
                 # this needs work!
@@ -246,6 +265,9 @@ class SnmpConnectorArubaCx(SnmpConnector):
             if not self.set(f"{dot1qPvid}.{interface.index}", int(new_vlan_id), 'u'):
                 dprint("   ERROR!")
                 return False
+        # update interface() for view and caching
+        interface.untagged_vlan = int(new_vlan_id)
+        self.set_interface_changed(interface)
         return True
 
     def save_running_config(self) -> bool:
@@ -98,6 +98,45 @@ class SnmpConnectorCisco(SnmpConnector):
         """
         self.stack_port_to_if_index: Dict[int, int] = {}  # maps (Cisco) stacking port to ifIndex values
 
+    def _get_basic_info_walks(self) -> dict:
+        """
+        Override the list of branches read concurrently for the basic info.
+        Cisco devices use the VTP and VLAN-Membership mibs instead of the Q-Bridge mib for vlan data.
+        """
+        walks = super()._get_basic_info_walks()
+        for branch_name in (
+            'dot1qBase',
+            'dot1dBasePortIfIndex',
+            'dot1qVlanStaticRowStatus',
+            'dot1qVlanStaticName',
+            'dot1qVlanStatus',
+            'dot1qPvid',
+            'dot1qVlanCurrentEgressPorts',
+            'ieee8021QBridgeMvrpEnabledStatus',
+        ):
+            walks.pop(branch_name, None)
+        walks.update(
+            {
+                'cL2L3IfModeOper': (),
+                'vtpVlanState': (),
+                'vtpVlanType': (),
+                'vtpVlanName': (),
+                'vlanTrunkPortDynamicState': (),
+                'vlanTrunkPortNativeVlan': (),
+                'vlanTrunkPortVlansEnabled': (),
+                'vlanTrunkPortVlansEnabled2k': (),
+                'vlanTrunkPortVlansEnabled3k': ('vlanTrunkPortVlansEnabled2k',),
+                'vlanTrunkPortVlansEnabled4k': ('vlanTrunkPortVlansEnabled3k',),
+                'vmVlan': (),
+                'vmVoiceVlanId': (),
+                'portIfIndex': (),
+                'cpeExtPsePortPwrAvailable': (),
+                'cpeExtPsePortPwrConsumption': (),
+                'cpeExtPsePortMaxPwrDrawn': (),
+            }
+        )
+        return walks
+
     def _get_interface_data(self) -> bool:
         """
         Implement an override of the interface parsing routine,
@@ -171,39 +210,86 @@ class SnmpConnectorCisco(SnmpConnector):
         self.vlan_count = len(self.vlans)
         return self.vlan_count
 
-    def _get_known_ethernet_addresses(self) -> bool:
+    def _get_known_ethernet_addresses(self, vlan_ids: list = None) -> bool:
         """
         Read the Bridge-MIB for known ethernet address on the switch.
         On Cisco switches, you have to append the vlan ID after the v1/2c community,
-        eg. public@13 for vlan 13
+        eg. public@13 for vlan 13, or use the v3 context 'vlan-13'.
+        Only the vlans with active ports are read, see _get_active_vlan_ids(), or the vlans given in vlan_ids.
+        The per-vlan tables are walked concurrently (see _prefetch_snmp_contexts()), and parsed in vlan order.
         Return True on success (0 or more found), False on errors
         """
         dprint("_get_known_ethernet_addresses(Cisco)\n")
-        for vlan_id in self.vlans.keys():
+        if vlan_ids is None:
+            vlan_ids = self._get_active_vlan_ids()
+        else:
+            vlan_ids = [
+                vlan_id
+                for vlan_id in vlan_ids
+                if vlan_id in self.vlans and self.vlans[vlan_id].type == VLAN_TYPE_NORMAL
+            ]
+        contexts = {vlan_id: self._get_vlan_context(vlan_id) for vlan_id in vlan_ids}
+        prefetched = self._prefetch_snmp_contexts(contexts, ('dot1dBasePortIfIndex', 'dot1dTpFdbPort'))
+        concurrent = bool(prefetched)
+        retval = 0
+        for vlan_id in vlan_ids:
             # little hack for Cisco devices, to see various vlan-specific tables:
-            self.vlan_id_context = int(vlan_id)
-            com_or_ctx = ''
-            if self.switch.snmp_profile.version == SNMP_VERSION_2C:
-                # for v2, set community string to "Cisco format"
-                com_or_ctx = f"{self.switch.snmp_profile.community}@{vlan_id}"
+            self.vlan_id_context = vlan_id
+            if concurrent:
+                self._prefetched_walks = prefetched.pop(vlan_id)
             else:
-                # v3, set context to "Cisco format":
-                com_or_ctx = f"vlan-{vlan_id}"
-            self._set_snmp_session(com_or_ctx)
+                self._set_snmp_session(contexts[vlan_id])
             # first map Q-Bridge ports to ifIndexes:
             retval = self.get_snmp_branch('dot1dBasePortIfIndex')
             if retval < 0:
                 # probably an error, stop here!
-                return False
+                break
             # next, read the known ethernet addresses, and add to the Interfaces
             retval = self.get_snmp_branch('dot1dTpFdbPort', self._parse_mibs_dot1d_bridge_eth)
             if retval < 0:
                 # probably an error, stop here!
-                return False
+                break
         # reset the snmp session back!
         self.vlan_id_context = 0
-        self._set_snmp_session()
-        return True
+        self._prefetched_walks = {}
+        if not concurrent:
+            self._set_snmp_session()
+        return retval >= 0
+
+    def _get_vlan_context(self, vlan_id: int) -> str:
+        """
+        Return the community (v2) or context (v3) string to read the vlan-specific tables of a vlan.
+        """
+        if self.switch.snmp_profile.version == SNMP_VERSION_2C:
+            # for v2, set community string to "Cisco format"
+            return f"{self.switch.snmp_profile.community}@{vlan_id}"
+        # v3, set context to "Cisco format":
+        return f"vlan-{vlan_id}"
+
+    def _get_active_vlan_ids(self) -> list:
+        """
+        Return the ids of the (normal) vlans that have ethernet addresses to read: the vlans of the interfaces
+        that are up, i.e. the access vlan, voice vlan, or the vlans allowed on a trunk (vlanTrunkPortVlansEnabled).
+        If the vlans of the interfaces are not known, returns all vlans.
+        """
+        vlan_ids = set()
+        known = False
+        for iface in self.interfaces.values():
+            port_vlans = set(iface.vlans)
+            port_vlans.update(vlan_id for vlan_id in (iface.untagged_vlan, iface.voice_vlan) if vlan_id > 0)
+            if port_vlans:
+                known = True
+                if iface.oper_status:
+                    vlan_ids.update(port_vlans)
+        if not known:
+            vlan_ids = set(self.vlans.keys())
+        active = [
+            int(vlan_id)
+            for vlan_id, vlan in self.vlans.items()
+            if vlan_id in vlan_ids and vlan.type == VLAN_TYPE_NORMAL
+        ]
+        dprint(f"  Active vlans: {len(active)} of {len(self.vlans)}")
+        return sorted(active)
 
     def _get_poe_data(self) -> int:
         """
@@ -271,7 +357,6 @@ class SnmpConnectorCisco(SnmpConnector):
                             self.add_warning(warning)
                             # log my activity
                             log = Log(
-                                user=self.request.user,
                                 group=self.group,
                                 switch=self.switch,
                                 type=LOG_TYPE_ERROR,
@@ -279,6 +364,8 @@ class SnmpConnectorCisco(SnmpConnector):
                                 action=LOG_PORT_POE_FAULT,
                                 description=warning,
                             )
+                            if self.request:
+                                log.user = self.request.user
                             log.save()
 
             else:
@@ -297,7 +384,6 @@ class SnmpConnectorCisco(SnmpConnector):
                             self.add_warning(warning)
                             # log my activity
                             log = Log(
-                                user=self.request.user,
                                 group=self.group,
                                 switch=self.switch,
                                 type=LOG_TYPE_ERROR,
@@ -305,6 +391,8 @@ class SnmpConnectorCisco(SnmpConnector):
                                 action=LOG_PORT_POE_FAULT,
                                 description=warning,
                             )
+                            if self.request:
+                                log.user = self.request.user
                             log.save()
                         break
 
@@ -329,6 +417,7 @@ class SnmpConnectorCisco(SnmpConnector):
             else:
                 # set the interface class attribute for proper 'viewing' and caching:
                 interface.untagged_vlan = int(new_vlan_id)
+                self.set_interface_changed(interface)
                 return True
         # interface not found:
         return False
@@ -768,12 +857,13 @@ class SnmpConnectorCisco(SnmpConnector):
             self.error.description = "Copy running to startup still waiting! (for what?)"
         # log error
         log = Log(
-            user=self.request.user,
             type=LOG_TYPE_ERROR,
             ip_address=get_remote_ip(self.request),
             action=LOG_SAVE_SWITCH,
             description=self.error.description,
         )
+        if self.request:
+            log.user = self.request.user
         log.save()
         # return error status
         return False
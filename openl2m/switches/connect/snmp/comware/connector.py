@@ -84,6 +84,22 @@ class SnmpConnectorComware(SnmpConnector):
         self.can_reload_all = True      # if true, we can reload all our data (and show a button on screen for this)
         """
 
+    def _get_basic_info_walks(self) -> dict:
+        """
+        Add the Comware specific branches to the list of branches read concurrently for the basic info.
+        """
+        walks = super()._get_basic_info_walks()
+        walks.update(
+            {
+                'hh3cIfLinkMode': (),
+                'hh3cdot1qVlanName': (),
+                'hh3cifVLANType': (),
+                'hh3cIgmpSnoopingVlanEnabled': (),
+                'hh3cPsePortCurrentPower': (),
+            }
+        )
+        return walks
+
     def _get_interface_data(self) -> bool:
         """
         Implement an override of the interface parsing routine,
@@ -337,6 +353,7 @@ class SnmpConnectorComware(SnmpConnector):
             # now we need to reread the interface to VLAN mib part
             dprint("Re-reading vlan membership")
             self._get_port_vlan_membership()
+            self.set_interface_changed(interface)
             return True
         # interface not found, return False!
         return False
@@ -522,7 +539,6 @@ class SnmpConnectorComware(SnmpConnector):
                         self.add_warning(warning)
                         # log my activity
                         log = Log(
-                            user=self.request.user,
                             group=self.group,
                             switch=self.switch,
                             type=LOG_TYPE_ERROR,
@@ -530,6 +546,8 @@ class SnmpConnectorComware(SnmpConnector):
                             action=LOG_PORT_POE_FAULT,
                             description=warning,
                         )
+                        if self.request:
+                            log.user = self.request.user
                         log.save()
                     break
 
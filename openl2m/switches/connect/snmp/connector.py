@@ -16,11 +16,16 @@ SNMP Library for OpenL2M, based on MIB-2 based RFC standards. Uses the pysnmp li
 Some of the code here is inspired by the NAV (Network Administration Visualized) tool
 Various vendor specific implementations that augment this class exist.
 """
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import datetime
 import easysnmp
+import math
 import pprint
+import re
+import sys
+import threading
 import time
-from typing import Dict, Any
+from typing import Dict, Any, List
 import traceback
 
 from django.conf import settings
@@ -98,7 +103,12 @@ from switches.connect.classes import (
 
 # from switches.connect.connect import *
 from switches.connect.connector import Connector
-from switches.connect.snmp.utils import decimal_to_hex_string_ethernet, bytes_ethernet_to_string
+from switches.connect.snmp.utils import (
+    decimal_to_hex_string_ethernet,
+    bytes_ethernet_to_string,
+    OidDispatcher,
+    snmp_session_pool,
+)
 from switches.connect.snmp.constants import (
     snmp_mib_variables,
     ifIndex,
@@ -109,6 +119,7 @@ from switches.connect.snmp.constants import (
     ifPhysAddress,
     ifAdminStatus,
     ifOperStatus,
+    ifLastChange,
     ifName,
     ifAlias,
     ifHighSpeed,
@@ -173,6 +184,42 @@ from switches.connect.snmp.constants import (
     vlan_destroy,
 )
 
+# the compiled OID dispatchers, one per SnmpConnector() class, see SnmpConnector._get_oid_dispatcher()
+_oid_dispatchers: Dict[type, OidDispatcher] = {}
+
+# the long-lived pysnmp engines of this (worker) process, re-used by all pysnmpHelper() objects,
+# see _borrow_pysnmp_engine(). The engines keep the discovered engine-ids and localized SNMPv3 keys
+# of the devices they talk to. pysnmp engines are not thread-safe, so each engine is used by one thread at a time;
+# the lock is only held to take an idle engine from, or return it to, this list.
+_pysnmp_engines: List[SnmpEngine] = []
+_pysnmp_engine_lock = threading.Lock()
+# the cached pysnmp authentication data and transport target per Switch() id,
+# as a tuple (snmp settings key, auth data, transport target), see pysnmpHelper._set_auth_data()
+_pysnmp_targets: Dict[int, tuple] = {}
+
+# the names of the layer 3 (routed) interfaces of a vlan, e.g. "Vlan10", "vlan 10" or "Vl10",
+# see SnmpConnector._get_vlan_if_indexes()
+_vlan_interface_name = re.compile(r'^vl(an)?[\s\-_]*(\d+)$', re.IGNORECASE)
+
+
+def _borrow_pysnmp_engine() -> SnmpEngine:
+    """
+    Get an idle pysnmp engine of this process, or a new one if all are in use.
+    Give it back with _release_pysnmp_engine() when done.
+    """
+    with _pysnmp_engine_lock:
+        if _pysnmp_engines:
+            return _pysnmp_engines.pop()
+    return SnmpEngine()
+
+
+def _release_pysnmp_engine(engine: SnmpEngine) -> None:
+    """
+    Return a pysnmp engine from _borrow_pysnmp_engine(), so other requests can re-use it.
+    """
+    with _pysnmp_engine_lock:
+        _pysnmp_engines.append(engine)
+
 
 class pysnmpHelper:
     """
@@ -188,8 +235,10 @@ class pysnmpHelper:
         Initialize the PySnmp bindings
         """
         self.switch = switch  # the Switch() object
-        self._set_auth_data()
         self.error = Error()
+        self._auth_data = False  # the UsmUserData() or CommunityData() object
+        self._transport = False  # the UdpTransportTarget() object
+        self._set_auth_data()
 
     def get(self, oid: str) -> tuple[bool, str]:
         """
@@ -203,15 +252,20 @@ class pysnmpHelper:
             return (True, "Auth Data NOT set!")
 
         # Get a variable using an SNMP GET
-        errorIndication, errorStatus, errorIndex, varBinds = next(
-            getCmd(
-                self._auth_data,
-                UdpTransportTarget((self.switch.primary_ip4, self.switch.snmp_profile.udp_port)),
-                ContextData(),
-                ObjectType(ObjectName(oid)),
-                lookupMib=False,
+        engine = _borrow_pysnmp_engine()
+        try:
+            errorIndication, errorStatus, errorIndex, varBinds = next(
+                getCmd(
+                    engine,
+                    self._auth_data,
+                    self._transport,
+                    ContextData(),
+                    ObjectType(ObjectName(oid)),
+                    lookupMib=False,
+                )
             )
-        )
+        finally:
+            _release_pysnmp_engine(engine)
 
         if errorIndication:
             details = f"ERROR with pySNMP Engine: {pprint.pformat(errorStatus)} at {errorIndex and varBinds[int(errorIndex) - 1][0] or '?'}"
@@ -240,16 +294,20 @@ class pysnmpHelper:
             dprint("pysnmp.set_vars() no auth_data!")
             return False
 
-        errorIndication, errorStatus, errorIndex, varBinds = next(
-            setCmd(
-                SnmpEngine(),
-                self._auth_data,
-                UdpTransportTarget((self.switch.primary_ip4, self.switch.snmp_profile.udp_port)),
-                ContextData(),
-                *vars,
-                lookupMib=False,
+        engine = _borrow_pysnmp_engine()
+        try:
+            errorIndication, errorStatus, errorIndex, varBinds = next(
+                setCmd(
+                    engine,
+                    self._auth_data,
+                    self._transport,
+                    ContextData(),
+                    *vars,
+                    lookupMib=False,
+                )
             )
-        )
+        finally:
+            _release_pysnmp_engine(engine)
 
         if errorIndication:
             self.error.status = True
@@ -299,12 +357,31 @@ class pysnmpHelper:
 
     def _set_auth_data(self) -> bool:
         """
-        Set the UsmUserData() or CommunityData() object based on the snmp_profile
+        Set the UsmUserData() or CommunityData() object based on the snmp_profile,
+        and the UdpTransportTarget() for the switch.
+        These are cached per switch, so the re-used pysnmp engines can re-use their configuration
+        (and localized SNMPv3 keys) for this device, until the switch or snmp profile settings change.
         """
         if not self.switch:
             # we need a Switch() object!
             return False
 
+        settings_key = snmp_settings_key(self.switch)
+        cached = _pysnmp_targets.get(self.switch.id, None)
+        if cached and cached[0] == settings_key:
+            (settings_key, self._auth_data, self._transport) = cached
+            return True
+
+        if not self._create_auth_data():
+            return False
+        self._transport = UdpTransportTarget((self.switch.primary_ip4, self.switch.snmp_profile.udp_port))
+        _pysnmp_targets[self.switch.id] = (settings_key, self._auth_data, self._transport)
+        return True
+
+    def _create_auth_data(self) -> bool:
+        """
+        Create the UsmUserData() or CommunityData() object based on the snmp_profile
+        """
         if self.switch.snmp_profile.version == SNMP_VERSION_2C:
             self._auth_data = CommunityData(self.switch.snmp_profile.community)
             return True
@@ -372,6 +449,104 @@ class SnmpConnector(Connector):
     Note: in "vendors" folder are several classes that implement vendor-specific parts of this generic class.
     """
 
+    # the interface table columns that are read with a single table walk, see _get_interface_data()
+    # 'ifIndex' should be first, as that creates the Interface() objects.
+    interface_table_columns = (
+        'ifIndex',
+        'ifType',
+        'ifAdminStatus',
+        'ifOperStatus',
+        'ifLastChange',
+        'ifName',
+        'ifAlias',
+        'ifHighSpeed',
+        'dot3StatsDuplexStatus',
+    )
+
+    # the LLDP remote table columns that are read with a single table walk, see _get_lldp_data()
+    # 'lldpRemPortId' should be first, as that creates the NeighborDevice() objects.
+    lldp_table_columns = (
+        'lldpRemPortId',
+        'lldpRemPortIdSubType',
+        'lldpRemPortDesc',
+        'lldpRemSysName',
+        'lldpRemSysDesc',
+        'lldpRemSysCapEnabled',
+        'lldpRemChassisIdSubtype',
+        'lldpRemChassisId',
+    )
+
+    # mib branches that typically return many entries, and are learned as a separate class
+    # of get-bulk max_repetitions, see get_max_repetitions()
+    large_branches = (
+        'dot1dTpFdbPort',
+        'dot1qTpFdbPort',
+        'ipNetToMediaPhysAddress',
+        'ipNetToPhysicalPhysAddress',
+    )
+
+    # optional mib branches that a device either implements or not. If a full walk of one of these returns
+    # nothing several times in a row, the branch is not read again for this device, see _is_unsupported_branch()
+    # Branches with a fallback (e.g. ifName -> ifDescr) are read by the caller if these return nothing.
+    # Note: do not add branches that can be empty for a while, e.g. the lldp neighbors or arp tables!
+    # Vendor classes can add their own branches.
+    capability_branches = (
+        'ifName',
+        'ifHighSpeed',
+        'dot1qBase',
+        'ieee8021QBridgeMvrpEnabledStatus',
+        'dot3adAggActorAdminKey',
+        'pethMainPseEntry',
+        'syslogMsgTableMaxSize',
+        'entPhysicalClass',
+        'entPhysicalDescr',
+        'entPhysicalSerialNum',
+        'entPhysicalSoftwareRev',
+        'entPhysicalModelName',
+    )
+    # the number of full walks in a row that return nothing, before a branch is considered not supported:
+    capability_empty_reads = 3
+
+    # The mib branches parsed by _parse_oid(), and the name of the method that handles the data for each.
+    # This is compiled into a prefix trie once per class, see _get_oid_dispatcher().
+    # Vendor classes can define their own 'oid_handlers' to add branches, or override the handler of a branch.
+    oid_handlers = {
+        ifIndex: '_parse_if_index',
+        ifDescr: '_parse_if_descr',
+        ifType: '_parse_if_type',
+        ifMtu: '_parse_if_mtu',
+        ifSpeed: '_parse_if_speed',
+        ifPhysAddress: '_parse_if_phys_address',
+        ifAdminStatus: '_parse_if_admin_status',
+        ifOperStatus: '_parse_if_oper_status',
+        ifLastChange: '_parse_if_last_change',
+        ifName: '_parse_if_name',
+        ifAlias: '_parse_if_alias',
+        ifHighSpeed: '_parse_if_high_speed',
+        dot3StatsDuplexStatus: '_parse_if_duplex',
+        dot1qNumVlans: '_parse_dot1q_num_vlans',
+        dot1qGvrpStatus: '_parse_gvrp_status',
+        ieee8021QBridgeMvrpEnabledStatus: '_parse_gvrp_status',
+        dot1qPortGvrpStatus: '_parse_port_gvrp_status',
+        dot1qVlanCurrentEgressPorts: '_parse_vlan_current_egress_ports',
+        dot1qVlanStatus: '_parse_vlan_status',
+        dot1qVlanStaticName: '_parse_vlan_static_name',
+        dot1qVlanStaticRowStatus: '_parse_vlan_static_row_status',
+        dot1qPvid: '_parse_pvid',
+        dot1dBasePortIfIndex: '_parse_base_port_if_index',
+        ipAdEntIfIndex: '_parse_ip_address_if_index',
+        ipAdEntNetMask: '_parse_ip_address_netmask',
+        syslogMsgTableMaxSize: '_parse_syslog_max_msgs',
+        pethMainPsePower: '_parse_poe_pse_power',
+        pethMainPseOperStatus: '_parse_poe_pse_oper_status',
+        pethMainPseConsumptionPower: '_parse_poe_pse_consumption_power',
+        pethMainPseUsageThreshold: '_parse_poe_pse_usage_threshold',
+        pethPsePortAdminEnable: '_parse_poe_port_admin_enable',
+        pethPsePortDetectionStatus: '_parse_poe_port_detection_status',
+        dot3adAggActorAdminKey: '_parse_lacp_aggregator_admin_key',
+        dot3adAggPortActorAdminKey: '_parse_lacp_port_admin_key',
+    }
+
     def __init__(self, request: HttpRequest, group: SwitchGroup, switch: Switch):
         """
         Initialize the object
@@ -384,8 +559,10 @@ class SnmpConnector(Connector):
 
         # SNMP specific attributes:
         self.object_id = ""  # SNMP system OID value, used to find type of switch
+        self.sys_descr = ""  # SNMP system description, usually includes the firmware version
         self.sys_uptime = 0  # sysUptime is a tick count in 1/100th of seconds per tick, since boot
         self.sys_uptime_timestamp = 0  # timestamp when sysUptime was read.
+        self.basic_info_full_read_timestamp = 0  # when all basic info was last read, see refresh_my_basic_info()
         self.qbridge_port_to_if_index: Dict[int, str] = (
             {}
         )  # this maps Q-Bridge port id as key (int) to MIB-II ifIndex (str)
@@ -422,7 +599,10 @@ class SnmpConnector(Connector):
         """
         attributes to track EasySnmp library
         """
-        self._snmp_session = False  # EasySNMP session object
+        self._snmp_session = False  # EasySNMP session object, borrowed from the session pool
+        self._snmp_session_key = None  # the session pool key of this session object
+        # branch data read by the concurrent walk engine, see _prefetch_snmp_branches()
+        self._prefetched_walks = {}
         # initialize the snmp "connection/session"
         if not self._set_snmp_session():
             dprint("   ERROR: cannot get SNMP session!")
@@ -430,15 +610,66 @@ class SnmpConnector(Connector):
 
         # caching related. Add attributes that do not get cached:
         self.set_do_not_cache_attribute("_snmp_session")
+        self.set_do_not_cache_attribute("_snmp_session_key")
+        self.set_do_not_cache_attribute("_prefetched_walks")
+        # set if the learned get-bulk max_repetitions changed, see _learn_max_repetitions()
+        self._max_repetitions_changed = False
+        self.set_do_not_cache_attribute("_max_repetitions_changed")
+        # set if the learned mib capabilities changed, see _learn_capability()
+        self._capabilities_changed = False
+        self.set_do_not_cache_attribute("_capabilities_changed")
         self.set_do_not_cache_attribute("poe_port_entries")
 
+    def __del__(self):
+        """
+        Called at the end of each web request, when this object is no longer used.
+        Give our snmp session back to the pool, so the next request can re-use it.
+        """
+        # note: __init__() may have failed before the session attributes were set.
+        if getattr(self, '_snmp_session', False):
+            self._release_snmp_session()
+
     def _set_snmp_session(self, com_or_ctx: str = '') -> bool:
         """
-        Get a EasySnmp Session() object for this snmp connection
+        Get a EasySnmp Session() object for this snmp connection, from the session pool if available.
+        Any current session is returned to the pool first.
         com_or_ctx - the community to override the snmp profile settings if v2,
                       or the snmp v3 context to use.
         """
         dprint("_set_snmp_session()")
+        self._release_snmp_session()
+        key = self._get_snmp_session_key(com_or_ctx=com_or_ctx)
+        self._snmp_session = snmp_session_pool.borrow(key, lambda: self._get_snmp_session(com_or_ctx=com_or_ctx))
+        if self._snmp_session:
+            self._snmp_session_key = key
+            return True
+        return False
+
+    def _release_snmp_session(self) -> None:
+        """
+        Return the current EasySnmp Session() object to the session pool.
+        """
+        if self._snmp_session:
+            snmp_session_pool.release(self._snmp_session_key, self._snmp_session)
+        self._snmp_session = False
+        self._snmp_session_key = None
+
+    def _get_snmp_session_key(self, com_or_ctx: str = '') -> tuple:
+        """
+        Get the session pool key for this device, snmp profile and community/context.
+        This contains all session settings, so a changed device address or snmp profile will not re-use
+        sessions with the old settings.
+        """
+        return snmp_settings_key(self.switch) + (com_or_ctx,)
+
+    def _get_snmp_session(self, com_or_ctx: str = '') -> easysnmp.Session | bool:
+        """
+        Create a new EasySnmp Session() object for this device, based on the snmp profile.
+        com_or_ctx - the community to override the snmp profile settings if v2,
+                      or the snmp v3 context to use.
+        Returns the Session() object, or False if the profile is not set or not valid.
+        """
+        dprint("_get_snmp_session()")
         snmp_profile = self.switch.snmp_profile
         if snmp_profile:
             if snmp_profile.version == SNMP_VERSION_2C:
@@ -449,7 +680,7 @@ class SnmpConnector(Connector):
                 else:
                     # use profile setting
                     community = snmp_profile.community
-                self._snmp_session = easysnmp.Session(
+                return easysnmp.Session(
                     hostname=self.switch.primary_ip4,
                     version=snmp_profile.version,
                     community=community,
@@ -459,14 +690,13 @@ class SnmpConnector(Connector):
                     timeout=settings.SNMP_TIMEOUT,
                     retries=settings.SNMP_RETRIES,
                 )
-                return True
 
             # everything else is version 3
             if snmp_profile.version == SNMP_VERSION_3:
                 # NoAuthNoPriv
                 if snmp_profile.sec_level == SNMP_V3_SECURITY_NOAUTH_NOPRIV:
                     dprint("version 3 NoAuth-NoPriv")
-                    self._snmp_session = easysnmp.Session(
+                    return easysnmp.Session(
                         hostname=self.switch.primary_ip4,
                         version=snmp_profile.version,
                         remote_port=snmp_profile.udp_port,
@@ -476,13 +706,12 @@ class SnmpConnector(Connector):
                         security_username=snmp_profile.username,
                         context=str(com_or_ctx),
                     )
-                    return True
 
                 # AuthNoPriv
                 elif snmp_profile.sec_level == SNMP_V3_SECURITY_AUTH_NOPRIV:
                     dprint("version 3 Auth-NoPriv")
                     if snmp_profile.auth_protocol == SNMP_V3_AUTH_MD5:
-                        self._snmp_session = easysnmp.Session(
+                        return easysnmp.Session(
                             hostname=self.switch.primary_ip4,
                             version=snmp_profile.version,
                             remote_port=snmp_profile.udp_port,
@@ -494,10 +723,9 @@ class SnmpConnector(Connector):
                             auth_password=snmp_profile.passphrase,
                             context=str(com_or_ctx),
                         )
-                        return True
 
                     elif snmp_profile.auth_protocol == SNMP_V3_AUTH_SHA:
-                        self._snmp_session = easysnmp.Session(
+                        return easysnmp.Session(
                             hostname=self.switch.primary_ip4,
                             version=snmp_profile.version,
                             remote_port=snmp_profile.udp_port,
@@ -509,14 +737,13 @@ class SnmpConnector(Connector):
                             auth_password=snmp_profile.passphrase,
                             context=str(com_or_ctx),
                         )
-                        return True
 
                 # AuthPriv
                 elif snmp_profile.sec_level == SNMP_V3_SECURITY_AUTH_PRIV:
                     dprint("version 3 Auth-Priv")
                     if snmp_profile.auth_protocol == SNMP_V3_AUTH_MD5:
                         if snmp_profile.priv_protocol == SNMP_V3_PRIV_DES:
-                            self._snmp_session = easysnmp.Session(
+                            return easysnmp.Session(
                                 hostname=self.switch.primary_ip4,
                                 version=snmp_profile.version,
                                 remote_port=snmp_profile.udp_port,
@@ -530,10 +757,9 @@ class SnmpConnector(Connector):
                                 privacy_password=snmp_profile.priv_passphrase,
                                 context=str(com_or_ctx),
                             )
-                            return True
 
                         if snmp_profile.priv_protocol == SNMP_V3_PRIV_AES:
-                            self._snmp_session = easysnmp.Session(
+                            return easysnmp.Session(
                                 hostname=self.switch.primary_ip4,
                                 version=snmp_profile.version,
                                 remote_port=snmp_profile.udp_port,
@@ -547,11 +773,10 @@ class SnmpConnector(Connector):
                                 privacy_password=snmp_profile.priv_passphrase,
                                 context=str(com_or_ctx),
                             )
-                            return True
 
                     if snmp_profile.auth_protocol == SNMP_V3_AUTH_SHA:
                         if snmp_profile.priv_protocol == SNMP_V3_PRIV_DES:
-                            self._snmp_session = easysnmp.Session(
+                            return easysnmp.Session(
                                 hostname=self.switch.primary_ip4,
                                 version=snmp_profile.version,
                                 remote_port=snmp_profile.udp_port,
@@ -565,10 +790,9 @@ class SnmpConnector(Connector):
                                 privacy_password=snmp_profile.priv_passphrase,
                                 context=str(com_or_ctx),
                             )
-                            return True
 
                         if snmp_profile.priv_protocol == SNMP_V3_PRIV_AES:
-                            self._snmp_session = easysnmp.Session(
+                            return easysnmp.Session(
                                 hostname=self.switch.primary_ip4,
                                 version=snmp_profile.version,
                                 remote_port=snmp_profile.udp_port,
@@ -582,12 +806,10 @@ class SnmpConnector(Connector):
                                 privacy_password=snmp_profile.priv_passphrase,
                                 context=str(com_or_ctx),
                             )
-                            return True
                 else:
                     dprint("  Unknown auth-priv")
 
         # snmp profile not set, or we cannot get session
-        self._snmp_session = False
         dprint("UNKNOWN snmp version!")
         return False
 
@@ -625,14 +847,60 @@ class SnmpConnector(Connector):
 
         return (False, retval)
 
+    def get_multiple(self, oids: list, parser=False) -> int:
+        """
+        Get several specific OID values via SNMP, in a single request.
+        Values that do not exist on the device are skipped.
+        Return count of values parsed, or -1 if error.
+        On error, self.error() is set appropriately.
+        """
+        dprint(f"get_multiple() for {len(oids)} oids")
+        self.error.clear()
+        if not oids:
+            return 0
+        try:
+            items = self._snmp_session.get(oids=oids)
+        except Exception as e:
+            self.error.status = True
+            self.error.description = "Timeout or Access denied"
+            self.error.details = f"SNMP Error: {repr(e)} ({str(type(e))})\n{traceback.format_exc()}"
+            dprint(f"   get_multiple(): Exception: {e.__class__.__name__}\n{self.error.details}\n")
+            return -1
+
+        count = 0
+        for item in items:
+            if item.snmp_type in ('NOSUCHOBJECT', 'NOSUCHINSTANCE'):
+                continue
+            count += 1
+            oid = f"{item.oid}.{item.oid_index}" if item.oid_index else item.oid
+            # parse the data, just like returns from get_branch()
+            if parser:
+                parser(oid, str(item.value))
+            else:
+                self._parse_oid(oid, str(item.value))
+        return count
+
     def get_snmp_branch(
-        self, branch_name: str, parser=False, max_repetitions: int = settings.SNMP_MAX_REPETITIONS
+        self,
+        branch_name: str,
+        parser=False,
+        max_repetitions: int = 0,
+        max_rows: int = 0,
+        max_time: float = 0,
+        index: str = '',
     ) -> int:
         """
         Bulk-walk a branch of the snmp mib, fill the data in the oid store.
         This finishes when we leave this branch.
+        The data is parsed page by page, as each GETBULK response arrives, see _bulkwalk_pages().
         branch_name = SNMP name
+        index - if given, only walk the sub-tree "branch.index", e.g. the entries of a single vlan in a table
+                that is indexed by vlan first.
         parser - if given, will be a function to call to parse the MIB data.
+        max_repetitions - the get-bulk max_repetitions, if 0 use the value for this device, see get_max_repetitions()
+        max_rows - stop after this many entries, if 0 use settings.SNMP_WALK_MAX_ROWS
+        max_time - stop after this many seconds, if 0 use settings.SNMP_WALK_MAX_TIME
+        If the walk is stopped early, a warning is added, and the entries read so far are kept.
         Return count of objects returned from query, or -1 if error.
         On error, self.error() is set appropriately.
         """
@@ -644,7 +912,6 @@ class SnmpConnector(Connector):
             self.add_warning(f"Invalid snmp branch '{branch_name}'")
             # log this as well
             log = Log(
-                user=self.request.user,
                 group=self.group,
                 switch=self.switch,
                 ip_address=get_remote_ip(self.request),
@@ -652,48 +919,91 @@ class SnmpConnector(Connector):
                 action=LOG_SNMP_ERROR,
                 description=f"ERROR getting '{branch_name}': invalid branch name",
             )
+            if self.request:
+                log.user = self.request.user
             log.save()
 
             return -1
 
+        if self._is_unsupported_branch(branch_name):
+            dprint(f"   Skipping {branch_name}, not supported by this device")
+            return 0
+
         start_oid = snmp_mib_variables[branch_name]
+        if index:
+            start_oid = f"{start_oid}.{index}"
+        if not max_repetitions:
+            max_repetitions = self.get_max_repetitions(branch_name)
+        (max_rows, max_time) = get_walk_limits(max_rows=max_rows, max_time=max_time)
         # Perform an SNMP walk
         self.error.clear()
         count = 0
+        truncated = ''  # the reason the walk was stopped early, if any
         try:
-            dprint(f"   Calling BulkWalk {start_oid}")
+            if branch_name in self._prefetched_walks and not index:
+                # this branch was already read by the concurrent walk engine, see _prefetch_snmp_branches()
+                dprint(f"   Using prefetched BulkWalk {start_oid}")
+                (items, duration, exception, max_repetitions, truncated) = self._prefetched_walks.pop(branch_name)
+                if exception:
+                    raise exception
+                pages = [(items, max_repetitions)]
+            else:
+                dprint(f"   Calling streaming BulkWalk {start_oid}")
+                duration = 0
+                pages = self._bulkwalk_pages(
+                    session=self._snmp_session, branch_name=branch_name, max_repetitions=max_repetitions, index=index
+                )
             start_time = time.time()
-            items = self._snmp_session.bulkwalk(oids=start_oid, non_repeaters=0, max_repetitions=max_repetitions)
-            stop_time = time.time()
-            # Each returned item can be used normally as its related type (str or int)
-            # but also has several extended attributes with SNMP-specific information
-            for item in items:
-                count = count + 1
-                oid_found = f"{item.oid}.{item.oid_index}"
-                # Note: with easysnmp, the returned "item.value" is ALWAYS of type str!
-                # the real SNMP type is indicated in item.snmp_type !!!
-                if item.snmp_type == 'OCTETSTR':
-                    if item.value.isprintable():
-                        value = item.value
+            for items, max_repetitions in pages:
+                # Each returned item can be used normally as its related type (str or int)
+                # but also has several extended attributes with SNMP-specific information
+                for item in items:
+                    if count >= max_rows:
+                        truncated = f"the limit of {max_rows} entries was reached"
+                        break
+                    count = count + 1
+                    oid_found = f"{item.oid}.{item.oid_index}"
+                    # Note: with easysnmp, the returned "item.value" is ALWAYS of type str!
+                    # the real SNMP type is indicated in item.snmp_type !!!
+                    if item.snmp_type == 'OCTETSTR':
+                        if item.value.isprintable():
+                            value = item.value
+                        else:
+                            # for non-printable octetstring, you can use this:
+                            # https://github.com/kamakazikamikaze/easysnmp/issues/91
+                            value = "CAN NOT PRINT!"
                     else:
-                        # for non-printable octetstring, you can use this:
-                        # https://github.com/kamakazikamikaze/easysnmp/issues/91
-                        value = "CAN NOT PRINT!"
-                else:
-                    value = item.value
-                dprint(f"\n\n====> SNMP READ: {oid_found} {item.snmp_type} = {value}")
+                        value = item.value
+                    dprint(f"\n\n====> SNMP READ: {oid_found} {item.snmp_type} = {value}")
 
-                if parser:
-                    # custom parser
-                    parser(oid_found, item.value)
-                else:
-                    # default OID parser
-                    self._parse_oid(oid_found, item.value)
+                    if parser:
+                        # custom parser
+                        parser(oid_found, item.value)
+                    else:
+                        # default OID parser
+                        self._parse_oid(oid_found, item.value)
+                if truncated:
+                    break
+                if time.time() - start_time > max_time:
+                    truncated = f"the time limit of {max_time} seconds was reached"
+                    break
+            if truncated:
+                self.add_warning(f"Only {count} entries of '{branch_name}' were read, {truncated}!")
+            if not duration:
+                # the streamed walk, this includes the parsing:
+                duration = time.time() - start_time
 
             # add to timing data, for admin use!
-            self.add_timing(branch_name, count, stop_time - start_time)
+            self.add_timing(f"{branch_name}.{index}" if index else branch_name, count, duration)
+            # and learn from this walk:
+            self._learn_max_repetitions(branch_name, max_repetitions, count=count, duration=duration)
+            if branch_name in self.capability_branches and not index:
+                self._learn_capability(branch_name, count)
 
         except Exception as e:
+            self._learn_max_repetitions(branch_name, max_repetitions, error=e)
+            if branch_name in self.capability_branches and not index:
+                self._learn_capability(branch_name, -1)
             self.error.status = True
             self.error.description = "A timeout or network error occured!"
             self.error.details = (
@@ -702,7 +1012,6 @@ class SnmpConnector(Connector):
             dprint(f"   get_snmp_branch({branch_name}): Exception: {e.__class__.__name__}\n{self.error.details}\n")
             # log this as well
             log = Log(
-                user=self.request.user,
                 group=self.group,
                 switch=self.switch,
                 ip_address=get_remote_ip(self.request),
@@ -710,12 +1019,238 @@ class SnmpConnector(Connector):
                 action=LOG_SNMP_ERROR,
                 description=f"ERROR getting '{branch_name}': {self.error.details}",
             )
+            if self.request:
+                log.user = self.request.user
             log.save()
             return -1
 
         dprint(f"get_snmp_branch() returns {count}")
         return count
 
+    def get_snmp_table(
+        self, branch_names: tuple, parser=False, row_parser=False, max_repetitions: int = 0
+    ) -> Dict[str, int] | int:
+        """
+        Walk several columns of a table (or of tables with the same index, e.g. ifTable and ifXTable)
+        at the same time. Each GETBULK request asks for the next entries of all columns that are not finished,
+        so a single walk returns complete rows. This needs about 'number of columns' fewer requests
+        than walking each column with get_snmp_branch().
+        Columns that are not supported by this device are not walked, see _get_supported_columns()
+        branch_names - tuple of SNMP names of the columns.
+        parser - if given, a function to call to parse the data of each column, just like in get_snmp_branch().
+                 The default is _parse_oid(). This is called per row, for each column in order of branch_names.
+        row_parser - if given, is called with each complete row instead, as row_parser(row_index, row),
+                     where row is a dictionary with branch name as key, and the value for that column.
+        max_repetitions - the get-bulk max_repetitions, if 0 use the value for this device, see get_max_repetitions()
+        Return a dictionary with the count of objects returned per column, or -1 if error.
+        On error, self.error() is set appropriately.
+        """
+        dprint(f"\n\n### get_snmp_table({branch_names}) ###\n")
+        branch_names = tuple(branch_names)
+        for branch_name in branch_names:
+            if branch_name not in snmp_mib_variables.keys():
+                self.error.status = True
+                self.error.description = f"ERROR: invalid branch name '{branch_name}'"
+                dprint(f"+++> INVALID BRANCH NAME: {branch_name}")
+                self.add_warning(f"Invalid snmp branch '{branch_name}'")
+                # log this as well
+                log = Log(
+                    group=self.group,
+                    switch=self.switch,
+                    ip_address=get_remote_ip(self.request),
+                    type=LOG_TYPE_ERROR,
+                    action=LOG_SNMP_ERROR,
+                    description=f"ERROR getting '{branch_name}': invalid branch name",
+                )
+                if self.request:
+                    log.user = self.request.user
+                log.save()
+                return -1
+
+        table_name = ",".join(branch_names)
+        columns = self._get_supported_columns(branch_names)
+        if not max_repetitions:
+            max_repetitions = self.get_max_repetitions(branch_names)
+        self.error.clear()
+        try:
+            if branch_names in self._prefetched_walks:
+                # this table was already read by the concurrent walk engine, see _prefetch_snmp_branches()
+                dprint("   Using prefetched table walk")
+                (items, duration, exception, max_repetitions, truncated) = self._prefetched_walks.pop(branch_names)
+                if exception:
+                    raise exception
+            elif columns:
+                start_time = time.time()
+                items = self._bulkwalk_table(
+                    session=self._snmp_session, branch_names=columns, max_repetitions=max_repetitions
+                )
+                duration = time.time() - start_time
+            else:
+                dprint("   Skipping table, no supported columns")
+                items = []
+                duration = 0
+
+        except Exception as e:
+            self._learn_max_repetitions(columns, max_repetitions, error=e)
+            for branch_name in columns:
+                if branch_name in self.capability_branches:
+                    self._learn_capability(branch_name, -1)
+            self.error.status = True
+            self.error.description = "A timeout or network error occured!"
+            self.error.details = f"SNMP Error: table {table_name}, {repr(e)} ({str(type(e))})\n{traceback.format_exc()}"
+            dprint(f"   get_snmp_table({table_name}): Exception: {e.__class__.__name__}\n{self.error.details}\n")
+            # log this as well
+            log = Log(
+                group=self.group,
+                switch=self.switch,
+                ip_address=get_remote_ip(self.request),
+                type=LOG_TYPE_ERROR,
+                action=LOG_SNMP_ERROR,
+                description=f"ERROR getting '{table_name}': {self.error.details}",
+            )
+            if self.request:
+                log.user = self.request.user
+            log.save()
+            return -1
+
+        # now assemble the rows, in the order the device returned the first column.
+        # (sorting is stable, so this keeps the order of the other columns)
+        counts = {branch_name: 0 for branch_name in branch_names}
+        rows: Dict[str, dict] = {}
+        for branch_name, row_index, value in sorted(items, key=lambda item: item[0] != branch_names[0]):
+            counts[branch_name] += 1
+            if row_index not in rows:
+                rows[row_index] = {}
+            rows[row_index][branch_name] = value
+
+        for row_index, row in rows.items():
+            dprint(f"\n\n====> SNMP TABLE ROW: {row_index} = {row}")
+            if row_parser:
+                row_parser(row_index, row)
+                continue
+            for branch_name in branch_names:
+                if branch_name in row:
+                    oid = f"{snmp_mib_variables[branch_name]}.{row_index}"
+                    if parser:
+                        # custom parser
+                        parser(oid, row[branch_name])
+                    else:
+                        # default OID parser
+                        self._parse_oid(oid, row[branch_name])
+
+        # add to timing data, for admin use!
+        self.add_timing(f"Table ({table_name})", len(items), duration)
+        # and learn from this walk:
+        if columns:
+            self._learn_max_repetitions(columns, max_repetitions, count=len(items), duration=duration)
+        for branch_name in columns:
+            if branch_name in self.capability_branches:
+                self._learn_capability(branch_name, counts[branch_name])
+        dprint(f"get_snmp_table() returns {counts}")
+        return counts
+
+    def _bulkwalk_pages(self, session: easysnmp.Session, branch_name: str, max_repetitions: int, index: str = ''):
+        """
+        Streaming walker: walk a mib branch with GETBULK requests, and yield the entries of each response
+        as they arrive, so they can be parsed without reading the whole branch in memory first.
+        If the device answers a request with a 'response too big' error, the request is sent again
+        with half the max_repetitions.
+        session - the EasySnmp Session() to use.
+        index - if given, only walk the sub-tree "branch.index"
+        Yields tuples of (list of entries in the branch, max_repetitions used).
+        Other exceptions from the EasySnmp library are not handled here!
+        """
+        start_oid = snmp_mib_variables[branch_name]
+        if index:
+            start_oid = f"{start_oid}.{index}"
+        next_oid = start_oid
+        while True:
+            try:
+                varbinds = session.get_bulk(oids=[next_oid], non_repeaters=0, max_repetitions=max_repetitions)
+            except Exception as e:
+                if not is_response_too_big(e) or max_repetitions < 2:
+                    raise
+                # the device cannot handle this response size, try again with smaller requests:
+                max_repetitions = max(1, max_repetitions // 2)
+                dprint(f"   Response too big, calling GetBulk again with max_repetitions={max_repetitions}")
+                continue
+            page = []
+            finished = not varbinds
+            for item in varbinds:
+                oid = f"{item.oid}.{item.oid_index}" if item.oid_index else item.oid
+                if (
+                    not oid_in_branch(start_oid, oid)
+                    or item.snmp_type in ('ENDOFMIBVIEW', 'NOSUCHOBJECT', 'NOSUCHINSTANCE')
+                    or oid == next_oid
+                ):
+                    # we left the branch
+                    finished = True
+                    break
+                page.append(item)
+                next_oid = oid
+            if page:
+                yield (page, max_repetitions)
+            if finished:
+                return
+
+    def _bulkwalk_capped(self, session: easysnmp.Session, branch_name: str, max_repetitions: int) -> tuple:
+        """
+        Walk a mib branch into memory, up to the settings.SNMP_WALK_MAX_ROWS and SNMP_WALK_MAX_TIME limits.
+        This is used by the concurrent walk engine, where the data is parsed later, see get_snmp_branch()
+        Returns tuple of (list of entries, max_repetitions used, reason the walk was stopped early or '')
+        Exceptions from the EasySnmp library are not handled here!
+        """
+        (max_rows, max_time) = get_walk_limits()
+        start_time = time.time()
+        items = []
+        for page, max_repetitions in self._bulkwalk_pages(
+            session=session, branch_name=branch_name, max_repetitions=max_repetitions
+        ):
+            items.extend(page)
+            if len(items) >= max_rows:
+                return (items[:max_rows], max_repetitions, f"the limit of {max_rows} entries was reached")
+            if time.time() - start_time > max_time:
+                return (items, max_repetitions, f"the time limit of {max_time} seconds was reached")
+        return (items, max_repetitions, '')
+
+    def _bulkwalk_table(self, session: easysnmp.Session, branch_names: tuple, max_repetitions: int) -> list:
+        """
+        Walk a set of table columns with GETBULK requests that contain all columns that are not finished yet.
+        A column is finished when the device returns an OID past the end of that branch.
+        Note the response size is about 'number of columns x max_repetitions' values.
+        session - the EasySnmp Session() to use.
+        Returns a list of tuples (branch_name, row_index, value), in the order received.
+        Exceptions from the EasySnmp library are not handled here!
+        """
+        branches = {branch_name: snmp_mib_variables[branch_name] for branch_name in branch_names}
+        next_oids = dict(branches)  # branch name -> the OID to continue the walk from
+        items = []
+        while next_oids:
+            names = list(next_oids.keys())
+            varbinds = session.get_bulk(oids=list(next_oids.values()), non_repeaters=0, max_repetitions=max_repetitions)
+            if not varbinds:
+                break
+            # values are returned in column order per repetition, i.e. row by row.
+            # the last row can be incomplete, if the device truncates the response.
+            for position, item in enumerate(varbinds):
+                branch_name = names[position % len(names)]
+                if branch_name not in next_oids:
+                    # this column already left its branch
+                    continue
+                oid = f"{item.oid}.{item.oid_index}" if item.oid_index else item.oid
+                row_index = oid_in_branch(branches[branch_name], oid)
+                if (
+                    not row_index
+                    or item.snmp_type in ('ENDOFMIBVIEW', 'NOSUCHOBJECT', 'NOSUCHINSTANCE')
+                    or oid == next_oids[branch_name]
+                ):
+                    # end of this column
+                    del next_oids[branch_name]
+                    continue
+                items.append((branch_name, row_index, item.value))
+                next_oids[branch_name] = oid
+        return items
+
     def set(self, oid: str, value, snmp_type, parser=False) -> bool:
         """
         Set a single OID value. Note that 'value' has to be properly typed!
@@ -764,6 +1299,374 @@ class SnmpConnector(Connector):
 
         return True
 
+    def _get_bulk_class(self, branch_name: str | tuple) -> str:
+        """
+        Get the class of a mib branch, for learning the get-bulk max_repetitions:
+        'table' for multi-column table walks, 'large' for branches that typically return many entries,
+        or 'default' for everything else.
+        """
+        if isinstance(branch_name, tuple):
+            return 'table'
+        if branch_name in self.large_branches:
+            return 'large'
+        return 'default'
+
+    def get_max_repetitions(self, branch_name: str | tuple) -> int:
+        """
+        Get the get-bulk max_repetitions to use for a mib branch (or table) on this device.
+        This is the fixed value set on the Switch() object, or else the value learned for this class of branch,
+        or else settings.SNMP_MAX_REPETITIONS
+        """
+        if self.switch.snmp_max_repetitions:
+            return self.switch.snmp_max_repetitions
+        if settings.SNMP_MAX_REPETITIONS_LEARNING:
+            return self.switch.snmp_bulk_tuning.get(self._get_bulk_class(branch_name), settings.SNMP_MAX_REPETITIONS)
+        return settings.SNMP_MAX_REPETITIONS
+
+    def _learn_max_repetitions(
+        self,
+        branch_name: str | tuple,
+        max_repetitions: int,
+        count: int = 0,
+        duration: float = 0,
+        error: Exception | None = None,
+    ) -> None:
+        """
+        Adjust the learned get-bulk max_repetitions for the class of this branch, from the result of a walk:
+        on a 'response too big' error, halve the value (a plain timeout does not change the value,
+        the device may just be busy);
+        if the device is slow to answer each request, lower the value by 25%;
+        the value is not lowered below half of settings.SNMP_MAX_REPETITIONS;
+        if the walk took several requests, and the device answered quickly, raise the value by 50% (at least 1),
+        up to settings.SNMP_MAX_REPETITIONS_LIMIT
+        New values are saved to the Switch() object in _save_learned_settings()
+        Does not return anything.
+        """
+        if self.switch.snmp_max_repetitions or not settings.SNMP_MAX_REPETITIONS_LEARNING:
+            return
+        lowest_value = max(1, settings.SNMP_MAX_REPETITIONS // 2)
+        new_value = max_repetitions
+        if error:
+            if is_response_too_big(error):
+                new_value = max(lowest_value, max_repetitions // 2)
+        else:
+            # number of values returned by each get-bulk request:
+            columns = len(branch_name) if isinstance(branch_name, tuple) else 1
+            requests = count // (max_repetitions * columns) + 1
+            time_per_request = duration / requests
+            if time_per_request > settings.SNMP_TIMEOUT / 2:
+                new_value = max(lowest_value, (max_repetitions * 3) // 4)
+            elif requests > 2 and time_per_request < settings.SNMP_TIMEOUT / 10:
+                new_value = min(
+                    settings.SNMP_MAX_REPETITIONS_LIMIT, max(max_repetitions + 1, (max_repetitions * 3) // 2)
+                )
+        bulk_class = self._get_bulk_class(branch_name)
+        if new_value != self.switch.snmp_bulk_tuning.get(bulk_class, settings.SNMP_MAX_REPETITIONS):
+            dprint(f"   Learned max_repetitions for '{bulk_class}' branches: {max_repetitions} -> {new_value}")
+            self.switch.snmp_bulk_tuning[bulk_class] = new_value
+            self._max_repetitions_changed = True
+
+    def _is_unsupported_branch(self, branch_name: str) -> bool:
+        """
+        Check if a mib branch is learned to be not supported by this device, i.e. full walks of the branch
+        returned nothing 'capability_empty_reads' times in a row, see _learn_capability()
+        Return True if the branch does not need to be read.
+        """
+        if not settings.SNMP_CAPABILITY_RECHECK_INTERVAL:
+            return False
+        empty_reads = self.switch.snmp_capabilities.get('branches', {}).get(branch_name, 0)
+        return empty_reads >= self.capability_empty_reads
+
+    def _get_supported_columns(self, branch_names: tuple) -> tuple:
+        """
+        Return the columns of a table walk that are not learned to be unsupported by this device.
+        """
+        return tuple(branch_name for branch_name in branch_names if not self._is_unsupported_branch(branch_name))
+
+    def _learn_capability(self, branch_name: str, count: int) -> None:
+        """
+        Record the result of a full walk of an optional mib branch in the capabilities learned for this device:
+        0 if the branch returned data, -1 on errors, or else the number of walks in a row that returned nothing.
+        This is only done after the capabilities were checked against the device, see _check_capabilities()
+        New values are saved to the Switch() object in _save_learned_settings()
+        Does not return anything.
+        """
+        branches = self.switch.snmp_capabilities.get('branches', None)
+        if not settings.SNMP_CAPABILITY_RECHECK_INTERVAL or branches is None:
+            return
+        empty_reads = branches.get(branch_name, None)
+        if count < 0:
+            new_value = -1
+        elif count > 0:
+            new_value = 0
+        else:
+            new_value = min(max(empty_reads or 0, 0) + 1, self.capability_empty_reads)
+        if new_value != empty_reads:
+            dprint(f"   Learned capability '{branch_name}': {empty_reads} -> {new_value}")
+            branches[branch_name] = new_value
+            self._capabilities_changed = True
+
+    def _check_capabilities(self) -> None:
+        """
+        Start learning the mib capabilities of this device again, if the learned data is older than
+        settings.SNMP_CAPABILITY_RECHECK_INTERVAL, or if the system OID or description changed,
+        i.e. this is a different model, or the firmware was upgraded.
+        This needs the 'system' mib branch to be read first.
+        Does not return anything.
+        """
+        if not settings.SNMP_CAPABILITY_RECHECK_INTERVAL:
+            return
+        capabilities = self.switch.snmp_capabilities
+        if (
+            capabilities.get('object_id', '') != self.object_id
+            or capabilities.get('description', '') != self.sys_descr
+            or time.time() - capabilities.get('learned', 0) > settings.SNMP_CAPABILITY_RECHECK_INTERVAL
+        ):
+            dprint("   Learning the mib capabilities again")
+            # tables that were prefetched with the old capabilities can be missing columns, read these again:
+            for key in list(self._prefetched_walks.keys()):
+                if isinstance(key, tuple) and self._get_supported_columns(key) != key:
+                    del self._prefetched_walks[key]
+            self.switch.snmp_capabilities = {
+                'object_id': self.object_id,
+                'description': self.sys_descr,
+                'learned': int(time.time()),
+                'branches': {},
+            }
+            self._capabilities_changed = True
+
+    def _save_learned_settings(self) -> None:
+        """
+        Save the learned get-bulk max_repetitions and mib capabilities to the Switch() object, if they changed.
+        """
+        update_fields = []
+        if self._max_repetitions_changed:
+            update_fields.append('snmp_bulk_tuning')
+            self._max_repetitions_changed = False
+        if self._capabilities_changed:
+            update_fields.append('snmp_capabilities')
+            self._capabilities_changed = False
+        if update_fields:
+            self.switch.save(update_fields=update_fields)
+
+    def _prefetch_snmp_branches(self, walks: dict, max_repetitions: int = 0) -> None:
+        """
+        Concurrent walk engine: bulk-walk a set of mib branches with several walks in flight at the same time.
+        The raw results are stored in self._prefetched_walks{}, and are parsed later,
+        in the normal order, when get_snmp_branch() is called for that branch.
+        I.e. only the network traffic happens in parallel, all parsing still happens in this thread!
+
+        walks - dictionary, key is the branch name, value is a tuple of branch names that need to be read first.
+                A walk is only started if all of these required branches returned entries,
+                e.g. 'dot1qVlanCurrentEgressPorts' requires 'dot1dBasePortIfIndex'.
+                If a walk is skipped here, get_snmp_branch() will read it the normal (serial) way, if still needed.
+                The key can also be a tuple of branch names, to read a table with get_snmp_table()
+        max_repetitions - the get-bulk max_repetitions, if 0 use the value for each branch, see get_max_repetitions()
+
+        Each walk borrows its own EasySnmp Session() from the session pool, as these are not thread-safe.
+        The number of concurrent walks for this device is limited by settings.SNMP_MAX_CONCURRENT_WALKS
+        Does not return anything.
+        """
+        dprint(f"_prefetch_snmp_branches() with {settings.SNMP_MAX_CONCURRENT_WALKS} workers")
+        self._prefetched_walks = {}
+        if settings.SNMP_MAX_CONCURRENT_WALKS < 2:
+            # walks will happen one-by-one in get_snmp_branch()
+            return
+
+        session_key = self._get_snmp_session_key()
+
+        def walk_branch(branch_name: str, max_repetitions: int) -> tuple:
+            """
+            Walk a single branch in a worker thread, on a snmp session borrowed from the pool.
+            Returns tuple of (branch_name, items, duration, exception, max_repetitions, truncated)
+            """
+            start_time = time.time()
+            session = False
+            truncated = ''
+            try:
+                session = snmp_session_pool.borrow(session_key, self._get_snmp_session)
+                if not session:
+                    raise Exception("Cannot get SNMP session!")
+                if isinstance(branch_name, tuple):
+                    items = self._bulkwalk_table(
+                        session=session,
+                        branch_names=self._get_supported_columns(branch_name),
+                        max_repetitions=max_repetitions,
+                    )
+                else:
+                    (items, max_repetitions, truncated) = self._bulkwalk_capped(
+                        session=session, branch_name=branch_name, max_repetitions=max_repetitions
+                    )
+            except Exception as e:
+                return (branch_name, [], time.time() - start_time, e, max_repetitions, '')
+            finally:
+                snmp_session_pool.release(session_key, session)
+            return (branch_name, items, time.time() - start_time, None, max_repetitions, truncated)
+
+        pending = {}  # branch name -> tuple of required branches
+        finished = {}  # branch name -> count of items, or -1 for errors or skipped walks
+        for branch_name, requires in walks.items():
+            names = branch_name if isinstance(branch_name, tuple) else (branch_name,)
+            if not all(name in snmp_mib_variables.keys() for name in names):
+                finished[branch_name] = -1
+            elif not self._get_supported_columns(names):
+                # nothing to read, get_snmp_branch() or get_snmp_table() will return 0 entries.
+                finished[branch_name] = 0
+            else:
+                pending[branch_name] = requires
+        running = set()
+        serial_time = 0
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=settings.SNMP_MAX_CONCURRENT_WALKS) as executor:
+            while pending or running:
+                # start all walks that have their required walks completed:
+                for branch_name, requires in list(pending.items()):
+                    if any(name not in walks.keys() for name in requires):
+                        # required branch is not part of this set of walks, let get_snmp_branch() decide.
+                        del pending[branch_name]
+                        finished[branch_name] = -1
+                    elif all(name in finished for name in requires):
+                        del pending[branch_name]
+                        if all(finished[name] > 0 for name in requires):
+                            running.add(
+                                executor.submit(
+                                    walk_branch, branch_name, max_repetitions or self.get_max_repetitions(branch_name)
+                                )
+                            )
+                        else:
+                            # nothing to read, or error on required branch
+                            dprint(f"   Skipping prefetch of {branch_name}")
+                            finished[branch_name] = -1
+                if not running:
+                    # anything still pending has circular requirements, and will be read serially.
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    (branch_name, items, duration, exception, walk_max_repetitions, truncated) = future.result()
+                    self._prefetched_walks[branch_name] = (
+                        items,
+                        duration,
+                        exception,
+                        walk_max_repetitions,
+                        truncated,
+                    )
+                    finished[branch_name] = -1 if exception else len(items)
+                    serial_time += duration
+
+        # show the savings in the timing data. Note these do NOT add to the 'Total' time:
+        count = len(self._prefetched_walks)
+        self.add_timing("Concurrent walks (serial time)", count, serial_time, add_to_total=False)
+        self.add_timing(
+            f"Concurrent walks (wall clock, {settings.SNMP_MAX_CONCURRENT_WALKS} max)",
+            count,
+            time.time() - start_time,
+            add_to_total=False,
+        )
+
+    def _prefetch_snmp_contexts(self, contexts: dict, branch_names: tuple) -> dict:
+        """
+        Concurrent walk engine for context-specific data: bulk-walk the same mib branches in several
+        snmp contexts, e.g. the per-vlan bridge tables on Cisco devices (community@vlan, or v3 context vlan-X).
+        Like _prefetch_snmp_branches(), only the network traffic happens in parallel. The caller parses the
+        results of each context in order, by setting them in self._prefetched_walks{} and calling get_snmp_branch()
+
+        contexts - dictionary, key is an id of the context (e.g. the vlan id), value is the community or context
+                   string, see _set_snmp_session()
+        branch_names - tuple of branch names to walk in each context.
+
+        Each walk borrows its own EasySnmp Session() for the context from the session pool.
+        The number of concurrent walks for this device is limited by settings.SNMP_MAX_CONCURRENT_WALKS
+
+        Returns a dictionary of context id to a dictionary of branch name to the walk results,
+        in the format of self._prefetched_walks{}. This is empty if walks are not done concurrently.
+        """
+        dprint(f"_prefetch_snmp_contexts() {len(contexts)} contexts with {settings.SNMP_MAX_CONCURRENT_WALKS} workers")
+        if settings.SNMP_MAX_CONCURRENT_WALKS < 2 or not contexts:
+            # walks will happen one-by-one in get_snmp_branch()
+            return {}
+
+        def walk_branch(context_id, com_or_ctx: str, branch_name: str, max_repetitions: int) -> tuple:
+            """
+            Walk a single branch in a context in a worker thread, on a snmp session borrowed from the pool.
+            Returns tuple of (context_id, branch_name, items, duration, exception, max_repetitions, truncated)
+            """
+            start_time = time.time()
+            session_key = self._get_snmp_session_key(com_or_ctx=com_or_ctx)
+            session = False
+            try:
+                session = snmp_session_pool.borrow(
+                    session_key, lambda: self._get_snmp_session(com_or_ctx=com_or_ctx)
+                )
+                if not session:
+                    raise Exception("Cannot get SNMP session!")
+                (items, max_repetitions, truncated) = self._bulkwalk_capped(
+                    session=session, branch_name=branch_name, max_repetitions=max_repetitions
+                )
+            except Exception as e:
+                return (context_id, branch_name, [], time.time() - start_time, e, max_repetitions, '')
+            finally:
+                snmp_session_pool.release(session_key, session)
+            return (context_id, branch_name, items, time.time() - start_time, None, max_repetitions, truncated)
+
+        results = {context_id: {} for context_id in contexts.keys()}
+        serial_time = 0
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=settings.SNMP_MAX_CONCURRENT_WALKS) as executor:
+            futures = [
+                executor.submit(
+                    walk_branch, context_id, com_or_ctx, branch_name, self.get_max_repetitions(branch_name)
+                )
+                for context_id, com_or_ctx in contexts.items()
+                for branch_name in branch_names
+            ]
+            for future in futures:
+                (context_id, branch_name, items, duration, exception, max_repetitions, truncated) = future.result()
+                results[context_id][branch_name] = (items, duration, exception, max_repetitions, truncated)
+                serial_time += duration
+
+        # show the savings in the timing data. Note these do NOT add to the 'Total' time:
+        self.add_timing("Concurrent context walks (serial time)", len(futures), serial_time, add_to_total=False)
+        self.add_timing(
+            f"Concurrent context walks (wall clock, {settings.SNMP_MAX_CONCURRENT_WALKS} max)",
+            len(futures),
+            time.time() - start_time,
+            add_to_total=False,
+        )
+        return results
+
+    def _get_basic_info_walks(self) -> dict:
+        """
+        Return the mib branches that get_my_basic_info() will read, so they can be bulk-walked concurrently.
+        Key is the branch name, value is a tuple with the branch names that have to be read first,
+        and have to return entries, before this branch is needed.
+        Vendor classes can override this to add or remove their own branches.
+        Note: branches that are conditionally read based on parsed data (e.g. ifDescr if no ifName)
+        are not listed here, they are read when needed.
+        """
+        return {
+            'system': (),
+            # the interface mibs, no dependencies:
+            self.interface_table_columns: (),
+            # Q-Bridge vlan data:
+            'dot1qBase': (),
+            'dot1dBasePortIfIndex': ('dot1qBase',),
+            'dot1qVlanStaticRowStatus': ('dot1qBase',),
+            'dot1qVlanStaticName': ('dot1qVlanStaticRowStatus',),
+            'dot1qVlanStatus': ('dot1qVlanStaticRowStatus',),
+            # the Q-Bridge port id's need to be mapped before the port bitmaps mean anything:
+            'dot1qPvid': ('dot1dBasePortIfIndex',),
+            'dot1qVlanCurrentEgressPorts': ('dot1dBasePortIfIndex',),
+            'ieee8021QBridgeMvrpEnabledStatus': (),
+            'ipAddrTable': (),
+            # LACP:
+            'dot3adAggActorAdminKey': (),
+            'dot3adAggPortActorAdminKey': ('dot3adAggActorAdminKey',),
+            # PoE:
+            'pethMainPseEntry': (),
+            'pethPsePortAdminEnable': ('pethMainPseEntry',),
+            'pethPsePortDetectionStatus': ('pethPsePortAdminEnable',),
+        }
+
     """
     end of the EasySNMP interfaces
     """
@@ -780,6 +1683,79 @@ class SnmpConnector(Connector):
         """
         dprint("get_my_basic_info()")
         self.error.clear()
+        start_time = time.time()
+        # read the needed mib branches concurrently, they are parsed below in the proper order.
+        self._prefetch_snmp_branches(walks=self._get_basic_info_walks())
+        retval = self._get_basic_info_data()
+        # free up any branch data that was not used:
+        self._prefetched_walks = {}
+        self._save_learned_settings()
+        if retval:
+            self.basic_info_full_read_timestamp = start_time
+        return retval
+
+    def refresh_my_basic_info(self) -> bool:
+        """
+        Refresh the cached basic info with only the interfaces that changed, see Connector.refresh_basic_info()
+        We read sysUpTime and the ifLastChange column, and then get the interface table row of each interface
+        where ifLastChange moved since the data was cached. All other data is kept from the cache.
+        Everything needs to be read again (return False) if settings.SNMP_INCREMENTAL_REFRESH is not set,
+        or the last full read is older than that, after a reboot, if interfaces were added or removed,
+        or if many interfaces changed (as a table walk is then faster).
+        Note that vendor-specific interface data, see _get_interface_data(), is only read in a full read.
+        Return True if the data was refreshed, False if not (the device data of this object is then not changed).
+        """
+        dprint("refresh_my_basic_info()")
+        if not settings.SNMP_INCREMENTAL_REFRESH:
+            return False
+        cached = self.read_device_cache()
+        if not cached:
+            return False
+        attributes = cached['attributes']
+        interfaces = cached['interfaces']
+        if time.time() - attributes.get('basic_info_full_read_timestamp', 0) > settings.SNMP_INCREMENTAL_REFRESH:
+            dprint("  Last full read is too old")
+            return False
+        # sysUpTime starts at 0 when the device reboots (and wraps after 497 days):
+        (error, retval) = self.get(sysUpTime, parser=self._parse_mibs_system)
+        if error or self.sys_uptime < attributes.get('sys_uptime', 0):
+            dprint("  Device rebooted, or not reachable")
+            return False
+        uptime = self.sys_uptime
+
+        last_changes = {}  # ifIndex -> ifLastChange
+
+        def parse_last_change(oid: str, val: str):
+            if_index = oid_in_branch(ifLastChange, oid)
+            if if_index:
+                last_changes[if_index] = int(val)
+
+        if self.get_snmp_branch('ifLastChange', parse_last_change) < 0 or last_changes.keys() != interfaces.keys():
+            dprint("  Interfaces added or removed")
+            return False
+        changed = [if_index for if_index, ticks in last_changes.items() if ticks != interfaces[if_index].last_change]
+        if len(changed) > len(interfaces) / 4:
+            dprint(f"  {len(changed)} interfaces changed, reading all")
+            return False
+
+        # start from the cached data, and read the changed interfaces:
+        self.apply_device_cache(cached)
+        self._parse_mibs_system(sysUpTime, str(uptime))
+        columns = [name for name in self._get_supported_columns(self.interface_table_columns) if name != 'ifIndex']
+        for if_index in changed:
+            dprint(f"  Interface {if_index} changed")
+            if self.get_multiple([f"{snmp_mib_variables[branch_name]}.{if_index}" for branch_name in columns]) < 0:
+                self.add_warning(f"Error reading changed interface {if_index}: {self.error.description}")
+                break
+        self.add_more_info('System', 'Interfaces Refreshed', f"{len(changed)} of {len(interfaces)}")
+        self._save_learned_settings()
+        return True
+
+    def _get_basic_info_data(self) -> bool:
+        """
+        Read and parse all the basic info mibs, in order.
+        Returns True on success, False on failure.
+        """
         retval = self._get_system_data()
         if retval != -1:
             retval = self._get_interface_data()
@@ -808,10 +1784,33 @@ class SnmpConnector(Connector):
             self._get_lldp_data()
             # and the arp tables (after we found ethernet address, so we can update with IP)
             self._get_arp_data()
-            self.switch.save()  # update counters
+            # only save the learned get-bulk values and capabilities, other changes to the Switch()
+            # would invalidate the cached device groups of all users, see signals.py
+            self._save_learned_settings()
             return True
+        self._save_learned_settings()
         return False
 
+    def get_my_interface_client_data(self, interface: Interface) -> bool:
+        """
+        Get the client data of a single interface, see Connector.get_interface_client_data()
+        Only the forwarding database entries of the vlans of the interface, the lldp neighbors
+        heard on the interface, and the arp entries of the layer 3 interfaces of these vlans are read.
+        """
+        vlan_ids = self._get_interface_vlan_ids(interface)
+        if vlan_ids and not self._get_known_ethernet_addresses(vlan_ids=vlan_ids):
+            self._save_learned_settings()
+            return False
+        # the vlans are shared with other interfaces, only keep the addresses heard on this interface:
+        for iface in self.interfaces.values():
+            if iface.key != interface.key:
+                iface.eth = {}
+        self._get_lldp_data(interface=interface)
+        if interface.eth:
+            self._get_arp_data(vlan_ids=vlan_ids)
+        self._save_learned_settings()
+        return True
+
     def get_my_hardware_details(self) -> bool:
         """
         Get all (possible) hardware info, stacking details, etc.
@@ -876,510 +1875,506 @@ class SnmpConnector(Connector):
     def _parse_oid(self, oid: str, val: str) -> bool:
         """
         Parse a single OID with data returned from a switch through some "get" or "getbulk" function
-        Will return True if we have parse this, and False if not.
-        THIS NEEDS WORK TO IMPROVE PERFORMANCE !!!
+        The OID is routed to the method that handles its mib branch with a single lookup
+        in the (per class) OID dispatcher, see oid_handlers{} and _get_oid_dispatcher()
         Returns True if we parse the OID!
         oid = OID string to parse
         val = OID value to parse, as a string (since in EasySNMP all returned data is a string!)
         """
         dprint(f"Base _parse_oid() {str(oid)}")
+        (handler, sub_oid) = self._get_oid_dispatcher().lookup(oid)
+        if handler:
+            return getattr(self, handler)(sub_oid, val)
+        # we did not parse this. This can happen with Bulk Walks...
+        return False
 
-        oid_end = oid_in_branch(ifIndex, oid)
-        if oid_end:
-            # ifIndex branch is special, the snmp return "val" is the index, not the oid ending!
-            # create new interface object and store, with index as string key!
-            return self.add_interface(Interface(val))
+    @classmethod
+    def _get_oid_dispatcher(cls) -> OidDispatcher:
+        """
+        Get the OID dispatcher for this class. This is compiled once per process (and class),
+        from the oid_handlers{} of this class and all its parent classes.
+        Entries in a vendor class override the generic entries for the same mib branch.
+        """
+        dispatcher = _oid_dispatchers.get(cls, False)
+        if not dispatcher:
+            dprint(f"Compiling OID dispatcher for {cls.__name__}")
+            dispatcher = OidDispatcher()
+            for klass in reversed(cls.__mro__):
+                for mib_branch, handler in klass.__dict__.get('oid_handlers', {}).items():
+                    dispatcher.register(mib_branch=mib_branch, handler=handler)
+            _oid_dispatchers[cls] = dispatcher
+        return dispatcher
 
+    #
+    # The OID handlers called from _parse_oid(), see oid_handlers{}
+    # These are called with the OID part past the mib branch (e.g. the ifIndex), and the value.
+    #
+
+    def _parse_if_index(self, sub_oid: str, val: str) -> bool:
+        # ifIndex branch is special, the snmp return "val" is the index, not the oid ending!
+        # create new interface object and store, with index as string key!
+        return self.add_interface(Interface(val))
+
+    def _parse_if_descr(self, if_index: str, val: str) -> bool:
         # this is the old ifDescr, superceded by the IF-MIB name
-        if_index = oid_in_branch(ifDescr, oid)
-        if if_index:
-            # set new 'name'. Latter will later be overwritten with ifName bulkwalk
-            return self.set_interface_attribute_by_key(if_index, "name", str(val))
-
-        if_index = oid_in_branch(ifType, oid)
-        if if_index:
-            if_type = int(val)
-            if self.set_interface_attribute_by_key(if_index, "type", if_type):
-                if if_type != IF_TYPE_ETHERNET:
-                    # non-Ethernet interfaces are NOT manageable, no matter who
-                    self.set_interface_attribute_by_key(if_index, "manageable", False)
-                    self.set_interface_attribute_by_key(
-                        if_index, "unmanage_reason", "Access denied: not an Ethernet interface!"
-                    )
-            return True
+        # set new 'name'. Latter will later be overwritten with ifName bulkwalk
+        return self.set_interface_attribute_by_key(if_index, "name", str(val))
+
+    def _parse_if_type(self, if_index: str, val: str) -> bool:
+        if_type = int(val)
+        if self.set_interface_attribute_by_key(if_index, "type", if_type):
+            if if_type != IF_TYPE_ETHERNET:
+                # non-Ethernet interfaces are NOT manageable, no matter who
+                self.set_interface_attribute_by_key(if_index, "manageable", False)
+                self.set_interface_attribute_by_key(
+                    if_index, "driver_unmanage_reason", "Access denied: not an Ethernet interface!"
+                )
+        return True
 
-        if_index = oid_in_branch(ifMtu, oid)
-        if if_index:
-            return self.set_interface_attribute_by_key(if_index, "mtu", int(val))
+    def _parse_if_mtu(self, if_index: str, val: str) -> bool:
+        return self.set_interface_attribute_by_key(if_index, "mtu", int(val))
 
-        # the old speed, but really we want HCSpeed from IF-MIB, see below
-        if_index = oid_in_branch(ifSpeed, oid)
-        if if_index:
-            # save this in 1Mbps, as per IF-MIB hcspeed
-            return self.set_interface_attribute_by_key(if_index, "speed", int(val) / 1000000)
+    def _parse_if_speed(self, if_index: str, val: str) -> bool:
+        # the old speed, but really we want HCSpeed from IF-MIB, see _parse_if_high_speed()
+        # save this in 1Mbps, as per IF-MIB hcspeed
+        return self.set_interface_attribute_by_key(if_index, "speed", int(val) / 1000000)
 
+    def _parse_if_phys_address(self, if_index: str, val: str) -> bool:
         # do we care about this one?
-        if_index = oid_in_branch(ifPhysAddress, oid)
-        if if_index:
-            return self.set_interface_attribute_by_key(if_index, "phys_addr", val)
+        return self.set_interface_attribute_by_key(if_index, "phys_addr", val)
 
-        if_index = oid_in_branch(ifAdminStatus, oid)
-        if if_index:
-            status = True if int(val) == IF_ADMIN_STATUS_UP else False
-            return self.set_interface_attribute_by_key(if_index, "admin_status", status)
+    def _parse_if_admin_status(self, if_index: str, val: str) -> bool:
+        status = True if int(val) == IF_ADMIN_STATUS_UP else False
+        return self.set_interface_attribute_by_key(if_index, "admin_status", status)
 
-        if_index = oid_in_branch(ifOperStatus, oid)
-        if if_index:
-            status = True if int(val) == IF_OPER_STATUS_UP else False
-            return self.set_interface_attribute_by_key(if_index, "oper_status", status)
+    def _parse_if_oper_status(self, if_index: str, val: str) -> bool:
+        status = True if int(val) == IF_OPER_STATUS_UP else False
+        return self.set_interface_attribute_by_key(if_index, "oper_status", status)
 
-        """
-        if_index = int(oid_in_branch(IF_LAST_CHANGE, oid))
-        if if_index:
-            return self.set_interface_attribute_by_key(if_index, "last_change", int(val))
-        """
+    def _parse_if_last_change(self, if_index: str, val: str) -> bool:
+        # the sysUpTime of the last link change, see refresh_my_basic_info()
+        return self.set_interface_attribute_by_key(if_index, "last_change", int(val))
 
-        if_index = oid_in_branch(ifName, oid)
-        if if_index:
-            return self.set_interface_attribute_by_key(if_index, "name", str(val))
+    def _parse_if_name(self, if_index: str, val: str) -> bool:
+        return self.set_interface_attribute_by_key(if_index, "name", str(val))
 
-        if_index = oid_in_branch(ifAlias, oid)
-        if if_index:
-            return self.set_interface_attribute_by_key(if_index, "description", str(val))
+    def _parse_if_alias(self, if_index: str, val: str) -> bool:
+        return self.set_interface_attribute_by_key(if_index, "description", str(val))
 
+    def _parse_if_high_speed(self, if_index: str, val: str) -> bool:
         # ifMIB high speed counter:
-        if_index = oid_in_branch(ifHighSpeed, oid)
-        if if_index:
-            return self.set_interface_attribute_by_key(if_index, "speed", int(val))
+        return self.set_interface_attribute_by_key(if_index, "speed", int(val))
 
+    def _parse_if_duplex(self, if_index: str, val: str) -> bool:
         # dot3 interface duplex status information:
-        if_index = oid_in_branch(dot3StatsDuplexStatus, oid)
-        if if_index:
-            return self.set_interface_attribute_by_key(if_index, "duplex", int(val))
+        return self.set_interface_attribute_by_key(if_index, "duplex", int(val))
 
-        """
-        if_index = int(oid_in_branch(ifConnectorPresent, oid))
-        if if_index:
-            val = int(val)
-            if if_index in self.interfaces.keys():
-                if val == SNMP_TRUE:
-                    self.set_interface_attribute_by_key(if_index, "has_connector", True)
-                else:
-                    self.set_interface_attribute_by_key(if_index, "has_connector", False)
-                    self.set_interface_attribute_by_key(if_index, "manageable", False)
-            return True
-        """
-
-        # TO ADD:
-        # ifStackHigherLayer = '.1.3.6.1.2.1.31.1.2.1.1'
-        # ifStackLowerLayer =  '.1.3.6.1.2.1.31.1.2.1.2'
-        # ifStackStatus =      '.1.3.6.1.2.1.31.1.2.1.3'
+    """
+    def _parse_if_connector_present(self, if_index: str, val: str) -> bool:
+        val = int(val)
+        if if_index in self.interfaces.keys():
+            if val == SNMP_TRUE:
+                self.set_interface_attribute_by_key(if_index, "has_connector", True)
+            else:
+                self.set_interface_attribute_by_key(if_index, "has_connector", False)
+                self.set_interface_attribute_by_key(if_index, "manageable", False)
+        return True
+    """
 
-        #
-        # 802.1Q / VLAN related
-        #
+    # TO ADD:
+    # ifStackHigherLayer = '.1.3.6.1.2.1.31.1.2.1.1'
+    # ifStackLowerLayer =  '.1.3.6.1.2.1.31.1.2.1.2'
+    # ifStackStatus =      '.1.3.6.1.2.1.31.1.2.1.3'
 
-        # these are part of "dot1qBase":
-        sub_oid = oid_in_branch(dot1qNumVlans, oid)
-        if sub_oid:
-            self.vlan_count = int(val)
-            return True
+    #
+    # 802.1Q / VLAN related
+    #
 
-        sub_oid = oid_in_branch(dot1qGvrpStatus, oid)
-        if sub_oid:
-            if int(val) == GVRP_ENABLED:
-                self.gvrp_enabled = True
-            return True
+    def _parse_dot1q_num_vlans(self, sub_oid: str, val: str) -> bool:
+        # this is part of "dot1qBase":
+        self.vlan_count = int(val)
+        return True
 
-        sub_oid = oid_in_branch(ieee8021QBridgeMvrpEnabledStatus, oid)
-        if sub_oid:
-            if int(val) == GVRP_ENABLED:
-                self.gvrp_enabled = True
-            return True
+    def _parse_gvrp_status(self, sub_oid: str, val: str) -> bool:
+        # dot1qGvrpStatus (part of "dot1qBase"), or ieee8021QBridgeMvrpEnabledStatus
+        if int(val) == GVRP_ENABLED:
+            self.gvrp_enabled = True
+        return True
 
+    def _parse_port_gvrp_status(self, sub_oid: str, val: str) -> bool:
         # the per-switchport GVRP setting:
-        port_id = int(oid_in_branch(dot1qPortGvrpStatus, oid))
-        if port_id:
-            if_index = self._get_if_index_from_port_id(port_id)
-            if int(val) == GVRP_ENABLED:
-                self.set_interface_attribute_by_key(if_index, "gvrp_enabled", True)
-            return True
+        port_id = int(sub_oid)
+        if not port_id:
+            return False
+        if_index = self._get_if_index_from_port_id(port_id)
+        if int(val) == GVRP_ENABLED:
+            self.set_interface_attribute_by_key(if_index, "gvrp_enabled", True)
+        return True
 
+    def _parse_vlan_current_egress_ports(self, sub_oid: str, val: str) -> bool:
         # List of all egress ports of a VLAN (tagged + untagged) as a hexstring
-        # dot1qVlanCurrentEgressPorts
-        sub_oid = oid_in_branch(dot1qVlanCurrentEgressPorts, oid)
-        if sub_oid:
-            # sub oid part is dot1qVlanCurrentEgressPorts.timestamp.vlan_id = bitmap
-            (time_val, v) = sub_oid.split('.')
-            vlan_id = int(v)
-            # check if vlan is globally defined on switch:
-            if vlan_id not in self.vlans.keys():
-                # not likely, we should know vlan by now, but just in case!
-                self.add_vlan_by_id(vlan_id=vlan_id)
-            # store the egress port list, as some switches need this when setting untagged vlans
-            self.vlans[vlan_id].current_egress_portlist.from_unicode(val)
-            # now look at all the bits in this multi-byte value to find ports on this vlan:
-            offset = 0
-            for byte in val:
-                byte = ord(byte)
-                # which bits are set? A hack but it works!
-                # note that the bits are actually in system order,
-                # ie. bit 1 is first bit in stream, i.e. HIGH order bit!
-                if byte & 128:
-                    port_id = (offset * 8) + 1
-                    self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
-                if byte & 64:
-                    port_id = (offset * 8) + 2
-                    self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
-                if byte & 32:
-                    port_id = (offset * 8) + 3
-                    self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
-                if byte & 16:
-                    port_id = (offset * 8) + 4
-                    self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
-                if byte & 8:
-                    port_id = (offset * 8) + 5
-                    self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
-                if byte & 4:
-                    port_id = (offset * 8) + 6
-                    self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
-                if byte & 2:
-                    port_id = (offset * 8) + 7
-                    self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
-                if byte & 1:
-                    port_id = (offset * 8) + 8
-                    self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
-                offset += 1
-            return True
+        # sub oid part is dot1qVlanCurrentEgressPorts.timestamp.vlan_id = bitmap
+        (time_val, v) = sub_oid.split('.')
+        vlan_id = int(v)
+        # check if vlan is globally defined on switch:
+        if vlan_id not in self.vlans.keys():
+            # not likely, we should know vlan by now, but just in case!
+            self.add_vlan_by_id(vlan_id=vlan_id)
+        # store the egress port list, as some switches need this when setting untagged vlans
+        self.vlans[vlan_id].current_egress_portlist.from_unicode(val)
+        # now look at all the bits in this multi-byte value to find ports on this vlan:
+        offset = 0
+        for byte in val:
+            byte = ord(byte)
+            # which bits are set? A hack but it works!
+            # note that the bits are actually in system order,
+            # ie. bit 1 is first bit in stream, i.e. HIGH order bit!
+            if byte & 128:
+                port_id = (offset * 8) + 1
+                self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
+            if byte & 64:
+                port_id = (offset * 8) + 2
+                self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
+            if byte & 32:
+                port_id = (offset * 8) + 3
+                self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
+            if byte & 16:
+                port_id = (offset * 8) + 4
+                self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
+            if byte & 8:
+                port_id = (offset * 8) + 5
+                self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
+            if byte & 4:
+                port_id = (offset * 8) + 6
+                self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
+            if byte & 2:
+                port_id = (offset * 8) + 7
+                self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
+            if byte & 1:
+                port_id = (offset * 8) + 8
+                self._add_vlan_to_interface_by_port_id(port_id, vlan_id)
+            offset += 1
+        return True
 
-        """
-        # this is the bitmap of current untagged ports in vlans (see also above dot1qVlanStaticEgressPorts)
-        sub_oid = oid_in_branch(dot1qVlanCurrentUntaggedPorts, oid)
-        if sub_oid:
-            (dummy, v) = sub_oid.split('.')
-            vlan_id = int(v)
-            if vlan_id not in self.vlans.keys():
-                # not likely, but just in case:
-                self.add_vlan_by_id(vlan_id=vlan_id)
-            # store bitmap for later use
-            self.vlans[vlan_id].untagged_ports_bitmap = val
-            return True
-        """
+    """
+    # this is the bitmap of current untagged ports in vlans (see also above dot1qVlanStaticEgressPorts)
+    def _parse_vlan_current_untagged_ports(self, sub_oid: str, val: str) -> bool:
+        (dummy, v) = sub_oid.split('.')
+        vlan_id = int(v)
+        if vlan_id not in self.vlans.keys():
+            # not likely, but just in case:
+            self.add_vlan_by_id(vlan_id=vlan_id)
+        # store bitmap for later use
+        self.vlans[vlan_id].untagged_ports_bitmap = val
+        return True
+    """
 
+    def _parse_vlan_status(self, sub_oid: str, val: str) -> bool:
         # see if this is static or dynamic vlan
-        sub_oid = oid_in_branch(dot1qVlanStatus, oid)
-        if sub_oid:
-            (dummy, v) = sub_oid.split('.')
-            vlan_id = int(v)
-            status = int(val)
-            if vlan_id in self.vlans.keys():
-                self.vlans[vlan_id].status = status
-            else:
-                # only should happen for non-permanent vlans, we should know static vlans by now!
-                self.add_vlan_by_id(vlan_id=vlan_id)
-                self.vlans[vlan_id].status = status
-            return True
+        (dummy, v) = sub_oid.split('.')
+        vlan_id = int(v)
+        status = int(val)
+        if vlan_id in self.vlans.keys():
+            self.vlans[vlan_id].status = status
+        else:
+            # only should happen for non-permanent vlans, we should know static vlans by now!
+            self.add_vlan_by_id(vlan_id=vlan_id)
+            self.vlans[vlan_id].status = status
+        return True
 
+    def _parse_vlan_static_name(self, sub_oid: str, val: str) -> bool:
         # The VLAN name
-        vlan_id = int(oid_in_branch(dot1qVlanStaticName, oid))
-        if vlan_id:
-            # not yet sure how to handle this
-            if vlan_id in self.vlans.keys():
-                self.vlans[vlan_id].name = val
-            else:
-                # vlan not found yet, create it
-                self.add_vlan_by_id(vlan_id=vlan_id)
-                self.vlans[vlan_id].name = val
-            return True
+        vlan_id = int(sub_oid)
+        if not vlan_id:
+            return False
+        # not yet sure how to handle this
+        if vlan_id in self.vlans.keys():
+            self.vlans[vlan_id].name = val
+        else:
+            # vlan not found yet, create it
+            self.add_vlan_by_id(vlan_id=vlan_id)
+            self.vlans[vlan_id].name = val
+        return True
 
-        """
-        # List of all static egress ports of a VLAN (tagged + untagged) as a hexstring
-        # dot1qVlanStaticEgressPorts - READ-WRITE variable
-        # we read and store this so we have it ready to WRITE by setting a bit value, when we update the vlan on a port!
-        vlan_id = int(oid_in_branch(dot1qVlanStaticEgressPorts, oid))
-        if vlan_id:
-            if vlan_id not in self.vlans.keys():
-                # not likely, we should know by now, but just in case.
-                self.add_vlan_by_id(vlan_id=vlan_id)
-            # store it!
-            self.vlans[vlan_id].static_egress_portlist.from_unicode(val)
-            return True
-        """
+    """
+    # List of all static egress ports of a VLAN (tagged + untagged) as a hexstring
+    # dot1qVlanStaticEgressPorts - READ-WRITE variable
+    # we read and store this so we have it ready to WRITE by setting a bit value, when we update the vlan on a port!
+    def _parse_vlan_static_egress_ports(self, sub_oid: str, val: str) -> bool:
+        vlan_id = int(sub_oid)
+        if vlan_id not in self.vlans.keys():
+            # not likely, we should know by now, but just in case.
+            self.add_vlan_by_id(vlan_id=vlan_id)
+        # store it!
+        self.vlans[vlan_id].static_egress_portlist.from_unicode(val)
+        return True
 
-        """
-        # this is the bitmap of static untagged ports in vlans (see also above dot1qVlanCurrentEgressPorts)
-        vlan_id = int(oid_in_branch(dot1qVlanStaticUntaggedPorts, oid))
-        if vlan_id:
-            if vlan_id not in self.vlans.keys():
-                # unlikely, we should know by now, but just in case
-                self.add_vlan_by_id(vlan_id=vlan_id)
-            # store for later use:
-            # self.vlans[vlan_id].untagged_ports_bitmap = val
-            return True
-        """
+    # this is the bitmap of static untagged ports in vlans (see also above dot1qVlanCurrentEgressPorts)
+    def _parse_vlan_static_untagged_ports(self, sub_oid: str, val: str) -> bool:
+        vlan_id = int(sub_oid)
+        if vlan_id not in self.vlans.keys():
+            # unlikely, we should know by now, but just in case
+            self.add_vlan_by_id(vlan_id=vlan_id)
+        # store for later use:
+        # self.vlans[vlan_id].untagged_ports_bitmap = val
+        return True
+    """
 
+    def _parse_vlan_static_row_status(self, sub_oid: str, val: str) -> bool:
         # List of all available vlans on this switch as by the command "show vlans"
-        vlan_id = int(oid_in_branch(dot1qVlanStaticRowStatus, oid))
-        if vlan_id:
-            # for now, just add to the dictionary,
-            # we will fill in the initial name below at "VLAN_NAME"
-            if vlan_id in self.vlans.keys():
-                # currently we don't parse the status, so nothing to do here
-                return True
-            # else add entry, should never happen!
-            self.add_vlan_by_id(vlan_id=vlan_id)
-            # assume vlan_id = vlan_index = fdb_index, unless we learn otherwize
-            self.vlan_id_by_index[vlan_id] = vlan_id
-            self.dot1tp_fdb_to_vlan_index[vlan_id] = vlan_id
+        vlan_id = int(sub_oid)
+        if not vlan_id:
+            return False
+        # for now, just add to the dictionary,
+        # we will fill in the initial name below at "VLAN_NAME"
+        if vlan_id in self.vlans.keys():
+            # currently we don't parse the status, so nothing to do here
             return True
+        # else add entry, should never happen!
+        self.add_vlan_by_id(vlan_id=vlan_id)
+        # assume vlan_id = vlan_index = fdb_index, unless we learn otherwize
+        self.vlan_id_by_index[vlan_id] = vlan_id
+        self.dot1tp_fdb_to_vlan_index[vlan_id] = vlan_id
+        return True
 
+    def _parse_pvid(self, sub_oid: str, val: str) -> bool:
         # The VLAN ID assigned to ***untagged*** frames - dot1qPvid, indexed by dot1dBasePort
         # ie. lookup ifIndex with _get_if_index_from_port_id(port_id)
         # IMPORTANT: IF THE INTERFACE IS TAGGED, this value is 1, and typically incorrect!!!
-        port_id = int(oid_in_branch(dot1qPvid, oid))
-        if port_id:
-            if_index = self._get_if_index_from_port_id(port_id)
-            # not yet sure how to handle this. val is 'untagged vlan'
-            untagged_vlan = int(val)
-            self.set_interface_attribute_by_key(if_index, "untagged_vlan", untagged_vlan)
-            if untagged_vlan not in self.vlans.keys():
-                # vlan not defined on switch!
-                self.set_interface_attribute_by_key(if_index, "disabled", True)
-                self.set_interface_attribute_by_key(
-                    if_index, "unmanage_reason", f"Untagged vlan {untagged_vlan} is NOT defined on switch"
-                )
-                warning = f"Undefined vlan {untagged_vlan} on {self.interfaces[if_index].name}"
-                self.add_warning(warning)
-                # log this as well
-                log = Log(
-                    user=self.request.user,
-                    group=self.group,
-                    switch=self.switch,
-                    ip_address=get_remote_ip(self.request),
-                    if_index=if_index,
-                    type=LOG_TYPE_ERROR,
-                    action=LOG_UNDEFINED_VLAN,
-                    description=f"ERROR: {warning}",
-                )
-                if self.request:
-                    log.user = self.request.user
-                log.save()
-                # not sure what to do here
-            return True
+        port_id = int(sub_oid)
+        if not port_id:
+            return False
+        if_index = self._get_if_index_from_port_id(port_id)
+        # not yet sure how to handle this. val is 'untagged vlan'
+        untagged_vlan = int(val)
+        self.set_interface_attribute_by_key(if_index, "untagged_vlan", untagged_vlan)
+        if untagged_vlan not in self.vlans.keys():
+            # vlan not defined on switch!
+            self.set_interface_attribute_by_key(if_index, "disabled", True)
+            self.set_interface_attribute_by_key(
+                if_index, "driver_unmanage_reason", f"Untagged vlan {untagged_vlan} is NOT defined on switch"
+            )
+            warning = f"Undefined vlan {untagged_vlan} on {self.interfaces[if_index].name}"
+            self.add_warning(warning)
+            # log this as well
+            log = Log(
+                group=self.group,
+                switch=self.switch,
+                ip_address=get_remote_ip(self.request),
+                if_index=if_index,
+                type=LOG_TYPE_ERROR,
+                action=LOG_UNDEFINED_VLAN,
+                description=f"ERROR: {warning}",
+            )
+            if self.request:
+                log.user = self.request.user
+            log.save()
+            # not sure what to do here
+        return True
 
-        # The .0 is the timefilter that we set to 0 to (hopefully) deactivate the filter
-        # The set of ports that are transmitting traffic for this VLAN as either tagged or untagged frames.
-        # CURRENT_VLAN_EGRESS_PORTS = QBRIDGENODES['dot1qVlanCurrentEgressPorts']['oid'] + '.0'
-        # NOTE: this is a READ-ONLY variable!
+    # The .0 is the timefilter that we set to 0 to (hopefully) deactivate the filter
+    # The set of ports that are transmitting traffic for this VLAN as either tagged or untagged frames.
+    # CURRENT_VLAN_EGRESS_PORTS = QBRIDGENODES['dot1qVlanCurrentEgressPorts']['oid'] + '.0'
+    # NOTE: this is a READ-ONLY variable!
 
+    def _parse_base_port_if_index(self, sub_oid: str, val: str) -> bool:
         # Map the Q-BRIDGE port id to the MIB-II if_indexes.
         # PortID=0 indicates known ethernet, but unknown port, i.e. ignore
-        port_id = int(oid_in_branch(dot1dBasePortIfIndex, oid))
-        if port_id:
-            dprint(f"Found dot1dBasePortIfIndex = {port_id}")
-            # map port ID (as str) to interface ID (as str)
-            if_index = str(val)
-            if if_index in self.interfaces.keys():
-                dprint(f"  Mapping to if_index = {if_index}")
-                self.qbridge_port_to_if_index[port_id] = if_index
-                # and map Interface() object back to port ID as well:
-                self.set_interface_attribute_by_key(if_index, "port_id", port_id)
-            # we parsed it, return true:
-            return True
+        port_id = int(sub_oid)
+        if not port_id:
+            return False
+        dprint(f"Found dot1dBasePortIfIndex = {port_id}")
+        # map port ID (as str) to interface ID (as str)
+        if_index = str(val)
+        if if_index in self.interfaces.keys():
+            dprint(f"  Mapping to if_index = {if_index}")
+            self.qbridge_port_to_if_index[port_id] = if_index
+            # and map Interface() object back to port ID as well:
+            self.set_interface_attribute_by_key(if_index, "port_id", port_id)
+        # we parsed it, return true:
+        return True
 
-        """
-        Handle the device IP addresses, e.g. interface ip, vlan ip, etc.
-        """
-        ip = oid_in_branch(ipAdEntIfIndex, oid)
-        if ip:
-            # snmp oid return value is the string "if_index"
-            # Interfaces are indexed by string index, ie the 'val' returned:
-            if val in self.interfaces.keys():
-                # store IP and interface index (as str) for lookup of netmask below
-                self.ip4_to_if_index[ip] = val
-                # no need to store yet:
-                # self.interfaces[val].add_ip4_network(ip)
-            return True
+    """
+    Handle the device IP addresses, e.g. interface ip, vlan ip, etc.
+    """
 
-        ip = oid_in_branch(ipAdEntNetMask, oid)
-        if ip:
-            # OID return value is netmask
-            # we should have found the IP address already above!
-            if ip in self.ip4_to_if_index.keys():
-                if_key = self.ip4_to_if_index[ip]
-                # make sure we have an interface for this key:
-                if if_key in self.interfaces.keys():
-                    # now add this IP / Netmask combo to this interface:
-                    self.interfaces[if_key].add_ip4_network(f"{ip}/{val}")
-            return True
+    def _parse_ip_address_if_index(self, ip: str, val: str) -> bool:
+        # snmp oid return value is the string "if_index"
+        # Interfaces are indexed by string index, ie the 'val' returned:
+        if val in self.interfaces.keys():
+            # store IP and interface index (as str) for lookup of netmask below
+            self.ip4_to_if_index[ip] = val
+            # no need to store yet:
+            # self.interfaces[val].add_ip4_network(ip)
+        return True
 
-        """
-        SYSLOG-MSG-MIB - mostly mean to define notification, but we can read the log size
-        """
-        sub_oid = oid_in_branch(syslogMsgTableMaxSize, oid)
-        if sub_oid:
-            # this is the max number of syslog messages stored.
-            self.syslog_max_msgs = int(val)
-            return True
-        """
-        Note: the rest of the SYSLOG_MSG_MIB is meant to define OID's for sending
-        SNMP traps with syslog messages, NOT to poll messages from snmp reads !!!
-        """
+    def _parse_ip_address_netmask(self, ip: str, val: str) -> bool:
+        # OID return value is netmask
+        # we should have found the IP address already above!
+        if ip in self.ip4_to_if_index.keys():
+            if_key = self.ip4_to_if_index[ip]
+            # make sure we have an interface for this key:
+            if if_key in self.interfaces.keys():
+                # now add this IP / Netmask combo to this interface:
+                self.interfaces[if_key].add_ip4_network(f"{ip}/{val}")
+        return True
+
+    """
+    SYSLOG-MSG-MIB - mostly mean to define notification, but we can read the log size
+    Note: the rest of the SYSLOG_MSG_MIB is meant to define OID's for sending
+    SNMP traps with syslog messages, NOT to poll messages from snmp reads !!!
+    """
+
+    def _parse_syslog_max_msgs(self, sub_oid: str, val: str) -> bool:
+        # this is the max number of syslog messages stored.
+        self.syslog_max_msgs = int(val)
+        return True
+
+    """
+    PoE related entries:
+    the pethMainPseEntry table entries with device-level PoE info
+    the OID is <base><device-id>.1 = <value>,
+    where <device-id> is stack member number, vendor and device specific!
+    """
 
+    def _get_poe_pse(self, sub_oid: str) -> PoePSE | bool:
         """
-        PoE related entries:
-        the pethMainPseEntry table entries with device-level PoE info
-        the OID is <base><device-id>.1 = <value>,
-        where <device-id> is stack member number, vendor and device specific!
+        Get the PoePSE() object for the pethMainPseEntry index, create if needed.
+        Returns False if not a valid PSE index.
         """
+        pse_id = int(sub_oid)
+        if not pse_id:
+            return False
+        self.poe_capable = True
+        # store data about individual PSE unit:
+        if pse_id not in self.poe_pse_devices.keys():
+            self.poe_pse_devices[pse_id] = PoePSE(pse_id)
+        return self.poe_pse_devices[pse_id]
+
+    def _parse_poe_pse_power(self, sub_oid: str, val: str) -> bool:
+        pse = self._get_poe_pse(sub_oid)
+        if not pse:
+            return False
+        self.poe_max_power += int(val)
+        # update max power
+        pse.max_power = int(val)
+        return True
 
-        pse_id = int(oid_in_branch(pethMainPsePower, oid))
-        if pse_id:
-            self.poe_capable = True
-            self.poe_max_power += int(val)
-            # store data about individual PSE unit:
-            if pse_id not in self.poe_pse_devices.keys():
-                self.poe_pse_devices[pse_id] = PoePSE(pse_id)
-            # update max power
-            self.poe_pse_devices[pse_id].max_power = int(val)
-            return True
-
-        pse_id = int(oid_in_branch(pethMainPseOperStatus, oid))
-        if pse_id:
-            # not yet sure how to handle this, for now just read
-            self.poe_capable = True
-            self.poe_enabled = int(val)
-            # store data about individual PSE unit:
-            if pse_id not in self.poe_pse_devices.keys():
-                self.poe_pse_devices[pse_id] = PoePSE(pse_id)
-            # update status
-            self.poe_pse_devices[pse_id].status = int(val)
-            return True
+    def _parse_poe_pse_oper_status(self, sub_oid: str, val: str) -> bool:
+        pse = self._get_poe_pse(sub_oid)
+        if not pse:
+            return False
+        # not yet sure how to handle this, for now just read
+        self.poe_enabled = int(val)
+        # update status
+        pse.status = int(val)
+        return True
 
-        pse_id = int(oid_in_branch(pethMainPseConsumptionPower, oid))
-        if pse_id:
-            self.poe_capable = True
-            self.poe_power_consumed += int(val)  # this is in milliWatts
-            # store data about individual PSE unit:
-            if pse_id not in self.poe_pse_devices.keys():
-                self.poe_pse_devices[pse_id] = PoePSE(pse_id)
-            # update max power
-            self.poe_pse_devices[pse_id].power_consumed = int(val)
-            return True
+    def _parse_poe_pse_consumption_power(self, sub_oid: str, val: str) -> bool:
+        pse = self._get_poe_pse(sub_oid)
+        if not pse:
+            return False
+        self.poe_power_consumed += int(val)  # this is in milliWatts
+        # update consumed power
+        pse.power_consumed = int(val)
+        return True
 
-        pse_id = int(oid_in_branch(pethMainPseUsageThreshold, oid))
-        if pse_id:
-            self.poe_capable = True
-            # store data about individual PSE unit:
-            if pse_id not in self.poe_pse_devices.keys():
-                self.poe_pse_devices[pse_id] = PoePSE(pse_id)
-            # update max power
-            self.poe_pse_devices[pse_id].threshold = int(val)
-            return True
+    def _parse_poe_pse_usage_threshold(self, sub_oid: str, val: str) -> bool:
+        pse = self._get_poe_pse(sub_oid)
+        if not pse:
+            return False
+        # update threshold
+        pse.threshold = int(val)
+        return True
 
-        """
-        the pethPsePortEntry tables with port-level PoE info
-        OID is followed by PortEntry index (pe_index). This is typically
-        or module_num.port_num for modules switch chassis, or
-        device_id.port_num for stack members.
-        This gets mapped to an interface later on in
-        self._map_poe_port_entries_to_interface(), which is typically device specific
-        (i.e. implemented in the device-specific classes in
-        vendor/cisco/snmp.py, vendor/comware/snmp.py, etc.)
-        """
+    """
+    the pethPsePortEntry tables with port-level PoE info
+    OID is followed by PortEntry index (pe_index). This is typically
+    or module_num.port_num for modules switch chassis, or
+    device_id.port_num for stack members.
+    This gets mapped to an interface later on in
+    self._map_poe_port_entries_to_interface(), which is typically device specific
+    (i.e. implemented in the device-specific classes in
+    vendor/cisco/snmp.py, vendor/comware/snmp.py, etc.)
+    """
 
-        pe_index = oid_in_branch(pethPsePortAdminEnable, oid)
-        if pe_index:
-            self.poe_port_entries[pe_index] = PoePort(pe_index, int(val))
-            return True
+    def _parse_poe_port_admin_enable(self, pe_index: str, val: str) -> bool:
+        self.poe_port_entries[pe_index] = PoePort(pe_index, int(val))
+        return True
 
-        pe_index = oid_in_branch(pethPsePortDetectionStatus, oid)
-        if pe_index:
-            if pe_index in self.poe_port_entries.keys():
-                self.poe_port_entries[pe_index].detect_status = int(val)
-            return True
+    def _parse_poe_port_detection_status(self, pe_index: str, val: str) -> bool:
+        if pe_index in self.poe_port_entries.keys():
+            self.poe_port_entries[pe_index].detect_status = int(val)
+        return True
 
-        """
-        These are currently not used:
-        pe_index = oid_in_branch(pethPsePortPowerPriority, oid)
-        if pe_index:
-            if pe_index in self.poe_port_entries.keys():
-                self.poe_port_entries[pe_index].priority = int(val)
-            return True
+    """
+    These are currently not used:
+    def _parse_poe_port_power_priority(self, pe_index: str, val: str) -> bool:
+        if pe_index in self.poe_port_entries.keys():
+            self.poe_port_entries[pe_index].priority = int(val)
+        return True
 
-        pe_index = oid_in_branch(pethPsePortType, oid)
-        if pe_index:
-            if pe_index in self.poe_port_entries.keys():
-                self.poe_port_entries[pe_index].description = str(val)
-            return True
-        """
+    def _parse_poe_port_type(self, pe_index: str, val: str) -> bool:
+        if pe_index in self.poe_port_entries.keys():
+            self.poe_port_entries[pe_index].description = str(val)
+        return True
+    """
 
-        #
-        # LACP MIB parsing
-        #
-        """
-        Parse a single OID with data returned from the LACP MIB
-        Will return True if we have parsed this, and False if not.
-        """
+    #
+    # LACP MIB parsing
+    #
 
+    def _parse_lacp_aggregator_admin_key(self, aggr_if_index: str, val: str) -> bool:
         # this gets the aggregator interface admin key or "index"
         # note that aggregator index is an integer according to MIB, but
         # we use it as a string value for the interfaces{} dictionary key!!!
-        aggr_if_index = oid_in_branch(dot3adAggActorAdminKey, oid)
-        if aggr_if_index:
-            # this interface is a aggregator!
-            if aggr_if_index in self.interfaces.keys():
-                self.interfaces[aggr_if_index].lacp_type = LACP_IF_TYPE_AGGREGATOR
-                self.interfaces[aggr_if_index].lacp_admin_key = int(val)
-                # some vendors (certain Cisco switches) set the IF-MIB::ifType to Virtual (53) instead of LAGG (161)
-                # hardcode to LAGG:
-                self.interfaces[aggr_if_index].type = IF_TYPE_LAGG
-                dprint(f"LACP MASTER FOUND: {self.interfaces[aggr_if_index].name}")
-            return True
+        # this interface is a aggregator!
+        if aggr_if_index in self.interfaces.keys():
+            self.interfaces[aggr_if_index].lacp_type = LACP_IF_TYPE_AGGREGATOR
+            self.interfaces[aggr_if_index].lacp_admin_key = int(val)
+            # some vendors (certain Cisco switches) set the IF-MIB::ifType to Virtual (53) instead of LAGG (161)
+            # hardcode to LAGG:
+            self.interfaces[aggr_if_index].type = IF_TYPE_LAGG
+            dprint(f"LACP MASTER FOUND: {self.interfaces[aggr_if_index].name}")
+        return True
 
+    def _parse_lacp_port_admin_key(self, member_if_index: str, val: str) -> bool:
         # this get the member interfaces admin key ("index"), which maps back to the aggregator interface above!
-        member_if_index = oid_in_branch(dot3adAggPortActorAdminKey, oid)
         # note that member_index is an integer according to MIB, but
         # we use it as a string value for the interfaces{} dictionary key!!!
-        if member_if_index:
-            # this interface is an lacp member!
-            if member_if_index in self.interfaces.keys():
-                # can we find an aggregate with this key value ?
-                lacp_key = int(val)
-                for lacp_index, iface in self.interfaces.items():
-                    if iface.lacp_type == LACP_IF_TYPE_AGGREGATOR and iface.lacp_admin_key == lacp_key:
-                        # the current interface is a member of this aggregate iface !
-                        self.interfaces[member_if_index].lacp_type = LACP_IF_TYPE_MEMBER
-                        # note that lacp_index is an integer according to MIB, but
-                        # we use it as a string value for the interfaces{} dictionary key!!!
-                        self.interfaces[member_if_index].lacp_master_index = int(lacp_index)
-                        self.interfaces[member_if_index].lacp_master_name = iface.name
-                        # add our name to the list of the aggregate interface
-                        self.interfaces[lacp_index].lacp_members[member_if_index] = self.interfaces[
-                            member_if_index
-                        ].name
-                        dprint(f"LACP MEMBER FOUND: {self.interfaces[member_if_index].name}")
-            return True
-
-        """
-        # LACP port membership, may only valid once an interface is "up" and has joined the aggregate
-        member_if_index = int(oid_in_branch(dot3adAggPortAttachedAggID, oid))
-        if member_if_index:
-            lacp_if_index = int(val)
-            if lacp_if_index > 0:
-                dprint(f"Member ifIndex {member_if_index} is part of LACP ifIndex {lacp_if_index})
-                if member_if_index in self.interfaces.keys() and lacp_if_index in self.interfaces.keys():
-                    # from this one read, we can get the aggregate ifIndex for the virtual interface
-                    # (and name, for display convenience)
-                    self.interfaces[member_if_index].lacp_master_index = lacp_if_index
-                    self.interfaces[member_if_index].lacp_master_name = self.interfaces[lacp_if_index].name
-                    # and also the member interface (i.e. the physical interface!)
-                    self.interfaces[lacp_if_index].lacp_members[member_if_index] = self.interfaces[member_if_index].name
-            return True
-        """
+        # this interface is an lacp member!
+        if member_if_index in self.interfaces.keys():
+            # can we find an aggregate with this key value ?
+            lacp_key = int(val)
+            for lacp_index, iface in self.interfaces.items():
+                if iface.lacp_type == LACP_IF_TYPE_AGGREGATOR and iface.lacp_admin_key == lacp_key:
+                    # the current interface is a member of this aggregate iface !
+                    self.interfaces[member_if_index].lacp_type = LACP_IF_TYPE_MEMBER
+                    # note that lacp_index is an integer according to MIB, but
+                    # we use it as a string value for the interfaces{} dictionary key!!!
+                    self.interfaces[member_if_index].lacp_master_index = int(lacp_index)
+                    self.interfaces[member_if_index].lacp_master_name = iface.name
+                    # add our name to the list of the aggregate interface
+                    self.interfaces[lacp_index].lacp_members[member_if_index] = self.interfaces[member_if_index].name
+                    dprint(f"LACP MEMBER FOUND: {self.interfaces[member_if_index].name}")
+        return True
 
-        # we did not parse this. This can happen with Bulk Walks...
-        return False
+    """
+    # LACP port membership, may only valid once an interface is "up" and has joined the aggregate
+    # this is a shortcut to find aggregates and members all in one, but does not work for every device.
+    def _parse_lacp_port_attached_agg_id(self, member_if_index: str, val: str) -> bool:
+        lacp_if_index = int(val)
+        if lacp_if_index > 0:
+            dprint(f"Member ifIndex {member_if_index} is part of LACP ifIndex {lacp_if_index})
+            if member_if_index in self.interfaces.keys() and lacp_if_index in self.interfaces.keys():
+                # from this one read, we can get the aggregate ifIndex for the virtual interface
+                # (and name, for display convenience)
+                self.interfaces[member_if_index].lacp_master_index = lacp_if_index
+                self.interfaces[member_if_index].lacp_master_name = self.interfaces[lacp_if_index].name
+                # and also the member interface (i.e. the physical interface!)
+                self.interfaces[lacp_if_index].lacp_members[member_if_index] = self.interfaces[member_if_index].name
+        return True
+    """
 
     def _get_ports_from_vlan_bitmap(self, vlan_id: int, byte_string: bytes):
         """Parse the list of all egress ports of a VLAN (tagged + untagged) as a hex byte string
@@ -2084,6 +3079,7 @@ class SnmpConnector(Connector):
             self.add_more_info('System', 'Object ID', value)
             return True
         if oid == sysDescr:
+            self.sys_descr = value
             self.add_more_info('System', 'Model', value)
             return True
         if oid == sysContact:
@@ -2111,11 +3107,24 @@ class SnmpConnector(Connector):
         if retval < 0:
             self.add_warning("Error getting 'System-Mib' (system)")
             return retval  # error of some kind
+        # now we know the model and firmware, see if the learned mib capabilities still apply:
+        self._check_capabilities()
 
         # add some more info about the configuration/settings
         self.add_more_info('System', 'IP/Hostname', self.switch.primary_ip4)
         self.add_more_info('System', 'Snmp Profile', self.switch.snmp_profile.name)
         self.add_more_info('System', 'Vendor ID', get_switch_enterprise_info(self.object_id))
+        if self.switch.snmp_max_repetitions:
+            self.add_more_info('System', 'SNMP Max-Repetitions', f"{self.switch.snmp_max_repetitions} (fixed)")
+        elif settings.SNMP_MAX_REPETITIONS_LEARNING and self.switch.snmp_bulk_tuning:
+            self.add_more_info(
+                'System',
+                'SNMP Max-Repetitions',
+                ", ".join(f"{name}: {value}" for name, value in self.switch.snmp_bulk_tuning.items()),
+            )
+        unsupported = [name for name in self.capability_branches if self._is_unsupported_branch(name)]
+        if unsupported:
+            self.add_more_info('System', 'SNMP Branches Skipped', ", ".join(unsupported))
         # first time when data was read:
         self.add_more_info(
             'System', 'Read Time', time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.sys_uptime_timestamp))
@@ -2130,7 +3139,6 @@ class SnmpConnector(Connector):
                     action=LOG_NEW_HOSTNAME_FOUND,
                     description="New System Hostname found",
                     switch=self.switch,
-                    user=self.request.user,
                     group=self.group,
                     ip_address=get_remote_ip(self.request),
                     type=LOG_TYPE_WARNING,
@@ -2179,64 +3187,31 @@ class SnmpConnector(Connector):
     def _get_interface_data(self) -> int:
         """
         Get Interface MIB data from the switch. We are not reading the whole MIB-II branch at ifTable,
-        but to speed it up, we run individual branches that we need ...
+        but to speed it up, we walk the columns that we need together, see interface_table_columns
         Returns 1 on succes, -1 on failure
         """
-        # it all starts with the interface indexes
-        retval = self.get_snmp_branch('ifIndex')
-        if retval < 0:
-            self.add_warning(f"Error getting 'Interfaces' ({ifIndex})")
-            return retval
-        # and the types
-        retval = self.get_snmp_branch('ifType')
-        if retval < 0:
-            self.add_warning(f"Error getting 'Interface-Type' ({ifType})")
-            return retval
-
-        # the status of the interface, admin up/down, link up/down
-        retval = self.get_snmp_branch('ifAdminStatus')
-        if retval < 0:
-            self.add_warning(f"Error getting 'Interface-AdminStatus' ({ifAdminStatus})")
-            return retval
-        retval = self.get_snmp_branch('ifOperStatus')
-        if retval < 0:
-            self.add_warning(f"Error getting 'Interface-OperStatus' ({ifOperStatus})")
-            return retval
+        # read all the interface table columns in one table walk.
+        # it all starts with the interface indexes, then the types, admin up/down, link up/down, names,
+        # description (ifAlias), speed and duplex status.
+        counts = self.get_snmp_table(self.interface_table_columns)
+        if counts == -1:
+            self.add_warning(f"Error getting 'Interfaces' ({', '.join(self.interface_table_columns)})")
+            return -1
 
         # find the interface name, start with the newer IF-MIB
-        retval = self.get_snmp_branch('ifName')
-        if retval < 0:
-            self.add_warning(f"Error getting 'Interface-Names' ({ifName})")
-            return retval
-        if retval == 0:  # newer IF-MIB entries no found, try the old
+        if counts.get('ifName', 0) == 0:  # newer IF-MIB entries no found, try the old
             retval = self.get_snmp_branch('ifDescr')
             if retval < 0:
                 self.add_warning(f"Error getting 'Interface-Descriptions' ({ifDescr})")
                 return retval
 
-        # this is the interface description
-        retval = self.get_snmp_branch('ifAlias')
-        if retval < 0:
-            self.add_warning(f"Error getting 'Interface-Alias' ({ifAlias})")
-            return retval
-
         # speed is in new IF-MIB
-        retval = self.get_snmp_branch('ifHighSpeed')
-        if retval < 0:
-            self.add_warning(f"Error getting 'Interface-HiSpeed' ({ifHighSpeed})")
-            return retval
-        if retval == 0:  # new IF-MIB hcspeed entry not found, try old speed
+        if counts.get('ifHighSpeed', 0) == 0:  # new IF-MIB hcspeed entry not found, try old speed
             retval = self.get_snmp_branch('ifSpeed')
             if retval < 0:
                 self.add_warning(f"Error getting 'Interface-Speed' ({ifSpeed})")
                 return retval
 
-        # try to read duplex status
-        retval = self.get_snmp_branch('dot3StatsDuplexStatus')
-        if retval < 0:
-            self.add_warning(f"Error getting 'Interface-Duplex' ({dot3StatsDuplexStatus})")
-            return retval
-
         # check the connector, if not, cannot be managed, another safety feature
         # retval = self.get_snmp_branch('ifConnectorPresent')
         # if retval < 0:
@@ -2400,9 +3375,10 @@ class SnmpConnector(Connector):
                 """
         return 1
 
-    def _get_known_ethernet_addresses(self) -> bool:
+    def _get_known_ethernet_addresses(self, vlan_ids: list = None) -> bool:
         """
         Read the Bridge-MIB for known ethernet address on the switch.
+        vlan_ids - if given, only read the Q-Bridge forwarding databases of these vlans.
         Returns True on success (0 or more addresses found), False on error
         """
 
@@ -2410,38 +3386,129 @@ class SnmpConnector(Connector):
         # Do NOT cache and use a custom parser for speed
 
         # First, the newer dot1q bridge mib
-        retval = self.get_snmp_branch('dot1qTpFdbPort', self._parse_mibs_q_bridge_eth)
+        if vlan_ids is None:
+            retval = self.get_snmp_branch('dot1qTpFdbPort', self._parse_mibs_q_bridge_eth)
+        else:
+            # dot1qTpFdbPort is indexed by forwarding database first, so we walk the sub-tree of each vlan:
+            retval = 0
+            for fdb_index in self._get_fdb_indexes(vlan_ids):
+                count = self.get_snmp_branch('dot1qTpFdbPort', self._parse_mibs_q_bridge_eth, index=str(fdb_index))
+                if count < 0:
+                    retval = count
+                    break
+                retval += count
+            if (
+                retval == 0
+                and not self._is_unsupported_branch('dot1qTpFdbPort')
+                and self._snmp_branch_exists('dot1qTpFdbPort')
+            ):
+                # the vlans have no addresses, no need to read the older mib
+                return True
         if retval < 0:
             # error!
             self.add_warning("Error getting 'Q-Bridge-EthernetAddresses' (dot1qTpFdbPort)")
             return False
         # If nothing found,check the older dot1d bridge mib
+        # Note: this is not indexed by vlan, so this is always a full read.
         if retval == 0:
             retval = self.get_snmp_branch('dot1dTpFdbPort', self._parse_mibs_dot1d_bridge_eth)
             if retval < 0:
                 self.add_warning("Error getting 'Bridge-EthernetAddresses' (dot1dTpFdbPort)")
                 return False
+            # an empty Q-Bridge table is only learned as not supported if the older mib has the addresses:
+            if retval > 0 and vlan_ids is None:
+                self._learn_capability('dot1qTpFdbPort', 0)
+        elif vlan_ids is None:
+            self._learn_capability('dot1qTpFdbPort', retval)
         return True
 
-    def _get_arp_data(self) -> bool:
+    def _get_fdb_indexes(self, vlan_ids: list) -> list:
+        """
+        Return the Q-Bridge forwarding database indexes (the first index of dot1qTpFdbPort) of these vlans.
+        If the forwarding database of a vlan is not known (see dot1tp_fdb_to_vlan_index),
+        the fdb index is the vlan id, see _parse_mibs_q_bridge_eth()
+        """
+        fdb_indexes = []
+        for vlan_id in vlan_ids:
+            found = [
+                fdb_index
+                for fdb_index, vlan_index in self.dot1tp_fdb_to_vlan_index.items()
+                if self.vlan_id_by_index.get(vlan_index, 0) == vlan_id
+            ]
+            fdb_indexes.extend(found if found else [vlan_id])
+        return sorted(set(fdb_indexes))
+
+    def _get_interface_vlan_ids(self, interface: Interface) -> list:
+        """
+        Return the ids of the vlans of an interface: the untagged vlan, the voice vlan and the tagged vlans.
+        """
+        vlan_ids = set(interface.vlans)
+        vlan_ids.update(vlan_id for vlan_id in (interface.untagged_vlan, interface.voice_vlan) if vlan_id > 0)
+        return sorted(vlan_ids)
+
+    def _get_vlan_if_indexes(self, vlan_ids: list) -> list:
+        """
+        Return the ifIndex of the layer 3 interfaces of these vlans, found by name, e.g. "Vlan10".
+        The arp table (ipNetToMediaPhysAddress) is indexed by these first.
+        """
+        if_indexes = []
+        for iface in self.interfaces.values():
+            match = _vlan_interface_name.match(iface.name)
+            if match and int(match.group(2)) in vlan_ids:
+                if_indexes.append(str(iface.index))
+        return if_indexes
+
+    def _snmp_branch_exists(self, branch_name: str) -> bool:
+        """
+        Return True if the device has any entries in this mib branch, using a single GETNEXT request.
+        """
+        start_oid = snmp_mib_variables[branch_name]
+        try:
+            item = self._snmp_session.get_next(start_oid)
+        except Exception as e:
+            dprint(f"   _snmp_branch_exists({branch_name}): Exception: {e.__class__.__name__}")
+            return False
+        oid = f"{item.oid}.{item.oid_index}" if item.oid_index else item.oid
+        return item.snmp_type not in ('ENDOFMIBVIEW', 'NOSUCHOBJECT', 'NOSUCHINSTANCE') and bool(
+            oid_in_branch(start_oid, oid)
+        )
+
+    def _get_arp_data(self, vlan_ids: list = None) -> bool:
         """
         Read the arp tables from both old style ipNetToMedia,
         and eventually, new style ipNetToPhysical
+        vlan_ids - if given, only read the arp entries of the layer 3 interfaces of these vlans,
+                   if these are found. See _get_vlan_if_indexes()
         Returns True on success, False on failure
         """
+        if vlan_ids:
+            if_indexes = self._get_vlan_if_indexes(vlan_ids)
+            for if_index in if_indexes:
+                retval = self.get_snmp_branch(
+                    'ipNetToMediaPhysAddress', self._parse_mibs_net_to_media, index=if_index
+                )
+                if retval < 0:
+                    self.add_warning("Error getting 'ARP-Table' (ipNetToMediaPhysAddress)")
+                    return False
+            if if_indexes:
+                return True
         retval = self.get_snmp_branch('ipNetToMediaPhysAddress', self._parse_mibs_net_to_media)
         if retval < 0:
             self.add_warning("Error getting 'ARP-Table' (ipNetToMediaPhysAddress)")
             return False
         return True
 
-    def _get_lldp_data(self) -> bool:
+    def _get_lldp_data(self, interface: Interface = None) -> bool:
         """
         Read parts of the LLDP mib for neighbors on interfaces
         Note that this needs to be called after _get_known_ethernet_addresses()
         as we need the Bridge-to-IfIndex mapping that is loaded there!
+        interface - if given, only read the neighbors heard on this Interface()
         Returns True on success, False on failure
         """
+        if interface is not None:
+            return self._get_interface_lldp_data(interface)
+
         # Probably don't need this part, already got most from MIB-2
         # retval = not self.get_snmp_branch(lldpLocPortTable, self._parse_mibs_lldp):
         #    return False
@@ -2461,41 +3528,12 @@ class SnmpConnector(Connector):
         # so we can start with a NeighborDevice() object attached to the proper device Interface().lldp{}
         # the value of "lldpRemPortId" also gives us the name of the remote device interface we are
         # connected to (see _parse_mibs_lldp() for more)
-        retval = self.get_snmp_branch('lldpRemPortId', self._parse_mibs_lldp)
-        if retval < 0:
-            self.add_warning("Error getting 'LLDP-Remote-Ports' (lldpRemPortId)")
+        # all the lldpRem* columns of a neighbor are read together in a single table walk.
+        counts = self.get_snmp_table(self.lldp_table_columns, self._parse_mibs_lldp)
+        if counts == -1:
+            self.add_warning(f"Error getting 'LLDP-Remote-Table' ({', '.join(self.lldp_table_columns)})")
             return False
-        if retval > 0:  # there are neighbors entries! Go get the details.
-            retval = self.get_snmp_branch('lldpRemPortIdSubType', self._parse_mibs_lldp)
-            if retval < 0:
-                self.add_warning("Error getting 'LLDP-Remote-Port-ID-Subtype' (lldpRemPortIdSubType)")
-                return False
-            retval = self.get_snmp_branch('lldpRemPortDesc', self._parse_mibs_lldp)
-            if retval < 0:
-                self.add_warning("Error getting 'LLDP-Remote-Port-Description' (lldpRemPortDesc)")
-                return False
-            retval = self.get_snmp_branch('lldpRemSysName', self._parse_mibs_lldp)
-            if retval < 0:
-                self.add_warning("Error getting 'LLDP-Remote-System-Name' (lldpRemSysName)")
-                return False
-            retval = self.get_snmp_branch('lldpRemSysDesc', self._parse_mibs_lldp)
-            if retval < 0:
-                self.add_warning("Error getting 'LLDP-Remote-System-Decription' (lldpRemSysDesc)")
-                return False
-            # get the enabled remote device capabilities
-            retval = self.get_snmp_branch('lldpRemSysCapEnabled', self._parse_mibs_lldp)
-            if retval < 0:
-                self.add_warning("Error getting 'LLDP-Remote-System-Capabilities' (lldpRemSysCapEnabled)")
-                return False
-            # and info about the remote chassis:
-            retval = self.get_snmp_branch('lldpRemChassisIdSubtype', self._parse_mibs_lldp)
-            if retval < 0:
-                self.add_warning("Error getting 'LLDP-Remote-Chassis-Type' (lldpRemChassisIdSubtype)")
-                return False
-            retval = self.get_snmp_branch('lldpRemChassisId', self._parse_mibs_lldp)
-            if retval < 0:
-                self.add_warning("Error getting 'LLDP-Remote-Chassis-Id' (lldpRemChassisId)")
-                return False
+        if counts.get('lldpRemPortId', 0) > 0:  # there are neighbors entries! Go get the details.
             # remote management info:
             retval = self.get_snmp_branch('lldpRemManAddrEntry', self._parse_mibs_lldp_management)
             if retval < 0:
@@ -2503,6 +3541,38 @@ class SnmpConnector(Connector):
                 return False
         return True
 
+    def _get_interface_lldp_data(self, interface: Interface) -> bool:
+        """
+        Read the LLDP neighbors heard on a single interface.
+        The LLDP remote tables are indexed by <time-mark>.<local-port>.<index>, so there is no sub-tree
+        for a single port. We walk the lldpRemPortId column to find the neighbors on this interface,
+        and then get the other columns and the management addresses of these neighbors only.
+        Returns True on success, False on failure
+        """
+        retval = self.get_snmp_branch('lldpRemPortId', self._parse_mibs_lldp)
+        if retval < 0:
+            self.add_warning("Error getting 'LLDP-Remote-Port-Id' (lldpRemPortId)")
+            return False
+        for iface in self.interfaces.values():
+            if iface.key != interface.key:
+                iface.lldp = {}
+        for lldp_index in list(interface.lldp.keys()):
+            oids = [
+                f"{snmp_mib_variables[branch_name]}.{lldp_index}"
+                for branch_name in self.lldp_table_columns
+                if branch_name != 'lldpRemPortId'
+            ]
+            if self.get_multiple(oids, self._parse_mibs_lldp) < 0:
+                self.add_warning(f"Error getting 'LLDP-Remote-Table' for {interface.name}")
+                return False
+            retval = self.get_snmp_branch(
+                'lldpRemManAddrIfSubtype', self._parse_mibs_lldp_management, index=lldp_index
+            )
+            if retval < 0:
+                self.add_warning("Error getting 'LLDP-Remote-Management-Info' (lldpRemManAddrIfSubtype)")
+                return False
+        return True
+
     def _get_lacp_data(self) -> bool:
         """
         Read the IEEE LACP mib, single mib counter gives us enough to identify
@@ -2712,7 +3782,7 @@ class SnmpConnector(Connector):
         (error_status, snmpval) = self.get(f"{dot1qVlanCurrentEgressPorts}.0.{old_vlan_id}")
         dprint("Get NEW VLAN Current Egress Ports")
         (error_status, snmpval) = self.get(f"{dot1qVlanCurrentEgressPorts}.0.{new_vlan_id}")
-        interface.untagged_vlan = new_vlan_id
+        super().set_interface_untagged_vlan(interface=interface, new_vlan_id=new_vlan_id)
         return True
 
     def vlan_create(self, vlan_id: int, vlan_name: str) -> bool:
@@ -2786,6 +3856,50 @@ class SnmpConnector(Connector):
 # --- End of SnmpConnector() ---
 
 
+def snmp_settings_key(switch: Switch) -> tuple:
+    """
+    Get a tuple with all the settings used to talk snmp to this switch, i.e. address and snmp profile.
+    This is used as the key to cache snmp sessions and objects, so a changed device address or snmp profile
+    will not re-use any objects with the old settings.
+    """
+    snmp_profile = switch.snmp_profile
+    if not snmp_profile:
+        return (switch.id, switch.primary_ip4)
+    return (
+        switch.id,
+        switch.primary_ip4,
+        snmp_profile.id,
+        snmp_profile.version,
+        snmp_profile.udp_port,
+        snmp_profile.community,
+        snmp_profile.sec_level,
+        snmp_profile.username,
+        snmp_profile.auth_protocol,
+        snmp_profile.passphrase,
+        snmp_profile.priv_protocol,
+        snmp_profile.priv_passphrase,
+    )
+
+
+def get_walk_limits(max_rows: int = 0, max_time: float = 0) -> tuple[int, float]:
+    """
+    Get the limits of a mib branch walk: the maximum number of entries, and the maximum seconds.
+    If not given, use settings.SNMP_WALK_MAX_ROWS and settings.SNMP_WALK_MAX_TIME, where 0 means no limit.
+    """
+    max_rows = max_rows or settings.SNMP_WALK_MAX_ROWS or sys.maxsize
+    max_time = max_time or settings.SNMP_WALK_MAX_TIME or math.inf
+    return (max_rows, max_time)
+
+
+def is_response_too_big(e: Exception) -> bool:
+    """
+    Check if an exception from the snmp library is caused by a get-bulk response that is too large for the device,
+    i.e. a 'tooBig' error.
+    """
+    message = str(e).lower()
+    return 'toobig' in message or 'too big' in message or 'too large' in message
+
+
 def oid_in_branch(mib_branch: str, oid: str) -> bool | str:
     """
     Check if a given OID is in the branch, if so, return the 'ending' portion after the mib_branch
@@ -2796,11 +3910,11 @@ def oid_in_branch(mib_branch: str, oid: str) -> bool | str:
     if not isinstance(oid, str):
         dprint("Error: oid not string value")
         return False
-    mib_branch += "."  # make sure the OID branch terminates with a . for the next series of data
-    oid_len = len(oid)
+    # make sure the OID branch terminates with a . for the next series of data,
+    # without creating new strings for the (many) OIDs that are not in this branch:
     branch_len = len(mib_branch)
-    if oid_len > branch_len and oid[:branch_len] == mib_branch:  # need to check for trailing .
-        return oid[branch_len:]  # get data past the "root" oid + the period (+1)
+    if len(oid) > branch_len + 1 and oid.startswith(mib_branch) and oid[branch_len] == '.':
+        return oid[branch_len + 1 :]  # get data past the "root" oid + the period (+1)
     return False
 
 
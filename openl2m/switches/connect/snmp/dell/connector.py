@@ -70,6 +70,7 @@ class SnmpConnectorDell(SnmpConnector):
                     return False
             # update interface() for view and caching
             interface.untagged_vlan = int(new_vlan_id)
+            self.set_interface_changed(interface)
         return True
 
     def save_running_config(self) -> bool:
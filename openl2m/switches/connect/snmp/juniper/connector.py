@@ -85,7 +85,6 @@ class SnmpConnectorJuniper(SnmpConnector):
                         self.add_warning(warning)
                         # log my activity
                         log = Log(
-                            user=self.request.user,
                             group=self.group,
                             switch=self.switch,
                             type=LOG_TYPE_ERROR,
@@ -93,9 +92,26 @@ class SnmpConnectorJuniper(SnmpConnector):
                             action=LOG_PORT_POE_FAULT,
                             description=warning,
                         )
+                        if self.request:
+                            log.user = self.request.user
                         log.save()
                     break
 
+    def _get_basic_info_walks(self) -> dict:
+        """
+        Add the Junos L2ALD vlan branches to the list of branches read concurrently for the basic info.
+        """
+        walks = super()._get_basic_info_walks()
+        walks.update(
+            {
+                'jnxL2aldVlanTag': (),
+                'jnxL2aldVlanName': ('jnxL2aldVlanTag',),
+                'jnxL2aldVlanType': ('jnxL2aldVlanTag',),
+                'jnxL2aldVlanFdbId': ('jnxL2aldVlanTag',),
+            }
+        )
+        return walks
+
     def _get_vlan_data(self) -> int:
         """
         Implement an override of vlan parsing to read Junos EX specific MIB
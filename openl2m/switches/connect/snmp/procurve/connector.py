@@ -57,6 +57,19 @@ class SnmpConnectorProcurve(SnmpConnector):
         # some capabilities we cannot do:
         self.can_save_config = False  # not needed on ProCurve, it has auto-save!
 
+    def _get_basic_info_walks(self) -> dict:
+        """
+        Add the HP specific branches to the list of branches read concurrently for the basic info.
+        """
+        walks = super()._get_basic_info_walks()
+        walks.update(
+            {
+                'hpnicfIfLinkMode': (),
+                'hpicfPoePethPsePortPower': ('pethMainPseEntry',),
+            }
+        )
+        return walks
+
     def _get_interface_data(self) -> bool:
         """
         Implement an override of the interface parsing routine,
@@ -198,7 +211,6 @@ class SnmpConnectorProcurve(SnmpConnector):
                     self.add_warning(warning)
                     # log my activity
                     log = Log(
-                        user=self.request.user,
                         group=self.group,
                         switch=self.switch,
                         type=LOG_TYPE_ERROR,
@@ -206,6 +218,8 @@ class SnmpConnectorProcurve(SnmpConnector):
                         action=LOG_PORT_POE_FAULT,
                         description=warning,
                     )
+                    if self.request:
+                        log.user = self.request.user
                     log.save()
             else:
                 # should not happen!
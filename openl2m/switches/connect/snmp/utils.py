@@ -11,7 +11,10 @@
 # more details.  You should have received a copy of the GNU General Public
 # License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
 #
+from collections import OrderedDict
 import netaddr
+import threading
+import time
 
 from django.conf import settings
 from switches.utils import dprint
@@ -52,3 +55,138 @@ def bytes_ethernet_to_string(bytes: str) -> str:
         eth.dialect = settings.MAC_DIALECT
         return str(eth)
     return ''
+
+
+class OidDispatcher:
+    """
+    A prefix trie of mib branches (OIDs), to find the handler for an OID returned from a device
+    with a single lookup, instead of comparing the OID to every known branch.
+    Each node is a dictionary keyed by the next OID number (as a string). The handler
+    for a branch is stored under the None key of the node where that branch ends.
+    """
+
+    def __init__(self):
+        self._root = {}
+        self.count = 0  # number of registered branches
+
+    def register(self, mib_branch: str, handler) -> None:
+        """
+        Register a handler for a mib branch.
+        mib_branch - the OID, with starting DOT (as easysnmp returns OIDs), but NOT trailing dot
+        handler - anything, typically a method name or a function.
+        If the branch is already registered, the handler is replaced.
+        """
+        node = self._root
+        for part in mib_branch.split('.'):
+            node = node.setdefault(part, {})
+        if None not in node:
+            self.count += 1
+        node[None] = handler
+
+    def lookup(self, oid: str) -> tuple:
+        """
+        Find the handler for the most specific registered branch that contains this OID.
+        Similar to oid_in_branch(), the OID needs to have data past the branch.
+        Returns a tuple (handler, sub_oid), where sub_oid is the 'ending' portion after the mib branch,
+        e.g. the ifIndex, or vlan_id, or such. If not found, returns (None, '')
+        """
+        node = self._root
+        handler = None
+        sub_oid = ''
+        position = 0  # string position of the end of the current part
+        parts = oid.split('.')
+        last_part = len(parts) - 1
+        for index, part in enumerate(parts):
+            node = node.get(part, None)
+            if node is None:
+                break
+            position += len(part) + 1
+            if None in node and index < last_part:
+                handler = node[None]
+                sub_oid = oid[position:]
+        return (handler, sub_oid)
+
+
+class SnmpSessionPool:
+    """
+    A per-process pool of idle snmp session objects, so they can be re-used across HTTP requests.
+    For SNMPv3, this avoids the engine-id discovery and key localization every time a new session is created.
+    Sessions are not thread-safe, so a session is "borrowed" by one user at a time, and "released" when done.
+    Idle sessions are discarded after 'max_idle' seconds, and at most 'max_size' idle sessions are kept.
+
+    The key identifies the device and all session settings (e.g. a tuple of address, credentials and context),
+    so changing an snmp profile automatically starts using new sessions.
+    """
+
+    def __init__(self, max_size: int, max_idle: int):
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle = OrderedDict()  # key -> list of (release time, session), least recently released key first
+        self._count = 0  # number of idle sessions
+
+    def borrow(self, key: tuple, factory):
+        """
+        Get an idle session for this key from the pool, or if none is available, create one by calling factory().
+        Returns the session, or whatever factory() returns if it could not create one.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            sessions = self._idle.get(key, None)
+            if sessions:
+                (released, session) = sessions.pop()
+                self._count -= 1
+                if not sessions:
+                    del self._idle[key]
+                dprint(f"SnmpSessionPool: re-using session, idle for {now - released:.1f} seconds")
+                return session
+        dprint("SnmpSessionPool: creating new session")
+        return factory()
+
+    def release(self, key: tuple, session) -> None:
+        """
+        Return a borrowed session to the pool, so it can be used again.
+        If the pool is full, the least recently used session is discarded.
+        """
+        if not session or self.max_size < 1:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._idle.setdefault(key, []).append((now, session))
+            self._idle.move_to_end(key)
+            self._count += 1
+            self._expire(now)
+            while self._count > self.max_size:
+                oldest_key = next(iter(self._idle))
+                sessions = self._idle[oldest_key]
+                sessions.pop(0)
+                self._count -= 1
+                if not sessions:
+                    del self._idle[oldest_key]
+
+    def clear(self) -> None:
+        """
+        Discard all idle sessions.
+        """
+        with self._lock:
+            self._idle.clear()
+            self._count = 0
+
+    def _expire(self, now: float) -> None:
+        """
+        Discard all sessions that are idle for too long. Needs to be called with the lock held!
+        """
+        for key in list(self._idle.keys()):
+            sessions = [entry for entry in self._idle[key] if now - entry[0] < self.max_idle]
+            self._count -= len(self._idle[key]) - len(sessions)
+            if sessions:
+                self._idle[key] = sessions
+            else:
+                del self._idle[key]
+
+
+# the idle snmp sessions of this (worker) process, see SnmpConnector._set_snmp_session()
+snmp_session_pool = SnmpSessionPool(
+    max_size=settings.SNMP_SESSION_POOL_SIZE, max_idle=settings.SNMP_SESSION_POOL_IDLE_TIME
+)
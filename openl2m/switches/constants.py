@@ -167,6 +167,7 @@ LOG_VIEW_TASK_DETAILS = 9
 LOG_VIEW_SWITCH_SEARCH = 10
 LOG_VIEW_DOWNLOAD_ARP_LLDP = 11
 LOG_VIEW_DOWNLOAD_INTERFACES = 12
+LOG_VIEW_LOCATION_SEARCH = 13
 LOG_LOGIN = 90
 LOG_LOGOUT = 91
 LOG_LOGOUT_INACTIVE = 92
@@ -249,6 +250,7 @@ LOG_ACTION_CHOICES = [
     [LOG_VIEW_SWITCH_SEARCH, 'Searching for Switch Name'],
     [LOG_VIEW_DOWNLOAD_ARP_LLDP, 'Download Eth/Arp/LLDP'],
     [LOG_VIEW_DOWNLOAD_INTERFACES, 'Download Interfaces'],
+    [LOG_VIEW_LOCATION_SEARCH, 'Searching for Ethernet or IP Location'],
     [LOG_LOGIN, 'Login'],
     [LOG_LOGOUT, 'Logout'],
     [LOG_LOGOUT_INACTIVE, 'Inactivity Logout'],
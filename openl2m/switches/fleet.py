@@ -0,0 +1,236 @@
+#
+# This file is part of Open Layer 2 Management (OpenL2M).
+#
+# OpenL2M is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.  You should have received a copy of the GNU General Public
+# License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Fleet operations: the same bulk edit on many devices.
+A fleet operation is a "batch" of bulk edit Task()s, one per device, that are run by the task worker
+("manage.py run_tasks"). The worker runs up to settings.TASK_WORKERS tasks at the same time,
+and one task per device at a time. The interfaces on each device are selected by name when the task runs.
+See the "fleet_edit" command, and the fleet API endpoints.
+"""
+import re
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Count, Prefetch, Q, Sum
+
+from switches.constants import (
+    BULKEDIT_ALIAS_TYPE_CHOICES,
+    BULKEDIT_ALIAS_TYPE_REPLACE,
+    BULKEDIT_INTERFACE_CHOICES,
+    BULKEDIT_POE_CHOICES,
+    BULKEDIT_POE_NONE,
+    INTERFACE_STATUS_NONE,
+    SWITCH_STATUS_ACTIVE,
+    TASK_STATUS_CHOICES,
+    TASK_TYPE_BULKEDIT,
+)
+from switches.models import Switch, SwitchGroup, Task
+from switches.utils import dprint
+from users.utils import user_can_bulkedit
+
+
+def get_fleet_targets(user: User, group: str = '', switches: list = None) -> tuple[list, list]:
+    """
+    Find the devices of a fleet operation that the user can bulk edit.
+
+    Params:
+        user: the User() running the operation.
+        group (str): the name or id of a SwitchGroup(), to select all active devices in the group.
+        switches (list): the names or ids of devices. If group is also given, only these devices in the group.
+
+    Returns:
+        targets: list of (SwitchGroup(), Switch()) tuples.
+        errors: list of strings with the reasons requested devices are not included.
+    """
+    if user.is_superuser or user.is_staff:
+        groups = SwitchGroup.objects.all()
+    else:
+        groups = user.switchgroups.all()
+    if group:
+        group_filter = Q(name=group)
+        if str(group).isdigit():
+            group_filter |= Q(id=int(group))
+        groups = groups.filter(group_filter)
+    groups = groups.order_by("name").prefetch_related(
+        Prefetch("switches", queryset=Switch.objects.filter(status=SWITCH_STATUS_ACTIVE).order_by("name"))
+    )
+
+    errors = []
+    wanted = set(str(switch) for switch in switches) if switches else None
+    targets = {}  # switch id -> (group, switch), a device in several groups is changed once.
+    for switch_group in groups:
+        for switch in switch_group.switches.all():
+            if switch.id in targets:
+                continue
+            if wanted is not None and switch.name not in wanted and str(switch.id) not in wanted:
+                continue
+            if not user_can_bulkedit(user, switch_group, switch):
+                errors.append(f"{switch.name}: bulk edit is not allowed")
+                continue
+            targets[switch.id] = (switch_group, switch)
+    if group and not groups:
+        errors.append(f"Group '{group}' not found, or access denied")
+    if wanted is not None:
+        found = set(switch.name for switch_group, switch in targets.values())
+        found.update(str(switch_id) for switch_id in targets.keys())
+        for name in sorted(wanted - found):
+            if not any(error.startswith(f"{name}:") for error in errors):
+                errors.append(f"{name}: device not found, not active, or access denied")
+    return list(targets.values()), errors
+
+
+def check_fleet_arguments(arguments: dict) -> list:
+    """
+    Check the change specification of a fleet operation.
+    The arguments are the same as a bulk edit (see views.bulkedit_processor()), with the interfaces
+    selected by 'interface_regex' (a regular expression matched to the interface names)
+    or 'interface_names' (a list of interface names).
+
+    Returns:
+        a list of errors, empty if the arguments are valid.
+    """
+    errors = []
+    if bool(arguments.get('interface_regex', '')) == bool(arguments.get('interface_names', [])):
+        errors.append("Select the interfaces with either an interface name regex, or a list of interface names!")
+    if arguments.get('interface_regex', ''):
+        try:
+            re.compile(arguments['interface_regex'])
+        except re.error as err:
+            errors.append(f"Invalid interface name regex: {err}")
+    for name, choices in (
+        ('interface_change', BULKEDIT_INTERFACE_CHOICES),
+        ('poe_choice', BULKEDIT_POE_CHOICES),
+        ('new_description_type', BULKEDIT_ALIAS_TYPE_CHOICES),
+    ):
+        if arguments[name] not in [value for value, text in choices]:
+            errors.append(f"Invalid value for {name}: {arguments[name]}")
+    new_description = arguments['new_description']
+    if (
+        new_description
+        and arguments['new_description_type'] == BULKEDIT_ALIAS_TYPE_REPLACE
+        and settings.IFACE_ALIAS_NOT_ALLOW_REGEX
+        and re.match(settings.IFACE_ALIAS_NOT_ALLOW_REGEX, new_description)
+    ):
+        errors.append(f"The description is not allowed: {new_description}")
+    if (
+        arguments['interface_change'] == INTERFACE_STATUS_NONE
+        and arguments['poe_choice'] == BULKEDIT_POE_NONE
+        and arguments['new_pvid'] < 0
+        and not new_description
+    ):
+        errors.append("Please select at least 1 thing to change!")
+    return errors
+
+
+def get_fleet_arguments(
+    interface_regex: str = '',
+    interface_names: list = None,
+    interface_change: int = INTERFACE_STATUS_NONE,
+    poe_choice: int = BULKEDIT_POE_NONE,
+    new_pvid: int = -1,
+    new_description: str = '',
+    new_description_type: int = BULKEDIT_ALIAS_TYPE_REPLACE,
+) -> dict:
+    """
+    Return the task arguments of a fleet operation, see check_fleet_arguments()
+    """
+    return {
+        'interface_regex': interface_regex,
+        'interface_names': list(interface_names or []),
+        'interface_change': interface_change,
+        'poe_choice': poe_choice,
+        'new_pvid': new_pvid,
+        'new_description': new_description,
+        'new_description_type': new_description_type,
+    }
+
+
+def create_fleet_tasks(user: User, targets: list, arguments: dict, ip_address: str = '0.0.0.0') -> str:
+    """
+    Queue a bulk edit task on each target device, see get_fleet_targets() and check_fleet_arguments()
+
+    Returns:
+        (str) the batch id of the tasks, see get_fleet_results()
+    """
+    batch = uuid.uuid4().hex
+    dprint(f"create_fleet_tasks() batch {batch} with {len(targets)} devices")
+    Task.objects.bulk_create(
+        [
+            Task(
+                type=TASK_TYPE_BULKEDIT,
+                batch=batch,
+                user=user,
+                group=group,
+                switch=switch,
+                ip_address=ip_address,
+                description=f"Fleet Edit {batch[:8]}",
+                arguments=arguments,
+            )
+            for group, switch in targets
+        ]
+    )
+    return batch
+
+
+def get_fleet_tasks(user: User, batch: str):
+    """
+    Get the tasks of a fleet operation, if the user can see them: their own tasks, or any task for staff.
+    """
+    tasks = Task.objects.filter(batch=batch)
+    if not (user.is_superuser or user.is_staff):
+        tasks = tasks.filter(user=user)
+    return tasks
+
+
+def get_fleet_results(user: User, batch: str, details: bool = True) -> dict | None:
+    """
+    Get the aggregated results of a fleet operation.
+
+    Params:
+        user: the User() asking, see get_fleet_tasks()
+        batch (str): the batch id, see create_fleet_tasks()
+        details (bool): if True, include the status and results of each device.
+
+    Returns:
+        dict with the number of devices per task status, the total counts, and the devices;
+        or None if the batch is not found.
+    """
+    tasks = get_fleet_tasks(user=user, batch=batch)
+    totals = tasks.aggregate(
+        devices=Count('id'),
+        interfaces=Sum('interface_count'),
+        interfaces_done=Sum('interfaces_done'),
+        success_count=Sum('success_count'),
+        error_count=Sum('error_count'),
+    )
+    if not totals['devices']:
+        return None
+    status_names = dict(TASK_STATUS_CHOICES)
+    statuses = {
+        status_names[row['status']]: row['count']
+        for row in tasks.values('status').annotate(count=Count('id')).order_by('status')
+    }
+    results = {
+        'batch': batch,
+        'finished': all(task.is_finished() for task in tasks.only('status')),
+        'status': statuses,
+        'totals': {name: value or 0 for name, value in totals.items()},
+    }
+    if details:
+        results['devices'] = [
+            dict(task.as_dict(), switch=task.switch.name, switch_id=task.switch_id, group_id=task.group_id)
+            for task in tasks.select_related('switch').order_by('switch__name')
+        ]
+    return results
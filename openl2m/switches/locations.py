@@ -0,0 +1,211 @@
+#
+# This file is part of Open Layer 2 Management (OpenL2M).
+#
+# OpenL2M is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.  You should have received a copy of the GNU General Public
+# License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+The ethernet location index: where is an ethernet (or IP) address connected to the network?
+The poller ("manage.py poll_switches --locations") reads the client data (ethernet, arp and lldp tables)
+of each device, and stores the ethernet addresses heard on edge interfaces in EthernetLocation().
+Uplinks and trunks are not edge interfaces, so a search points at the interface the client is connected to.
+"""
+from datetime import timedelta
+import ipaddress
+import re
+
+import netaddr
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from switches.connect.classes import Interface
+from switches.connect.constants import (
+    IF_TYPE_ETHERNET,
+    LACP_IF_TYPE_NONE,
+    LLDP_CAPABILITIES_BRIDGE,
+    LLDP_CAPABILITIES_PHONE,
+    LLDP_CAPABILITIES_ROUTER,
+    LLDP_CAPABILITIES_WLAN,
+)
+from switches.models import EthernetLocation
+from switches.utils import dprint
+
+# the number of rows written or read per database query:
+_BATCH_SIZE = 1000
+
+
+def is_edge_interface(iface: Interface) -> bool:
+    """
+    Return True if the interface connects clients, i.e. it is not an uplink or trunk:
+    an untagged ethernet interface, that is not part of an LACP aggregate,
+    and without an LLDP neighbor that is a switch or router (phones and access points are clients).
+    """
+    if iface.type != IF_TYPE_ETHERNET or iface.is_routed or iface.is_tagged:
+        return False
+    if iface.lacp_type != LACP_IF_TYPE_NONE:
+        return False
+    for neighbor in iface.lldp.values():
+        if neighbor.capabilities & (LLDP_CAPABILITIES_BRIDGE | LLDP_CAPABILITIES_ROUTER) and not (
+            neighbor.capabilities & (LLDP_CAPABILITIES_PHONE | LLDP_CAPABILITIES_WLAN)
+        ):
+            return False
+    if settings.LOCATIONS_MAX_PER_INTERFACE and len(iface.eth) > settings.LOCATIONS_MAX_PER_INTERFACE:
+        # likely an unmanaged switch, or a device we do not see with lldp:
+        return False
+    return True
+
+
+def update_ethernet_locations(connection) -> int:
+    """
+    Store the ethernet addresses heard on the edge interfaces of a device in the location index.
+    The client data needs to be read, see Connector().get_client_data()
+
+    The IP addresses from the arp table of this device, for ethernet addresses that are not on an edge
+    interface (e.g. on a router, heard on the uplinks), are added to the locations found on other devices.
+
+    Params:
+        connection: the Connector() object of the device.
+
+    Returns:
+        (int) the number of ethernet addresses stored.
+    """
+    dprint(f"update_ethernet_locations() for {connection.switch.name}")
+    now = timezone.now()
+    locations = {}  # (ethernet, vlan) -> EthernetLocation(), an address is stored once per vlan.
+    remote_ip = {}  # ethernet -> IP address, from the arp table, for addresses not on edge interfaces.
+    for iface in connection.interfaces.values():
+        edge = is_edge_interface(iface)
+        for eth in iface.eth.values():
+            ethernet = int(eth)
+            if not edge:
+                if eth.address_ip4:
+                    remote_ip[ethernet] = eth.address_ip4
+                continue
+            vlan_id = max(eth.vlan_id, 0)
+            locations[(ethernet, vlan_id)] = EthernetLocation(
+                ethernet=ethernet,
+                ip_address=eth.address_ip4 or None,
+                switch=connection.switch,
+                if_name=iface.name[:64],
+                vlan_id=vlan_id,
+                vendor=eth.vendor[:100],
+                last_seen=now,
+            )
+
+    with transaction.atomic():
+        # new addresses are created, known addresses get the new interface, ip and time.
+        # The first_seen time of known addresses does not change:
+        EthernetLocation.objects.bulk_create(
+            locations.values(),
+            batch_size=_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['switch', 'ethernet', 'vlan_id'],
+            update_fields=['ip_address', 'if_name', 'vendor', 'last_seen'],
+        )
+        # we know the ip of locations without an ip from the arp table of another device:
+        local = set(ethernet for ethernet, vlan_id in locations.keys())
+        remote_ip = {ethernet: ip for ethernet, ip in remote_ip.items() if ethernet not in local}
+        ethernets = list(remote_ip.keys())
+        for start in range(0, len(ethernets), _BATCH_SIZE):
+            updates = []
+            for location in EthernetLocation.objects.filter(
+                ethernet__in=ethernets[start : start + _BATCH_SIZE]
+            ).only('id', 'ethernet', 'ip_address'):
+                if location.ip_address != remote_ip[location.ethernet]:
+                    location.ip_address = remote_ip[location.ethernet]
+                    updates.append(location)
+            EthernetLocation.objects.bulk_update(updates, ['ip_address'], batch_size=_BATCH_SIZE)
+    return len(locations)
+
+
+def expire_ethernet_locations() -> int:
+    """
+    Remove the locations not seen in the last settings.LOCATIONS_MAX_AGE days.
+    Returns the number of locations removed.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.LOCATIONS_MAX_AGE)
+    (count, deleted) = EthernetLocation.objects.filter(last_seen__lt=cutoff).delete()
+    return count
+
+
+def parse_location_search(search: str) -> tuple[int, int, str]:
+    """
+    Parse a location search: an ethernet address in any of the common formats (e.g. 'aa:bb:cc:dd:ee:ff',
+    'aabb.ccdd.eeff', 'AA-BB-CC-DD-EE-FF'), the first 3 bytes (i.e. the vendor OUI) of an ethernet address,
+    or an IP address.
+
+    Returns:
+        (first, last, ip): the range of ethernet addresses (as integers) to find, or 0, 0 and the IP address.
+        If the search is not valid, returns (0, 0, '').
+    """
+    search = search.strip()
+    try:
+        return (0, 0, str(ipaddress.ip_address(search)))
+    except ValueError:
+        pass
+    digits = re.sub(r'[\s:.\-]', '', search)
+    if not re.fullmatch(r'[0-9a-fA-F]{6}|[0-9a-fA-F]{12}', digits):
+        return (0, 0, '')
+    if len(digits) == 12:
+        ethernet = int(digits, 16)
+        return (ethernet, ethernet, '')
+    first = int(digits, 16) << 24
+    return (first, first + 0xFFFFFF, '')
+
+
+def find_ethernet_locations(search: str, groups: dict) -> list | None:
+    """
+    Find the locations of an ethernet or IP address, on the devices the user has access to.
+
+    Params:
+        search (str): the ethernet or IP address, see parse_location_search()
+        groups (dict): the groups and devices of the user, as returned by permissions.get_my_device_groups()
+
+    Returns:
+        list of dicts, the most recently seen first, or None if the search is not valid.
+    """
+    dprint(f"find_ethernet_locations() for '{search}'")
+    (first, last, ip) = parse_location_search(search)
+    if not ip and not last:
+        return None
+    # the devices the user has access to, and the first group it is in, for the device url:
+    devices = {}
+    for group_id, group in groups.items():
+        for switch_id in group['members'].keys():
+            devices.setdefault(int(switch_id), int(group_id))
+    if ip:
+        locations = EthernetLocation.objects.filter(ip_address=ip)
+    else:
+        locations = EthernetLocation.objects.filter(ethernet__gte=first, ethernet__lte=last)
+    locations = locations.filter(switch_id__in=devices.keys()).select_related('switch')
+    return [
+        {
+            'ethernet': format_ethernet(location.ethernet),
+            'vendor': location.vendor,
+            'ip_address': location.ip_address or '',
+            'vlan_id': location.vlan_id,
+            'interface': location.if_name,
+            'switch': location.switch.name,
+            'switch_id': location.switch_id,
+            'group_id': devices[location.switch_id],
+            'first_seen': location.first_seen,
+            'last_seen': location.last_seen,
+        }
+        for location in locations.order_by('-last_seen')[: settings.LOCATIONS_MAX_RESULTS]
+    ]
+
+
+def format_ethernet(ethernet: int) -> str:
+    """
+    Return the ethernet address integer as a string, in the format of settings.MAC_DIALECT
+    """
+    return str(netaddr.EUI(ethernet, dialect=settings.MAC_DIALECT))
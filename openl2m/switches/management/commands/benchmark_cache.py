@@ -0,0 +1,145 @@
+#
+# This file is part of Open Layer 2 Management (OpenL2M).
+#
+# OpenL2M is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.  You should have received a copy of the GNU General Public
+# License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Custom command line commands, see also:
+#    https://docs.djangoproject.com/en/2.2/howto/custom-management-commands/
+import time
+
+import jsonpickle
+
+from django.core.management.base import BaseCommand
+
+from switches.connect.classes import Interface, Vlan, PoePort, PoePSE, NeighborDevice, StackMember
+from switches.connect.constants import IF_TYPE_ETHERNET, POE_PORT_ADMIN_ENABLED
+import switches.connect.serializer as serializer
+
+
+def build_device_data(interface_count: int, vlan_count: int, eth_per_interface: int) -> dict:
+    """
+    Build the cachable attributes of a Connector() for a simulated device.
+    """
+    vlans = {}
+    for vlan_id in range(1, vlan_count + 1):
+        vlan = Vlan(id=vlan_id, index=vlan_id, name=f"Vlan {vlan_id}")
+        vlan.current_egress_portlist.from_byte_count((interface_count + 7) // 8)
+        vlans[vlan_id] = vlan
+
+    interfaces = {}
+    for index in range(1, interface_count + 1):
+        iface = Interface(key=str(index))
+        iface.name = f"GigabitEthernet{index // 48 + 1}/0/{index % 48 + 1}"
+        iface.description = f"Room {index} wall jack"
+        iface.type = IF_TYPE_ETHERNET
+        iface.admin_status = True
+        iface.oper_status = bool(index % 3)
+        iface.speed = 1000
+        iface.untagged_vlan = index % vlan_count + 1
+        iface.manageable = True
+        iface.poe_entry = PoePort(index=f"1.{index}", admin_status=POE_PORT_ADMIN_ENABLED)
+        if index % 48 == 0:
+            # an uplink, with tagged vlans and a neighbor:
+            iface.is_tagged = True
+            iface.vlans = list(vlans.keys())
+            neighbor = NeighborDevice(lldp_index=f"0.{index}.1")
+            neighbor.sys_name = f"switch-{index}"
+            neighbor.port_name = "Te1/1/1"
+            iface.lldp[neighbor.index] = neighbor
+        for count in range(eth_per_interface):
+            eth = iface.add_learned_ethernet_address(
+                f"00:11:{index // 256:02x}:{index % 256:02x}:00:{count:02x}", vlan_id=iface.untagged_vlan
+            )
+            eth.set_ip4_address(f"10.{index // 256}.{index % 256}.{count + 1}")
+        interfaces[iface.key] = iface
+
+    stack_members = {1: StackMember(id=1, type=3)}
+    pse = PoePSE(index=1)
+    pse.max_power = 740
+    return {
+        'hostname': 'benchmark-switch',
+        'interfaces': interfaces,
+        'vlans': vlans,
+        'vlan_count': vlan_count,
+        'poe_pse_devices': {1: pse},
+        'stack_members': stack_members,
+        'more_info': {'System': {'Vendor ID': 'Benchmark', 'Read Time': '2024-03-15 10:00:00'}},
+        'timing': {'Total': (interface_count, 1.5)},
+        'warnings': [],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the device cache serializer against jsonpickle'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interfaces', type=int, default=500, help='the number of interfaces (default 500)')
+        parser.add_argument('--vlans', type=int, default=50, help='the number of vlans (default 50)')
+        parser.add_argument(
+            '--ethernet', type=int, default=2, help='the number of ethernet addresses per interface (default 2)'
+        )
+        parser.add_argument('--rounds', type=int, default=5, help='the number of rounds, best is shown (default 5)')
+
+    def handle(self, *args, **options):
+        data = build_device_data(
+            interface_count=options['interfaces'], vlan_count=options['vlans'], eth_per_interface=options['ethernet']
+        )
+        self.stdout.write(
+            f"Device with {options['interfaces']} interfaces, {options['vlans']} vlans, "
+            f"{options['interfaces'] * options['ethernet']} ethernet addresses, best of {options['rounds']} rounds:"
+        )
+        self.stdout.write(f"{'Method':<28} {'Encode (ms)':>12} {'Decode (ms)':>12} {'Size (bytes)':>14}")
+
+        # jsonpickle, per attribute, as Connector().save_cache() used to do:
+        def jsonpickle_dumps(value):
+            return {name: jsonpickle.encode(item, keys=True) for name, item in value.items()}
+
+        def jsonpickle_loads(value):
+            return {name: jsonpickle.decode(item, keys=True) for name, item in value.items()}
+
+        def jsonpickle_size(value):
+            return sum(len(item) for item in value.values())
+
+        self.benchmark('jsonpickle', jsonpickle_dumps, jsonpickle_loads, jsonpickle_size, data, options['rounds'])
+
+        methods = [('serializer json', False, False), ('serializer json + zlib', True, False)]
+        if serializer.msgpack:
+            methods.append(('serializer msgpack', False, True))
+            methods.append(('serializer msgpack + zlib', True, True))
+        else:
+            self.stdout.write(self.style.WARNING("Note: msgpack is not installed, msgpack is not tested."))
+        for name, compress, use_msgpack in methods:
+            self.benchmark(
+                name,
+                lambda value: serializer.dumps(value, compress=compress, use_msgpack=use_msgpack),
+                serializer.loads,
+                len,
+                data,
+                options['rounds'],
+            )
+
+    def benchmark(self, name: str, dumps, loads, size, data: dict, rounds: int):
+        """
+        Time the best of 'rounds' of dumps() and loads(), and print the results.
+        """
+        encode_time = decode_time = None
+        for _ in range(rounds):
+            start_time = time.perf_counter()
+            encoded = dumps(data)
+            middle_time = time.perf_counter()
+            loads(encoded)
+            stop_time = time.perf_counter()
+            if encode_time is None or middle_time - start_time < encode_time:
+                encode_time = middle_time - start_time
+            if decode_time is None or stop_time - middle_time < decode_time:
+                decode_time = stop_time - middle_time
+        self.stdout.write(f"{name:<28} {encode_time * 1000:>12.1f} {decode_time * 1000:>12.1f} {size(encoded):>14}")
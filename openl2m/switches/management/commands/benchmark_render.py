@@ -0,0 +1,116 @@
+#
+# This file is part of Open Layer 2 Management (OpenL2M).
+#
+# OpenL2M is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.  You should have received a copy of the GNU General Public
+# License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Custom command line commands, see also:
+#    https://docs.djangoproject.com/en/2.2/howto/custom-management-commands/
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test import RequestFactory, override_settings
+
+from switches.connect.connector import Connector
+from switches.management.commands.benchmark_cache import build_device_data
+from switches.models import Switch, SwitchGroup
+import switches.templatetags.helpers as helpers
+
+# info urls used if none are configured, so the benchmark includes them:
+_EXAMPLE_INFO_URLS = {
+    'INTERFACE_INFO_URLS': [
+        {
+            'url': 'https://nms.example.com/interface?device={{ switch.hostname }};child={{ iface.name }}',
+            'hint': 'Click here to see NMS data for this interface',
+            'target': '_nms',
+            'fa_icon': 'fa-chart-area',
+        },
+    ],
+    'ETHERNET_INFO_URLS': [
+        {
+            'url': 'https://ipam.example.com/search?ethernet={{ ethernet }}',
+            'hint': 'Click here to see IPAM data about this ethernet address',
+            'target': '_ipam',
+            'fa_icon': 'fa-search',
+        },
+    ],
+    'IP4_INFO_URLS': [
+        {
+            'url': 'https://ipam.example.com/search?ipv4={{ ip4 }}',
+            'hint': 'Click here to see IPAM data about this IPv4 address',
+            'target': '_ipam',
+            'fa_icon': 'fa-search',
+        },
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the rendering of the interface and ethernet/arp/lldp tabs of a large switch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interfaces', type=int, default=500, help='the number of interfaces (default 500)')
+        parser.add_argument('--vlans', type=int, default=50, help='the number of vlans (default 50)')
+        parser.add_argument(
+            '--ethernet', type=int, default=4, help='the number of ethernet addresses per interface (default 4)'
+        )
+        parser.add_argument('--rounds', type=int, default=3, help='the number of rounds, best is shown (default 3)')
+
+    def handle(self, *args, **options):
+        group = SwitchGroup(id=1, name='benchmark')
+        switch = Switch(id=1, name='benchmark-switch', hostname='benchmark-switch.example.com')
+        request = RequestFactory().get('/')
+        request.user = User(username='benchmark')
+
+        connection = Connector(request, group, switch)
+        for name, value in build_device_data(
+            interface_count=options['interfaces'], vlan_count=options['vlans'], eth_per_interface=options['ethernet']
+        ).items():
+            setattr(connection, name, value)
+        connection.allowed_vlans = connection.vlans
+        connection.eth_addr_count = options['interfaces'] * options['ethernet']
+        connection.neighbor_count = len([iface for iface in connection.interfaces.values() if iface.lldp])
+        context = {'group': group, 'switch': switch, 'connection': connection}
+
+        # use the configured info urls, or the examples if none:
+        info_urls = {name: getattr(settings, name, None) or urls for name, urls in _EXAMPLE_INFO_URLS.items()}
+        self.stdout.write(
+            f"Switch with {options['interfaces']} interfaces, {connection.eth_addr_count} ethernet addresses, "
+            f"best of {options['rounds']} rounds:"
+        )
+        self.stdout.write(f"{'Tab':<20} {'Info urls':<12} {'Render (ms)':>12} {'Size (bytes)':>14}")
+
+        def compile_every_time(setting_name):
+            # the behavior before the templates were cached:
+            return helpers.compile_info_url_templates(getattr(settings, setting_name, None))
+
+        with override_settings(**info_urls):
+            for template_name in ('_tab_if_basics.html', '_tab_if_arp_lldp.html'):
+                with mock.patch.object(helpers, 'get_info_url_templates', compile_every_time):
+                    self.benchmark(template_name, 'compiled', context, request, options['rounds'])
+                self.benchmark(template_name, 'cached', context, request, options['rounds'])
+
+    def benchmark(self, template_name: str, method: str, context: dict, request, rounds: int):
+        """
+        Time the best of 'rounds' renders of the template, and print the results.
+        """
+        render_time = None
+        for _ in range(rounds):
+            start_time = time.perf_counter()
+            html = render_to_string(template_name, context, request=request)
+            duration = time.perf_counter() - start_time
+            if render_time is None or duration < render_time:
+                render_time = duration
+        self.stdout.write(f"{template_name:<20} {method:<12} {render_time * 1000:>12.1f} {len(html):>14}")
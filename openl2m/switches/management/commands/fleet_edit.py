@@ -0,0 +1,136 @@
+#
+# This file is part of Open Layer 2 Management (OpenL2M).
+#
+# OpenL2M is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.  You should have received a copy of the GNU General Public
+# License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Custom command line commands, see also:
+#    https://docs.djangoproject.com/en/2.2/howto/custom-management-commands/
+
+#
+# add the command 'fleet_edit', to make the same change on many devices, see switches/fleet.py
+# The changes are run by the task worker ("manage.py run_tasks").
+#
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from switches.constants import (
+    BULKEDIT_ALIAS_TYPE_APPEND,
+    BULKEDIT_ALIAS_TYPE_REPLACE,
+    BULKEDIT_POE_CHANGE,
+    BULKEDIT_POE_DOWN,
+    BULKEDIT_POE_DOWN_UP,
+    BULKEDIT_POE_NONE,
+    BULKEDIT_POE_UP,
+    INTERFACE_STATUS_CHANGE,
+    INTERFACE_STATUS_DOWN,
+    INTERFACE_STATUS_NONE,
+    INTERFACE_STATUS_UP,
+    TASK_STATUS_ERROR,
+)
+from switches.fleet import (
+    check_fleet_arguments,
+    create_fleet_tasks,
+    get_fleet_arguments,
+    get_fleet_results,
+    get_fleet_targets,
+)
+
+_interface_changes = {
+    'up': INTERFACE_STATUS_UP,
+    'down': INTERFACE_STATUS_DOWN,
+    'toggle': INTERFACE_STATUS_CHANGE,
+}
+_poe_changes = {
+    'enable': BULKEDIT_POE_UP,
+    'disable': BULKEDIT_POE_DOWN,
+    'toggle': BULKEDIT_POE_CHANGE,
+    'down-up': BULKEDIT_POE_DOWN_UP,
+}
+
+
+class Command(BaseCommand):
+    help = "Make the same interface changes on many devices. The changes are run by the task worker (run_tasks)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', required=True, help='the user making the changes, their permissions apply')
+        parser.add_argument('--group', default='', help='change all devices in this group (name or id)')
+        parser.add_argument(
+            '--switch', action='append', default=[], help='change this device (name or id), can be repeated'
+        )
+        parser.add_argument('--interfaces', default='', help='change the interfaces with names matching this regex')
+        parser.add_argument(
+            '--interface', action='append', default=[], help='change this interface (name), can be repeated'
+        )
+        parser.add_argument('--admin', choices=_interface_changes.keys(), help='change the interface admin status')
+        parser.add_argument('--poe', choices=_poe_changes.keys(), help='change the interface PoE status')
+        parser.add_argument('--vlan', type=int, default=-1, help='set the untagged vlan')
+        parser.add_argument('--description', default='', help='set the interface description')
+        parser.add_argument('--append', action='store_true', help='append to the description, instead of replacing')
+        parser.add_argument('--wait', action='store_true', help='wait for the changes, and show the results')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' not found!")
+        if not options['group'] and not options['switch']:
+            raise CommandError("Select the devices with --group and/or --switch!")
+
+        arguments = get_fleet_arguments(
+            interface_regex=options['interfaces'],
+            interface_names=options['interface'],
+            interface_change=_interface_changes.get(options['admin'], INTERFACE_STATUS_NONE),
+            poe_choice=_poe_changes.get(options['poe'], BULKEDIT_POE_NONE),
+            new_pvid=options['vlan'],
+            new_description=options['description'],
+            new_description_type=BULKEDIT_ALIAS_TYPE_APPEND if options['append'] else BULKEDIT_ALIAS_TYPE_REPLACE,
+        )
+        errors = check_fleet_arguments(arguments)
+        if errors:
+            raise CommandError("\n".join(errors))
+
+        targets, errors = get_fleet_targets(user=user, group=options['group'], switches=options['switch'])
+        for error in errors:
+            self.stderr.write(f"Skipped {error}")
+        if not targets:
+            raise CommandError("No devices to change!")
+        batch = create_fleet_tasks(user=user, targets=targets, arguments=arguments)
+        self.stdout.write(f"Fleet edit {batch} queued for {len(targets)} devices.")
+        if not options['wait']:
+            return
+
+        results = get_fleet_results(user=user, batch=batch, details=False)
+        while not results['finished']:
+            time.sleep(5)
+            results = get_fleet_results(user=user, batch=batch, details=False)
+            if options['verbosity'] > 1:
+                self.stdout.write(f"  {results['status']}")
+        results = get_fleet_results(user=user, batch=batch)
+        for device in results['devices']:
+            self.stdout.write(
+                f"{device['switch']}: {device['status']}, {device['success_count']} changes, "
+                f"{device['error_count']} errors"
+            )
+            if device['status_id'] == TASK_STATUS_ERROR and not device['error_count']:
+                # the device could not be changed, the reason is in the description:
+                self.stdout.write(f"    {device['description']}")
+            if device['error_count'] or options['verbosity'] > 1:
+                for result in device['results']:
+                    for output in result['outputs']:
+                        self.stdout.write(f"    {output}")
+        totals = results['totals']
+        self.stdout.write(
+            f"Done: {totals['devices']} devices, {totals['interfaces_done']} interfaces, "
+            f"{totals['success_count']} changes, {totals['error_count']} errors."
+        )
@@ -0,0 +1,222 @@
+#
+# This file is part of Open Layer 2 Management (OpenL2M).
+#
+# OpenL2M is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.  You should have received a copy of the GNU General Public
+# License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Custom command line commands, see also:
+#    https://docs.djangoproject.com/en/2.2/howto/custom-management-commands/
+
+#
+# add the command 'poll_switches', that reads all active devices into the shared device cache,
+# so the device pages and API can be served from the cache. See the POLLER_* settings.
+# With --locations, the ethernet addresses on edge interfaces are stored in the location index,
+# see switches/locations.py
+#
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import random
+import signal
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from switches.connect.connect import get_connection_object
+from switches.connect.connector import (
+    get_device_cache_generation,
+    lock_device_refresh,
+    refresh_device_cache,
+    unlock_device_refresh,
+)
+from switches.constants import CONNECTOR_TYPE_COMMANDS_ONLY, LOG_VIEW_SWITCH, SWITCH_STATUS_ACTIVE
+from switches.locations import expire_ethernet_locations, update_ethernet_locations
+from switches.models import Log, Switch
+
+
+class Command(BaseCommand):
+    help = "Read all active devices in the background, and keep their data in the shared device cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.POLLER_WORKERS, help='the number of devices read at the same time'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=settings.POLLER_INTERVAL, help='the seconds between reads of a device'
+        )
+        parser.add_argument(
+            '--recent-interval',
+            type=int,
+            default=settings.POLLER_RECENT_INTERVAL,
+            help='the seconds between reads of recently viewed devices',
+        )
+        parser.add_argument(
+            '--client-data',
+            action='store_true',
+            default=settings.POLLER_CLIENT_DATA,
+            help='also read the client data (ethernet, arp and lldp tables)',
+        )
+        parser.add_argument(
+            '--locations',
+            action='store_true',
+            default=settings.LOCATIONS_HARVEST,
+            help='store the ethernet addresses on edge interfaces in the location index (implies --client-data)',
+        )
+        parser.add_argument(
+            '--reload', type=int, default=300, help='the seconds between reading the list of devices (default 300)'
+        )
+        parser.add_argument('--once', action='store_true', help='read all devices once, and exit')
+
+    def handle(self, *args, **options):
+        if options['locations']:
+            options['client_data'] = True
+        self.options = options
+        self.verbosity = options['verbosity']
+        self.stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: self.stop.set())
+
+        self.running = set()  # the switch ids being read
+        self.lock = threading.Lock()
+        schedule = {}  # switch id -> time of next read
+        switches = {}  # switch id -> (Switch(), SwitchGroup())
+        recent = set()  # ids of recently viewed switches
+        next_reload = 0
+
+        self.stdout.write(
+            f"Polling with {options['workers']} workers, every {options['interval']} seconds, "
+            f"recently viewed every {options['recent_interval']} seconds"
+        )
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='poll-switch') as executor:
+            while not self.stop.is_set():
+                now = time.time()
+                if now >= next_reload:
+                    close_old_connections()
+                    switches = self.get_switches()
+                    recent = self.get_recently_viewed()
+                    if options['locations']:
+                        count = expire_ethernet_locations()
+                        if count and self.verbosity > 1:
+                            self.stdout.write(f"{count} ethernet locations expired")
+                    # new devices are spread out over the first interval, recently viewed devices first:
+                    for switch_id in switches.keys():
+                        if switch_id not in schedule:
+                            first = options['recent_interval'] if switch_id in recent else options['interval']
+                            schedule[switch_id] = 0 if options['once'] else now + random.uniform(0, first)
+                        elif switch_id in recent:
+                            # a device that was just viewed does not wait for its regular interval:
+                            schedule[switch_id] = min(schedule[switch_id], now + options['recent_interval'])
+                    for switch_id in list(schedule.keys()):
+                        if switch_id not in switches:
+                            del schedule[switch_id]
+                    next_reload = now + options['reload']
+                    if self.verbosity > 1:
+                        self.stdout.write(f"{len(switches)} active devices, {len(recent)} recently viewed")
+
+                # the devices that are due, recently viewed first, up to the number of free workers:
+                with self.lock:
+                    free = options['workers'] - len(self.running)
+                    due = [
+                        switch_id
+                        for switch_id, next_time in schedule.items()
+                        if next_time <= now and switch_id not in self.running
+                    ]
+                due.sort(key=lambda switch_id: (switch_id not in recent, schedule[switch_id]))
+                for switch_id in due[:free]:
+                    (switch, group) = switches[switch_id]
+                    with self.lock:
+                        self.running.add(switch_id)
+                    interval = options['recent_interval'] if switch_id in recent else options['interval']
+                    if options['once']:
+                        del schedule[switch_id]
+                    else:
+                        schedule[switch_id] = now + interval * (
+                            1 + random.uniform(-settings.POLLER_JITTER, settings.POLLER_JITTER)
+                        )
+                    executor.submit(self.poll_switch, switch, group, interval)
+
+                if options['once'] and not schedule and not self.running:
+                    break
+                self.stop.wait(1)
+            if self.stop.is_set():
+                self.stdout.write("Stopping, waiting for running reads to finish...")
+        self.stdout.write("Done!")
+
+    def get_switches(self) -> dict:
+        """
+        Get the active devices, and the first group of each. Devices that are not in any group are not read.
+        Returns a dictionary of switch id to (Switch(), SwitchGroup())
+        """
+        switches = {}
+        for switch in (
+            Switch.objects.filter(status=SWITCH_STATUS_ACTIVE)
+            .exclude(connector_type=CONNECTOR_TYPE_COMMANDS_ONLY)
+            .select_related('snmp_profile', 'netmiko_profile')
+            .prefetch_related('switchgroups')
+        ):
+            groups = list(switch.switchgroups.all())
+            if groups:
+                switches[switch.id] = (switch, groups[0])
+        return switches
+
+    def get_recently_viewed(self) -> set:
+        """
+        Get the ids of the devices viewed in the last settings.POLLER_RECENT_VIEWS seconds.
+        """
+        since = timezone.now() - timedelta(seconds=settings.POLLER_RECENT_VIEWS)
+        return set(
+            Log.objects.filter(action=LOG_VIEW_SWITCH, timestamp__gte=since, switch__isnull=False)
+            .values_list('switch_id', flat=True)
+            .distinct()
+        )
+
+    def poll_switch(self, switch: Switch, group, interval: int):
+        """
+        Worker function: read a device into the device cache, unless it was read recently,
+        e.g. by a user, or is being read by another process.
+        """
+        try:
+            age = time.time() - get_device_cache_generation(switch.id)
+            if age < interval / 2:
+                if self.verbosity > 1:
+                    self.stdout.write(f"{switch.name}: cached data is {int(age)} seconds old, skipping")
+                return
+            if not lock_device_refresh(switch.id):
+                if self.verbosity > 1:
+                    self.stdout.write(f"{switch.name}: already being read, skipping")
+                return
+            try:
+                start_time = time.time()
+                connection = get_connection_object(request=None, group=group, switch=switch)
+                if refresh_device_cache(connection=connection, client_data=self.options['client_data']):
+                    if self.verbosity > 1:
+                        self.stdout.write(f"{switch.name}: read in {time.time() - start_time:.1f} seconds")
+                    if self.options['locations'] and connection.client_data_read_timestamp:
+                        count = update_ethernet_locations(connection)
+                        if self.verbosity > 1:
+                            self.stdout.write(f"{switch.name}: {count} ethernet locations stored")
+                else:
+                    self.stderr.write(f"{switch.name}: read failed: {connection.error.description}")
+            finally:
+                unlock_device_refresh(switch.id)
+        except Exception as err:
+            self.stderr.write(f"{switch.name}: ERROR: {err}")
+            if self.verbosity > 2:
+                self.stderr.write(traceback.format_exc())
+        finally:
+            with self.lock:
+                self.running.discard(switch.id)
+            # the database connections of this thread are not re-used:
+            connections.close_all()
@@ -0,0 +1,222 @@
+#
+# This file is part of Open Layer 2 Management (OpenL2M).
+#
+# OpenL2M is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.  You should have received a copy of the GNU General Public
+# License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
+#
+
+# Custom command line commands, see also:
+#    https://docs.djangoproject.com/en/2.2/howto/custom-management-commands/
+
+#
+# add the command 'run_tasks', the worker that runs the background tasks (e.g. bulk edits) stored
+# in the database, outside of the web requests. See settings.BULKEDIT_TASKS
+#
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from importlib import import_module
+import re
+import signal
+import threading
+import traceback
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+from django.db.models import F
+from django.http import HttpRequest
+from django.utils import timezone
+
+from switches.connect.connect import get_connection_object
+from switches.constants import (
+    TASK_STATUS_COMPLETED,
+    TASK_STATUS_CREATED,
+    TASK_STATUS_ERROR,
+    TASK_STATUS_RUNNING,
+    TASK_TYPE_BULKEDIT,
+)
+from switches.models import Task
+from switches.views import bulkedit_processor
+
+
+class Command(BaseCommand):
+    help = "Run the background tasks, e.g. bulk edits, that are queued in the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.TASK_WORKERS, help='the number of tasks run at the same time'
+        )
+        parser.add_argument('--once', action='store_true', help='run the waiting tasks, and exit')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        self.stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop.set())
+        signal.signal(signal.SIGINT, lambda signum, frame: self.stop.set())
+        self.running = set()  # the ids of the switches with a running task
+        self.lock = threading.Lock()
+
+        self.stdout.write(f"Running tasks with {options['workers']} workers")
+        with ThreadPoolExecutor(max_workers=options['workers'], thread_name_prefix='run-task') as executor:
+            while not self.stop.is_set():
+                close_old_connections()
+                self.expire_tasks()
+                with self.lock:
+                    free = options['workers'] - len(self.running)
+                    busy = set(self.running)
+                # the oldest waiting tasks, one per device at a time, as changes on a device are done in order:
+                waiting = 0
+                for task in Task.objects.filter(status=TASK_STATUS_CREATED).order_by('created'):
+                    waiting += 1
+                    if free <= 0 or task.switch_id in busy:
+                        continue
+                    # claim the task, another worker process may have claimed it already:
+                    if not Task.objects.filter(id=task.id, status=TASK_STATUS_CREATED).update(
+                        status=TASK_STATUS_RUNNING, started=timezone.now(), start_count=F('start_count') + 1
+                    ):
+                        continue
+                    busy.add(task.switch_id)
+                    free -= 1
+                    with self.lock:
+                        self.running.add(task.switch_id)
+                    executor.submit(self.run_task, task.id)
+                if options['once'] and not waiting and not self.running:
+                    break
+                self.stop.wait(1)
+            if self.stop.is_set():
+                self.stdout.write("Stopping, waiting for running tasks to finish...")
+        self.stdout.write("Done!")
+
+    def expire_tasks(self):
+        """
+        Tasks that have been running for more then settings.TASK_TIMEOUT seconds were likely stopped
+        with their worker, so mark these as errors.
+        """
+        cutoff = timezone.now() - timedelta(seconds=settings.TASK_TIMEOUT)
+        count = Task.objects.filter(status=TASK_STATUS_RUNNING, started__lt=cutoff).update(
+            status=TASK_STATUS_ERROR, completed=timezone.now()
+        )
+        if count:
+            self.stderr.write(f"{count} tasks did not finish in {settings.TASK_TIMEOUT} seconds, marked as errors")
+
+    def run_task(self, task_id: int):
+        """
+        Worker function: run a (claimed) task, and save the results.
+        """
+        task = Task.objects.select_related('user', 'group', 'switch').get(id=task_id)
+        try:
+            if self.verbosity > 1:
+                self.stdout.write(f"{task}: started")
+            task.results = []
+            task.success_count = task.error_count = task.interfaces_done = 0
+            if task.type == TASK_TYPE_BULKEDIT:
+                self.run_bulkedit(task)
+            else:
+                task.description = f"{task.description} - ERROR: unknown task type {task.type}"
+                task.status = TASK_STATUS_ERROR
+        except Exception as err:
+            task.description = f"{task.description} - ERROR: {err}"
+            task.status = TASK_STATUS_ERROR
+            self.stderr.write(f"{task}: ERROR: {err}")
+            if self.verbosity > 2:
+                self.stderr.write(traceback.format_exc())
+        finally:
+            task.completed = timezone.now()
+            task.save()
+            with self.lock:
+                self.running.discard(task.switch_id)
+            if self.verbosity > 1:
+                self.stdout.write(f"{task}: {task.get_status_display()}, {task.error_count} errors")
+            # the database connections of this thread are not re-used:
+            connections.close_all()
+
+    def get_task_request(self, task: Task) -> HttpRequest:
+        """
+        Return a request for the user of the task, so the device connection applies the permissions of this user.
+        The session is new, and never saved.
+        """
+        request = HttpRequest()
+        request.user = task.user
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        return request
+
+    def run_bulkedit(self, task: Task):
+        """
+        Run a bulk edit task, from the web ui (with the interfaces given), or of a fleet operation
+        (with the interfaces selected by name, see switches/fleet.py).
+        """
+        connection = get_connection_object(request=self.get_task_request(task), group=task.group, switch=task.switch)
+        if not connection.get_basic_info() or connection.error.status:
+            task.description = f"{task.description} - ERROR reading device: {connection.error.description}"
+            task.status = TASK_STATUS_ERROR
+            return
+        arguments = task.arguments
+        skipped = []
+        if 'interfaces' in arguments:
+            interfaces = arguments['interfaces']
+        else:
+            (interfaces, skipped) = self.select_interfaces(task, connection)
+            if interfaces is None:
+                task.status = TASK_STATUS_ERROR
+                return
+            task.interface_count = len(interfaces)
+            task.save(update_fields=['interface_count'])
+        results = bulkedit_processor(
+            request=None,
+            group=task.group,
+            switch=task.switch,
+            conn=connection,
+            interface_change=arguments['interface_change'],
+            poe_choice=arguments['poe_choice'],
+            new_pvid=arguments['new_pvid'],
+            new_description=arguments['new_description'],
+            new_description_type=arguments['new_description_type'],
+            interfaces=interfaces,
+            task=task,
+        )
+        # the selected interfaces that were not changed, and why:
+        task.results.extend(skipped)
+        # indicate we need to save config, and update the shared device cache for the users:
+        if results["success_count"] > 0:
+            connection.set_save_needed(True)
+        connection.save_device_cache()
+        task.status = TASK_STATUS_ERROR if results["error_count"] else TASK_STATUS_COMPLETED
+
+    def select_interfaces(self, task: Task, connection) -> tuple[dict | None, list]:
+        """
+        Select the interfaces of a fleet operation task, that the user can manage.
+        Returns a dict of interface key to name (or None if the task cannot run on this device),
+        and a list of results for the selected interfaces that cannot be changed.
+        """
+        arguments = task.arguments
+        new_pvid = arguments['new_pvid']
+        if new_pvid > 0 and new_pvid not in connection.allowed_vlans.keys():
+            task.description = f"{task.description} - ERROR: vlan {new_pvid} is not allowed on this device"
+            return (None, [])
+        skipped = []
+        if arguments.get('interface_regex', ''):
+            regex = re.compile(arguments['interface_regex'])
+            selected = [iface for iface in connection.interfaces.values() if regex.search(iface.name)]
+        else:
+            selected = []
+            for name in arguments['interface_names']:
+                iface = connection.get_interface_by_name(name)
+                if iface:
+                    selected.append(iface)
+                else:
+                    skipped.append({"key": "", "name": name, "outputs": ["Interface not found"], "errors": 0})
+        interfaces = {}
+        for iface in selected:
+            if iface.manageable:
+                interfaces[iface.key] = iface.name
+            elif iface.visible:
+                reason = iface.unmanage_reason or "access denied"
+                skipped.append({"key": iface.key, "name": iface.name, "outputs": [reason], "errors": 0})
+        return (interfaces, skipped)
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.2 on 2024-03-12 10:15
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('switches', '0046_alter_log_action'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='switch',
+            name='snmp_max_repetitions',
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                help_text='Override the SNMP get-bulk max-repetitions for this device. Leave at 0 to use the values learned from this device.',
+                validators=[django.core.validators.MaxValueValidator(1000)],
+                verbose_name='SNMP Max-Repetitions',
+            ),
+        ),
+        migrations.AddField(
+            model_name='switch',
+            name='snmp_bulk_tuning',
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text='The get-bulk max-repetitions values learned from this device, per type of mib branch. Clear to start learning again.',
+                verbose_name='Learned SNMP Max-Repetitions',
+            ),
+        ),
+    ]
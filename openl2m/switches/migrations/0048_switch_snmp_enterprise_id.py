@@ -0,0 +1,31 @@
+# Generated by Django 5.0.2 on 2024-03-14 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('switches', '0047_switch_snmp_bulk_tuning'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='switch',
+            name='snmp_enterprise_id',
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text='The vendor ID found in the SNMP system OID, used to select the driver for this device. Cleared when the IP or SNMP Profile changes. Set to 0 to detect again.',
+                verbose_name='SNMP Enterprise ID',
+            ),
+        ),
+        migrations.AddField(
+            model_name='switch',
+            name='snmp_enterprise_checked',
+            field=models.DateTimeField(
+                blank=True,
+                help_text='The last time the SNMP Enterprise ID was read from the device.',
+                null=True,
+                verbose_name='SNMP Enterprise ID Checked',
+            ),
+        ),
+    ]
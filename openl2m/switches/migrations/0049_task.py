@@ -0,0 +1,108 @@
+# Generated by Django 5.0.2 on 2024-03-20 10:15
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('switches', '0048_switch_snmp_enterprise_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Task',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, null=True)),
+                (
+                    'started',
+                    models.DateTimeField(blank=True, help_text='The last time the task was started', null=True),
+                ),
+                ('completed', models.DateTimeField(blank=True, help_text='The time the task was completed', null=True)),
+                (
+                    'start_count',
+                    models.PositiveSmallIntegerField(
+                        default=0, help_text='The number of times the task was started', verbose_name='Run Count'
+                    ),
+                ),
+                (
+                    'ip_address',
+                    models.TextField(
+                        default='0.0.0.0',
+                        help_text='The user IP address that created the task, used in the log entries',
+                        max_length=20,
+                    ),
+                ),
+                (
+                    'type',
+                    models.PositiveSmallIntegerField(
+                        choices=[[0, 'No task'], [1, 'Bulk Edit Task']], default=0, verbose_name='Type of Task'
+                    ),
+                ),
+                (
+                    'status',
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            [0, 'Deleted'],
+                            [1, 'Created'],
+                            [2, 'Scheduled'],
+                            [3, 'Running'],
+                            [4, 'Completed'],
+                            [5, 'Errored'],
+                            [6, 'Running(Retry)'],
+                        ],
+                        default=1,
+                        verbose_name='Status of this task',
+                    ),
+                ),
+                ('description', models.TextField(blank=True, default='')),
+                ('arguments', models.JSONField(blank=True, default=dict, help_text='The task arguments')),
+                (
+                    'interface_count',
+                    models.PositiveIntegerField(default=0, help_text='The number of interfaces to change'),
+                ),
+                (
+                    'interfaces_done',
+                    models.PositiveIntegerField(default=0, help_text='The number of interfaces that are done'),
+                ),
+                ('success_count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                (
+                    'results',
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text='The results of each interface: name, outputs and error count',
+                    ),
+                ),
+                (
+                    'group',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='switches.switchgroup'
+                    ),
+                ),
+                (
+                    'switch',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='switches.switch'
+                    ),
+                ),
+                (
+                    'user',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='tasks',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'ordering': ['-created'],
+            },
+        ),
+    ]
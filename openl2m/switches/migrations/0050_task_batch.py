@@ -0,0 +1,23 @@
+# Generated by Django 5.0.2 on 2024-03-21 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('switches', '0049_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='batch',
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default='',
+                help_text='The id of the fleet operation this task is part of, see switches/fleet.py',
+                max_length=32,
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.2 on 2024-03-28 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('switches', '0050_task_batch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EthernetLocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                (
+                    'ethernet',
+                    models.BigIntegerField(db_index=True, help_text='The ethernet address, as an integer'),
+                ),
+                (
+                    'ip_address',
+                    models.GenericIPAddressField(
+                        blank=True,
+                        db_index=True,
+                        help_text='The IP address of the ethernet address, from the arp table',
+                        null=True,
+                    ),
+                ),
+                ('if_name', models.CharField(blank=True, default='', max_length=64, verbose_name='Interface name')),
+                ('vlan_id', models.PositiveIntegerField(default=0, verbose_name='Vlan')),
+                ('vendor', models.CharField(blank=True, default='', max_length=100)),
+                ('first_seen', models.DateTimeField(auto_now_add=True)),
+                ('last_seen', models.DateTimeField(db_index=True)),
+                (
+                    'switch',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='ethernet_locations',
+                        to='switches.switch',
+                    ),
+                ),
+            ],
+            options={
+                'ordering': ['-last_seen'],
+                'constraints': [
+                    models.UniqueConstraint(fields=('switch', 'ethernet', 'vlan_id'), name='unique_ethernet_location')
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.2 on 2024-04-02 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('switches', '0052_alter_log_action'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='switch',
+            name='snmp_capabilities',
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text='The optional mib branches that returned data (0), nothing (number of reads in a row), or an error (-1), as learned from this device. Cleared when the IP or SNMP Profile changes. Clear to probe again.',
+                verbose_name='Learned SNMP Capabilities',
+            ),
+        ),
+    ]
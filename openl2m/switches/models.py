@@ -13,6 +13,7 @@
 #
 import logging.handlers
 import json
+import netaddr
 
 from django.db import models
 from django.conf import settings
@@ -721,6 +722,12 @@ class Switch(models.Model):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # remember the connection settings as loaded, to detect changes in save().
+        # None if these fields were deferred, e.g. with .only(), and are not known:
+        if 'primary_ip4' in self.__dict__ and 'snmp_profile_id' in self.__dict__:
+            self._loaded_connection_settings = (self.primary_ip4, self.snmp_profile_id)
+        else:
+            self._loaded_connection_settings = None
 
     name = models.CharField(
         max_length=64,
@@ -856,6 +863,42 @@ class Switch(models.Model):
         verbose_name='Hostname',
         help_text='The switch hostname as reported via snmp, ssh, etc.',
     )
+    # SNMP get-bulk tuning:
+    snmp_max_repetitions = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='SNMP Max-Repetitions',
+        validators=[MaxValueValidator(1000)],
+        help_text='Override the SNMP get-bulk max-repetitions for this device. '
+        'Leave at 0 to use the values learned from this device.',
+    )
+    snmp_bulk_tuning = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Learned SNMP Max-Repetitions',
+        help_text='The get-bulk max-repetitions values learned from this device, per type of mib branch. '
+        'Clear to start learning again.',
+    )
+    snmp_capabilities = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Learned SNMP Capabilities',
+        help_text='The optional mib branches that returned data (0), nothing (number of reads in a row), '
+        'or an error (-1), as learned from this device. Cleared when the IP or SNMP Profile changes. '
+        'Clear to probe again.',
+    )
+    # the vendor detected for snmp devices, so the driver can be selected without probing the device:
+    snmp_enterprise_id = models.PositiveIntegerField(
+        default=0,
+        verbose_name='SNMP Enterprise ID',
+        help_text='The vendor ID found in the SNMP system OID, used to select the driver for this device. '
+        'Cleared when the IP or SNMP Profile changes. Set to 0 to detect again.',
+    )
+    snmp_enterprise_checked = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='SNMP Enterprise ID Checked',
+        help_text='The last time the SNMP Enterprise ID was read from the device.',
+    )
     # dont_show_interfaces = models.BooleanField(
     #    default=False,
     #    verbose_name='Do NOT Show Interfaces',
@@ -869,6 +912,25 @@ class Switch(models.Model):
             ['primary_ip4', 'snmp_profile'],
         ]
 
+    def save(self, *args, **kwargs):
+        # if the IP or snmp profile changed, the device may be of a different vendor:
+        if (
+            self._loaded_connection_settings is not None
+            and (self.primary_ip4, self.snmp_profile_id) != self._loaded_connection_settings
+        ):
+            self.snmp_enterprise_id = 0
+            self.snmp_enterprise_checked = None
+            self.snmp_capabilities = {}
+            update_fields = kwargs.get('update_fields', None)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {
+                    'snmp_enterprise_id',
+                    'snmp_enterprise_checked',
+                    'snmp_capabilities',
+                }
+        super().save(*args, **kwargs)
+        self._loaded_connection_settings = (self.primary_ip4, self.snmp_profile_id)
+
     def display_name(self):
         """
         This is used in templates, so we can 'annotate' as needed
@@ -1226,3 +1288,199 @@ class Log(models.Model):
     class Meta:
         ordering = ['timestamp']
         verbose_name_plural = 'Activity Logs'
+
+
+class Task(models.Model):
+    """
+    A Task is work on a device that runs in the background, outside of the web request,
+    by the task worker ("manage.py run_tasks"). For now, these are bulk edits (see views.bulkedit_processor()).
+    The progress and results of each interface are stored in the task, so they can be shown while it runs.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+    created = models.DateTimeField(
+        auto_now_add=True,
+        blank=True,
+        null=True,
+    )
+    started = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text='The last time the task was started',
+    )
+    completed = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text='The time the task was completed',
+    )
+    start_count = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Run Count',
+        help_text='The number of times the task was started',
+    )
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='tasks',
+        blank=True,
+        null=True,
+    )
+    group = models.ForeignKey(
+        to='SwitchGroup',
+        on_delete=models.CASCADE,
+        related_name='tasks',
+    )
+    switch = models.ForeignKey(
+        to='Switch',
+        on_delete=models.CASCADE,
+        related_name='tasks',
+    )
+    ip_address = models.TextField(
+        max_length=20,
+        default='0.0.0.0',
+        help_text='The user IP address that created the task, used in the log entries',
+    )
+    batch = models.CharField(
+        max_length=32,
+        blank=True,
+        default='',
+        db_index=True,
+        help_text='The id of the fleet operation this task is part of, see switches/fleet.py',
+    )
+    type = models.PositiveSmallIntegerField(
+        choices=constants.TASK_TYPE_CHOICES,
+        default=constants.TASK_TYPE_NONE,
+        verbose_name='Type of Task',
+    )
+    status = models.PositiveSmallIntegerField(
+        choices=constants.TASK_STATUS_CHOICES,
+        default=constants.TASK_STATUS_CREATED,
+        verbose_name='Status of this task',
+    )
+    description = models.TextField(
+        blank=True,
+        default='',
+    )
+    arguments = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text='The task arguments',
+    )
+    interface_count = models.PositiveIntegerField(
+        default=0,
+        help_text='The number of interfaces to change',
+    )
+    interfaces_done = models.PositiveIntegerField(
+        default=0,
+        help_text='The number of interfaces that are done',
+    )
+    success_count = models.PositiveIntegerField(
+        default=0,
+    )
+    error_count = models.PositiveIntegerField(
+        default=0,
+    )
+    results = models.JSONField(
+        default=list,
+        blank=True,
+        help_text='The results of each interface: name, outputs and error count',
+    )
+
+    def is_finished(self) -> bool:
+        """
+        Return True if the task is no longer waiting or running.
+        """
+        return self.status in (
+            constants.TASK_STATUS_COMPLETED,
+            constants.TASK_STATUS_ERROR,
+            constants.TASK_STATUS_DELETED,
+        )
+
+    def as_dict(self) -> dict:
+        """
+        Return the status, progress and results of the task, e.g. for the status page and the API.
+        """
+        return {
+            'id': self.id,
+            'type': self.get_type_display(),
+            'status_id': self.status,
+            'status': self.get_status_display(),
+            'finished': self.is_finished(),
+            'description': self.description,
+            'created': self.created.isoformat() if self.created else None,
+            'started': self.started.isoformat() if self.started else None,
+            'completed': self.completed.isoformat() if self.completed else None,
+            'interface_count': self.interface_count,
+            'interfaces_done': self.interfaces_done,
+            'success_count': self.success_count,
+            'error_count': self.error_count,
+            'results': self.results,
+        }
+
+    def display_name(self):
+        return f"{self.get_type_display()} {self.id} on {self.switch}"
+
+    def __str__(self):
+        return self.display_name()
+
+    class Meta:
+        ordering = ['-created']
+
+
+class EthernetLocation(models.Model):
+    """
+    The location of an ethernet address: the device, interface and vlan it was last heard on,
+    and the IP address from the arp table, if known. These are harvested from the client data of all devices
+    by the poller ("manage.py poll_switches --locations"), from edge interfaces only, see switches/locations.py
+    """
+
+    ethernet = models.BigIntegerField(
+        db_index=True,
+        help_text='The ethernet address, as an integer',
+    )
+    ip_address = models.GenericIPAddressField(
+        blank=True,
+        null=True,
+        db_index=True,
+        help_text='The IP address of the ethernet address, from the arp table',
+    )
+    switch = models.ForeignKey(
+        to='Switch',
+        on_delete=models.CASCADE,
+        related_name='ethernet_locations',
+    )
+    if_name = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        verbose_name='Interface name',
+    )
+    vlan_id = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Vlan',
+    )
+    vendor = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+    )
+    first_seen = models.DateTimeField(
+        auto_now_add=True,
+    )
+    last_seen = models.DateTimeField(
+        db_index=True,
+    )
+
+    class Meta:
+        ordering = ['-last_seen']
+        constraints = [
+            models.UniqueConstraint(fields=['switch', 'ethernet', 'vlan_id'], name='unique_ethernet_location'),
+        ]
+
+    def display_name(self):
+        return f"{netaddr.EUI(self.ethernet)} on {self.switch} {self.if_name}"
+
+    def __str__(self):
+        return self.display_name()
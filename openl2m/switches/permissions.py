@@ -15,6 +15,12 @@
 #
 # Functions that perform actions on interfaces, called by both the WEB UI and REST API
 #
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db.models import Prefetch
 from django.http.request import HttpRequest
 
 from rest_framework import status as http_status
@@ -39,7 +45,7 @@ from switches.constants import (
     SWITCH_STATUS_ACTIVE,
 )
 from switches.connect.connect import get_connection_object
-from switches.models import Log, Switch, SwitchGroup
+from switches.models import Log, Switch, SwitchGroup, Task
 from switches.utils import dprint, get_remote_ip, get_from_http_session
 
 # ###################################################
@@ -51,6 +57,8 @@ def get_my_device_groups(request: HttpRequest) -> dict:
     """
     Find the SwitchGroup()s, and Switch()s in those groups, that this user has rights to.
     Returns a dictionary of groups and the devices in those groups.
+    The result is cached per user (see settings.PERMISSIONS_CACHE_TIMEOUT), and the cache is cleared
+    when groups, switches, or group memberships change, see switches/signals.py
 
     Args:
         request:  current HttpRequest() object
@@ -63,20 +71,71 @@ def get_my_device_groups(request: HttpRequest) -> dict:
         using the JSON Session Serializer (ie JSONSerializer)
     """
     dprint("get_my_device_groups()")
-    if request.user.is_superuser or request.user.is_staff:
+    cache = caches[settings.DEVICE_CACHE_ALIAS]
+    version = get_device_groups_version()
+    cache_key = get_device_groups_cache_key(request.user.id)
+    permissions = None
+    if settings.PERMISSIONS_CACHE_TIMEOUT:
+        entry = cache.get(cache_key, None)
+        if entry and entry['version'] == version:
+            dprint("  Found in cache!")
+            permissions = entry['groups']
+    if permissions is None:
+        permissions = _read_my_device_groups(user=request.user)
+        if settings.PERMISSIONS_CACHE_TIMEOUT:
+            cache.set(
+                cache_key, {'version': version, 'groups': permissions}, timeout=settings.PERMISSIONS_CACHE_TIMEOUT
+            )
+
+    # the api urls depend on the request (i.e. the server name used), so they are not cached.
+    # Reverse the url once, and fill in the group and switch id for each device:
+    url_template = (
+        rest_reverse(
+            "switches-api:api_switch_view",
+            request=request,
+            kwargs={"group_id": _URL_GROUP_ID, "switch_id": _URL_SWITCH_ID},
+        )
+        .replace(str(_URL_GROUP_ID), "{group_id}")
+        .replace(str(_URL_SWITCH_ID), "{switch_id}")
+    )
+    for group_id, group_info in permissions.items():
+        for switch_id, member in group_info['members'].items():
+            member['url'] = url_template.format(group_id=group_id, switch_id=switch_id)
+    return permissions
+
+
+# "unlikely" ids, used to create the api url template in get_my_device_groups()
+_URL_GROUP_ID = 918273645
+_URL_SWITCH_ID = 546372819
+
+
+def _read_my_device_groups(user: User) -> dict:
+    """
+    Read the groups and active switches this user has access to from the database, see get_my_device_groups().
+    This uses one query for the groups, and one for all the switches in them. The 'url' of the switches is not set.
+
+    Args:
+        user: the User() object
+
+    Returns:
+        groups: dict of groups, as described in get_my_device_groups()
+    """
+    if user.is_superuser or user.is_staff:
         dprint("  Superuser or Staff!")
-        # optimize data queries, get all related field at once!
-        groups = SwitchGroup.objects.all().order_by("name")
+        groups = SwitchGroup.objects.all()
     else:
         # figure out what this user has access to.
         # Note we use the ManyToMany 'related_name' attribute for readability!
         dprint("  Regular user.")
-        groups = request.user.switchgroups.all().order_by("name")
+        groups = user.switchgroups.all()
+    # optimize data queries, get all switches of all groups at once!
+    groups = groups.order_by("name").prefetch_related(Prefetch("switches", queryset=Switch.objects.order_by("name")))
 
     # now find active devices in these groups
     permissions = {}
     for group in groups:
-        if group.switches.count():
+        switches = group.switches.all()
+        if switches:
             # set this group, and the switches, in web session to track permissions
             group_info = {
                 'name': group.name,
@@ -86,7 +145,7 @@ def get_my_device_groups(request: HttpRequest) -> dict:
                 'comments': group.comments,
             }
             members = {}
-            for switch in group.switches.all():
+            for switch in switches:
                 if switch.status == SWITCH_STATUS_ACTIVE:
                     # we save the names as well, so we can search them!
                     members[str(switch.id)] = {
@@ -95,11 +154,6 @@ def get_my_device_groups(request: HttpRequest) -> dict:
                         "description": switch.description,
                         "default_view": switch.default_view,
                         "default_view_name": switch.get_default_view_display(),
-                        "url": rest_reverse(
-                            "switches-api:api_switch_view",
-                            request=request,
-                            kwargs={"group_id": group.id, "switch_id": switch.id},
-                        ),
                         "connector_type": switch.connector_type,
                         "connector_type_name": switch.get_connector_type_display(),
                         "read_only": switch.read_only,
@@ -116,6 +170,43 @@ def get_my_device_groups(request: HttpRequest) -> dict:
     return permissions
 
 
+def get_device_groups_cache_key(user_id: int) -> str:
+    """
+    Get the key in the cache of the groups and devices of a user, see get_my_device_groups()
+    """
+    return f"openl2m:device_groups:{user_id}"
+
+
+def get_device_groups_version() -> float:
+    """
+    Get the current version of the groups and devices data. Cached data of another version is not used.
+    """
+    cache = caches[settings.DEVICE_CACHE_ALIAS]
+    version = cache.get("openl2m:device_groups:version", None)
+    if version is None:
+        version = time.time()
+        # another process may have just set it, so use that:
+        if not cache.add("openl2m:device_groups:version", version, timeout=None):
+            version = cache.get("openl2m:device_groups:version", version)
+    return version
+
+
+def clear_device_groups_cache(user_id: int = 0):
+    """
+    Clear the cached groups and devices of a user, or of all users if not given, see get_my_device_groups()
+
+    Args:
+        user_id (int): the pk of the User(), or 0 for all users.
+    """
+    dprint(f"clear_device_groups_cache(user={user_id})")
+    cache = caches[settings.DEVICE_CACHE_ALIAS]
+    if user_id:
+        cache.delete(get_device_groups_cache_key(user_id))
+    else:
+        # a new version makes all cached data invalid:
+        cache.set("openl2m:device_groups:version", time.time(), timeout=None)
+
+
 def get_group_and_switch(request: HttpRequest, group_id: int, switch_id: int) -> tuple[SwitchGroup, Switch]:
     """
     Get the Group() and Switch() if the current user has rights.
@@ -144,6 +235,29 @@ def get_group_and_switch(request: HttpRequest, group_id: int, switch_id: int) ->
     return _get_group_and_switch_from_permissions(permissions=groups, group_id=group_id, switch_id=switch_id)
 
 
+def get_task_if_permitted(request: HttpRequest, group_id: int, switch_id: int, task_id: int) -> Task | None:
+    """
+    Get a background Task() of a device, if the current user has rights to the device, and the task:
+    users can see their own tasks, staff and superusers all tasks.
+
+    Params:
+        request: HttpRequest() object.
+        group_id (int): SwitchGroup() pk
+        switch_id (int): Switch() pk
+        task_id (int): Task() pk
+
+    Returns:
+        task: Task() object or None.
+    """
+    group, switch = get_group_and_switch(request=request, group_id=group_id, switch_id=switch_id)
+    if group is None or switch is None:
+        return None
+    task = Task.objects.filter(id=task_id, group=group, switch=switch).select_related('group', 'switch').first()
+    if task and (task.user_id == request.user.id or request.user.is_superuser or request.user.is_staff):
+        return task
+    return None
+
+
 def get_connection_if_permitted(
     request: HttpRequest, group: SwitchGroup, switch: Switch, write_access: bool = False
 ) -> tuple[Connector, Error]:
@@ -0,0 +1,79 @@
+#
+# This file is part of Open Layer 2 Management (OpenL2M).
+#
+# OpenL2M is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License version 3 as published by
+# the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.  You should have received a copy of the GNU General Public
+# License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
+#
+"""
+Signal handlers to clear the cached groups and devices of users, see permissions.get_my_device_groups(),
+and the cached allowed vlans of groups, see connector.get_group_allowed_vlans()
+These are connected in apps.py
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from switches.connect.connector import clear_group_vlans_cache
+from switches.models import Switch, SwitchGroup, SwitchGroupMembership, VLAN, VlanGroup
+from switches.permissions import clear_device_groups_cache
+
+
+@receiver(post_save, sender=Switch)
+@receiver(post_delete, sender=Switch)
+@receiver(post_save, sender=SwitchGroup)
+@receiver(post_delete, sender=SwitchGroup)
+@receiver(post_save, sender=SwitchGroupMembership)
+@receiver(post_delete, sender=SwitchGroupMembership)
+def switch_or_group_changed(sender, instance, **kwargs):
+    # the stored vendor and snmp tuning of a switch are not in the cached data, so ignore those updates:
+    update_fields = kwargs.get('update_fields', None)
+    if sender is Switch and update_fields and set(update_fields) <= {
+        'snmp_bulk_tuning',
+        'snmp_capabilities',
+        'snmp_enterprise_id',
+        'snmp_enterprise_checked',
+    }:
+        return
+    clear_device_groups_cache()
+
+
+@receiver(m2m_changed, sender=SwitchGroup.switches.through)
+@receiver(m2m_changed, sender=SwitchGroup.users.through)
+def group_members_changed(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        clear_device_groups_cache()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # the login time is updated on every login, this does not change access:
+    update_fields = kwargs.get('update_fields', None)
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    clear_device_groups_cache(user_id=instance.id)
+
+
+@receiver(post_save, sender=SwitchGroup)
+@receiver(post_delete, sender=SwitchGroup)
+@receiver(post_save, sender=VlanGroup)
+@receiver(post_delete, sender=VlanGroup)
+@receiver(post_save, sender=VLAN)
+@receiver(post_delete, sender=VLAN)
+def vlans_changed(sender, instance, **kwargs):
+    clear_group_vlans_cache()
+
+
+@receiver(m2m_changed, sender=SwitchGroup.vlan_groups.through)
+@receiver(m2m_changed, sender=SwitchGroup.vlans.through)
+@receiver(m2m_changed, sender=VlanGroup.vlans.through)
+def vlan_members_changed(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        clear_group_vlans_cache()
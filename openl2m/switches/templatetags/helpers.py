@@ -68,6 +68,32 @@ def build_url_string(values):
     return s
 
 
+# the compiled templates of the info urls in the settings, see get_info_url_templates()
+_info_url_templates = {}
+
+
+def compile_info_url_templates(info_urls):
+    """
+    Compile the list of info url definitions from a settings variable into Template() objects.
+    Returns a list of (info_url, Template()) tuples. Definitions without 'url' are skipped.
+    """
+    return [(info_url, Template(build_url_string(info_url))) for info_url in info_urls or [] if 'url' in info_url]
+
+
+def get_info_url_templates(setting_name):
+    """
+    Get the compiled templates of the info urls in the settings variable with this name,
+    as a list of (info_url, Template()) tuples. These are compiled once per process.
+    """
+    info_urls = getattr(settings, setting_name, None)
+    entry = _info_url_templates.get(setting_name, None)
+    # if the settings variable was replaced (e.g. in tests), compile again:
+    if entry is None or entry[0] is not info_urls:
+        entry = (info_urls, compile_info_url_templates(info_urls))
+        _info_url_templates[setting_name] = entry
+    return entry[1]
+
+
 def get_switch_link(group_id, switch_id, switch):
     """
     Build custom html link to switch, based on switch attributes
@@ -315,34 +341,18 @@ def get_switch_info_url_links(switch, user):
     Get the info url(s) for the switch expanded from the settings file variable
     """
     links = ''
-    if settings.SWITCH_INFO_URLS:
-        for info_url in settings.SWITCH_INFO_URLS:
-            # if we have a url defined, make sure used fields are set:
-            if not validate_info_url_fields(info_url, switch):
-                continue
-            template = Template(build_url_string(info_url))
-            context = Context({'switch': switch})
-            links += template.render(context)
-
+    setting_names = ['SWITCH_INFO_URLS']
     if user.is_superuser or user.is_staff:
-        if settings.SWITCH_INFO_URLS_STAFF:
-            for info_url in settings.SWITCH_INFO_URLS_STAFF:
-                # if we have a url defined, make sure used fields are set:
-                if not validate_info_url_fields(info_url, switch):
-                    continue
-                template = Template(build_url_string(info_url))
-                context = Context({'switch': switch})
-                links += template.render(context)
-
-    if user.is_superuser and settings.SWITCH_INFO_URLS_ADMINS:
-        for info_url in settings.SWITCH_INFO_URLS_ADMINS:
+        setting_names.append('SWITCH_INFO_URLS_STAFF')
+    if user.is_superuser:
+        setting_names.append('SWITCH_INFO_URLS_ADMINS')
+    context = Context({'switch': switch})
+    for setting_name in setting_names:
+        for info_url, url_template in get_info_url_templates(setting_name):
             # if we have a url defined, make sure used fields are set:
             if not validate_info_url_fields(info_url, switch):
                 continue
-            template = Template(build_url_string(info_url))
-            context = Context({'switch': switch})
-            links += template.render(context)
-
+            links += url_template.render(context)
     return mark_safe(links)
 
 
@@ -352,13 +362,13 @@ def get_interface_info_links(switch, iface):
     Get the info url(s) for the interface expanded from the settings file variable
     """
     links = ''
-    if settings.INTERFACE_INFO_URLS:
-        for info_url in settings.INTERFACE_INFO_URLS:
+    templates = get_info_url_templates('INTERFACE_INFO_URLS')
+    if templates:
+        context = Context({'switch': switch, 'iface': iface})
+        for info_url, url_template in templates:
             if not validate_info_url_fields(info_url, switch, iface):
                 continue
-            template = Template(build_url_string(info_url))
-            context = Context({'switch': switch, 'iface': iface})
-            links += template.render(context)
+            links += url_template.render(context)
     return mark_safe(links)
 
 
@@ -367,18 +377,7 @@ def get_vlan_info_links(vlan):
     """
     Get the info url(s) for the Vlan() expanded from the settings file variable
     """
-    links = ''
-    if settings.VLAN_INFO_URLS:
-        # do this for all URLs listed:
-        for info_url in settings.VLAN_INFO_URLS:
-            template = Template(build_url_string(info_url))
-            context = Context(
-                {
-                    'vlan': vlan,
-                }
-            )
-            links += template.render(context)
-    return mark_safe(links)
+    return mark_safe(_render_info_url_templates('VLAN_INFO_URLS', {'vlan': vlan}))
 
 
 @register.filter
@@ -386,18 +385,7 @@ def get_ethernet_info_links(ethernet):
     """
     Get the info url(s) for the EthernetAddress() expanded from the settings file variable
     """
-    links = ''
-    if settings.ETHERNET_INFO_URLS:
-        # do this for all URLs listed:
-        for info_url in settings.ETHERNET_INFO_URLS:
-            template = Template(build_url_string(info_url))
-            context = Context(
-                {
-                    'ethernet': ethernet,
-                }
-            )
-            links += template.render(context)
-    return mark_safe(links)
+    return mark_safe(_render_info_url_templates('ETHERNET_INFO_URLS', {'ethernet': ethernet}))
 
 
 @register.filter
@@ -405,18 +393,7 @@ def get_ip4_info_links(ip4_address):
     """
     Get the info url(s) for the ipv4 address (string format) expanded from the settings file variable
     """
-    links = ''
-    if settings.IP4_INFO_URLS:
-        # do this for all URLs listed:
-        for info_url in settings.IP4_INFO_URLS:
-            template = Template(build_url_string(info_url))
-            context = Context(
-                {
-                    'ip4': ip4_address,
-                }
-            )
-            links += template.render(context)
-    return mark_safe(links)
+    return mark_safe(_render_info_url_templates('IP4_INFO_URLS', {'ip4': ip4_address}))
 
 
 @register.filter
@@ -424,18 +401,19 @@ def get_ip6_info_links(ip6_address):
     """
     Get the info url(s) for the ipv6 address (string format) expanded from the settings file variable
     """
-    links = ''
-    if settings.IP6_INFO_URLS:
-        # do this for all URLs listed:
-        for info_url in settings.IP6_INFO_URLS:
-            template = Template(build_url_string(info_url))
-            context = Context(
-                {
-                    'ip6': ip6_address,
-                }
-            )
-            links += template.render(context)
-    return mark_safe(links)
+    return mark_safe(_render_info_url_templates('IP6_INFO_URLS', {'ip6': ip6_address}))
+
+
+def _render_info_url_templates(setting_name, values):
+    """
+    Render all info url templates of a settings variable with the values given, and return the links.
+    """
+    templates = get_info_url_templates(setting_name)
+    if not templates:
+        return ''
+    # do this for all URLs listed:
+    context = Context(values)
+    return ''.join(url_template.render(context) for info_url, url_template in templates)
 
 
 @register.filter
@@ -11,6 +11,55 @@
 # more details.  You should have received a copy of the GNU General Public
 # License along with OpenL2M. If not, see <http://www.gnu.org/licenses/>.
 #
-from django.test import TestCase
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from switches.connect.classes import Interface
+from switches.connect.snmp.connector import SnmpConnector
+from switches.connect.snmp.dell.connector import SnmpConnectorDell
+from switches.models import Switch, SwitchGroup
 
 # Create your tests here.
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    DEVICE_CACHE_ALIAS='default',
+    DEVICE_CACHE_COMPRESS=False,
+)
+@mock.patch.object(SnmpConnector, '_set_snmp_session', return_value=True)
+class DeviceCacheTest(SimpleTestCase):
+    """
+    Changes made by the drivers need to be written to the shared device cache.
+    """
+
+    def get_connection(self) -> SnmpConnectorDell:
+        return SnmpConnectorDell(request=None, group=SwitchGroup(id=1, name='test'), switch=Switch(id=1, name='test'))
+
+    def reload(self) -> SnmpConnectorDell:
+        connection = self.get_connection()
+        cached = connection.read_device_cache()
+        self.assertIsNotNone(cached)
+        connection.apply_device_cache(cached)
+        return connection
+
+    def test_untagged_vlan_change_is_cached(self, mock_session):
+        connection = self.get_connection()
+        for index in range(1, 3):
+            interface = Interface(key=str(index))
+            interface.port_id = index
+            interface.untagged_vlan = 1
+            connection.add_interface(interface)
+        connection.save_device_cache()
+
+        # change the vlan on the data loaded from the cache, only the changed interfaces are written:
+        connection = self.reload()
+        with mock.patch.object(SnmpConnectorDell, 'set', return_value=True):
+            self.assertTrue(connection.set_interface_untagged_vlan(connection.interfaces['2'], 10))
+        self.assertEqual(connection._changed_interfaces, {'2'})
+        connection.save_device_cache()
+
+        connection = self.reload()
+        self.assertEqual(connection.interfaces['1'].untagged_vlan, 1)
+        self.assertEqual(connection.interfaces['2'].untagged_vlan, 10)
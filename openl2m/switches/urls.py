@@ -48,6 +48,11 @@ urlpatterns = [
         views.SwitchSearch.as_view(),
         name='switch_search',
     ),
+    path(
+        'locate',
+        views.LocationSearch.as_view(),
+        name='location_search',
+    ),
     path(
         'activity',
         views.SwitchAdminActivity.as_view(),
@@ -73,6 +78,16 @@ urlpatterns = [
         views.SwitchBulkEdit.as_view(),
         name='switch_bulkedit',
     ),
+    path(
+        '<int:group_id>/<int:switch_id>/task/<int:task_id>/',
+        views.TaskStatus.as_view(),
+        name='task_status',
+    ),
+    path(
+        '<int:group_id>/<int:switch_id>/task/<int:task_id>/status/',
+        views.TaskStatusJson.as_view(),
+        name='task_status_json',
+    ),
     path(
         '<int:group_id>/<int:switch_id>/vlan_manage/',
         views.SwitchVlanManage.as_view(),
@@ -98,6 +113,16 @@ urlpatterns = [
         views.SwitchHardwareInfo.as_view(),
         name='switch_hw_info',
     ),
+    path(
+        '<int:group_id>/<int:switch_id>/refresh_status/',
+        views.SwitchRefreshStatus.as_view(),
+        name='switch_refresh_status',
+    ),
+    path(
+        '<int:group_id>/<int:switch_id>/interfaces/',
+        views.SwitchInterfacesTab.as_view(),
+        name='switch_interfaces_tab',
+    ),
     path(
         '<int:group_id>/<int:switch_id>/reload/<str:view>/',
         views.SwitchReload.as_view(),
@@ -148,4 +173,9 @@ urlpatterns = [
         views.InterfaceCmdOutput.as_view(),
         name='interface_cmd_output',
     ),
+    path(
+        '<int:group_id>/<int:switch_id>/<ifname:interface_name>/details/',
+        views.InterfaceDetails.as_view(),
+        name='interface_details',
+    ),
 ]
@@ -14,6 +14,7 @@
 """
 Various utility functions
 """
+from collections import OrderedDict
 import datetime
 import ipaddress
 from ipware import get_client_ip
@@ -22,6 +23,9 @@ import pprint
 import pytz
 import re
 import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from django.conf import settings
 from django.http import HttpResponse
@@ -326,6 +330,7 @@ def string_contains_regex(string: str, regex: str) -> bool:
 
 def get_ip_dns_name(ip: str) -> str:
     """Get the DNS PTR (reverse name) for the given IP4 or IP6 address.
+    The result is cached, see resolve_ip_dns_names() to look up many addresses at once.
 
     Args:
         ip(str):    string representing the IP address.
@@ -333,14 +338,101 @@ def get_ip_dns_name(ip: str) -> str:
     Return:
         (str): either the FQDN for the ip address, or an empty string if not found.
     """
+    return resolve_ip_dns_names(ips=[ip]).get(str(ip), '')
+
+
+# the reverse dns lookups run in this pool of threads, see resolve_ip_dns_names()
+_dns_executor = None
+_dns_lock = threading.Lock()
+_dns_pending = {}  # the lookups in progress, ip -> Future()
+# the results of the lookups, per process, in least-recently-used order. ip -> (hostname, expiry time)
+# These are not in the device cache, as the arp table of a single router could push out all device data.
+_dns_cache = OrderedDict()
+
+
+def _get_cached_dns_name(ip: str) -> str | None:
+    """Get the cached reverse name of an address, or None if not cached (anymore).
+    Call with _dns_lock held.
+    """
+    entry = _dns_cache.get(ip, None)
+    if entry is None:
+        return None
+    if entry[1] < time.time():
+        del _dns_cache[ip]
+        return None
+    _dns_cache.move_to_end(ip)
+    return entry[0]
+
+
+def _resolve_ip_dns_name(ip: str) -> str:
+    """Do the actual reverse lookup, in a worker thread, and cache the result.
+    The cache keeps negative results (not found) shorter than positive results.
+    """
     try:
         # we use 'name required' to force an exception if reverse lookup not found:
-        (hostname, port_name) = socket.getnameinfo((str(ip), 0), socket.NI_NAMEREQD)
+        (hostname, port_name) = socket.getnameinfo((ip, 0), socket.NI_NAMEREQD)
     except Exception:
         hostname = ''
+    timeout = settings.DNS_CACHE_TIMEOUT if hostname else settings.DNS_NEGATIVE_CACHE_TIMEOUT
+    with _dns_lock:
+        if timeout and settings.DNS_CACHE_SIZE:
+            _dns_cache[ip] = (hostname, time.time() + timeout)
+            _dns_cache.move_to_end(ip)
+            while len(_dns_cache) > settings.DNS_CACHE_SIZE:
+                _dns_cache.popitem(last=False)
+        _dns_pending.pop(ip, None)
     return hostname
 
 
+def resolve_ip_dns_names(ips: list, deadline: float = 0) -> dict:
+    """Get the DNS PTR (reverse name) for many IP4 or IP6 addresses at once.
+    Cached names are returned right away, the others are looked up in parallel,
+    using a process-wide pool of settings.DNS_RESOLVER_WORKERS threads.
+    Lookups that are not done before the deadline return an empty name,
+    but continue in the background, so the name is found from the cache the next time.
+
+    Args:
+        ips (list): the IP addresses, as strings or netaddr objects.
+        deadline (float): the time.time() when we stop waiting for lookups.
+                          If 0, use settings.DNS_RESOLVE_TIME_BUDGET seconds from now.
+
+    Return:
+        (dict): for each ip address (str), the FQDN or an empty string if not found (or not in time).
+    """
+    global _dns_executor
+    ips = list(dict.fromkeys(str(ip) for ip in ips))
+    if not ips:
+        return {}
+    if not deadline:
+        deadline = time.time() + settings.DNS_RESOLVE_TIME_BUDGET
+    names = {}
+    futures = {}
+    with _dns_lock:
+        if _dns_executor is None:
+            _dns_executor = ThreadPoolExecutor(
+                max_workers=settings.DNS_RESOLVER_WORKERS, thread_name_prefix='openl2m-dns'
+            )
+        for ip in ips:
+            hostname = _get_cached_dns_name(ip)
+            if hostname is not None:
+                names[ip] = hostname
+            else:
+                # re-use a lookup already in progress, e.g. from another page:
+                future = _dns_pending.get(ip, None)
+                if future is None:
+                    future = _dns_executor.submit(_resolve_ip_dns_name, ip)
+                    _dns_pending[ip] = future
+                futures[future] = ip
+    if futures:
+        (done, not_done) = wait(futures.keys(), timeout=max(deadline - time.time(), 0))
+        for future in done:
+            names[futures[future]] = future.result()
+        for future in not_done:
+            dprint(f"resolve_ip_dns_names(): no answer in time for {futures[future]}")
+            names[futures[future]] = ''
+    return names
+
+
 def get_choice_name(choice_list: list, choice) -> str:
     """Get the name of a choice
 
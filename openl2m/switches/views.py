@@ -18,7 +18,7 @@ import re
 from django.conf import settings
 from django.shortcuts import get_object_or_404, render
 from django.contrib.auth.models import User
-from django.http import FileResponse
+from django.http import FileResponse, JsonResponse
 from django.urls import reverse
 from django.utils.html import mark_safe
 from django.core.paginator import Paginator
@@ -46,6 +46,7 @@ from switches.models import (
     Switch,
     SwitchGroup,
     Log,
+    Task,
 )
 from switches.constants import (
     LOG_TYPE_VIEW,
@@ -85,18 +86,32 @@ from switches.constants import (
     BULKEDIT_POE_DOWN,
     BULKEDIT_POE_UP,
     LOG_TYPE_WARNING,
+    LOG_VIEW_LOCATION_SEARCH,
     INTERFACE_STATUS_CHANGE,
     INTERFACE_STATUS_DOWN,
     INTERFACE_STATUS_UP,
+    TASK_TYPE_BULKEDIT,
+)
+from switches.connect.connector import (
+    clear_switch_cache,
+    clear_device_cache,
+    get_device_cache_generation,
+    is_device_refreshing,
+    start_device_refresh,
 )
-from switches.connect.connector import clear_switch_cache
 from switches.connect.connect import get_connection_object
 from switches.connect.constants import (
     POE_PORT_ADMIN_ENABLED,
     POE_PORT_ADMIN_DISABLED,
 )
 from switches.download import create_eth_neighbor_xls_file, create_interfaces_xls_file
-from switches.permissions import get_group_and_switch, get_connection_if_permitted, get_my_device_groups
+from switches.locations import find_ethernet_locations
+from switches.permissions import (
+    get_group_and_switch,
+    get_connection_if_permitted,
+    get_my_device_groups,
+    get_task_if_permitted,
+)
 
 from switches.stats import get_environment_info, get_database_info, get_usage_info
 
@@ -291,6 +306,50 @@ class SwitchSearch(LoginRequiredMixin, View):
         )
 
 
+class LocationSearch(LoginRequiredMixin, View):
+    """
+    search for the location of an ethernet or IP address, in the location index, see switches/locations.py
+    """
+
+    def get(
+        self,
+        request,
+    ):
+        dprint("LocationSearch() - GET called")
+
+        if not settings.LOCATIONS_HARVEST:
+            # we should not be here!
+            return redirect(reverse("switches:groups"))
+
+        search = str(request.GET.get("search", "")).strip()
+        results = []
+        warning = False
+        if search:
+            log = Log(
+                user=request.user,
+                ip_address=get_remote_ip(request),
+                action=LOG_VIEW_LOCATION_SEARCH,
+                description=f"Searching for location of '{ search }'",
+                type=LOG_TYPE_VIEW,
+            )
+            log.save()
+            results = find_ethernet_locations(search=search, groups=get_my_device_groups(request=request))
+            if results is None:
+                results = []
+                warning = f"{search} - This is not an ethernet or IP address!"
+
+        return render(
+            request,
+            "locate.html",
+            {
+                'warning': warning,
+                'search': search,
+                'results': results,
+                'results_count': len(results),
+            },
+        )
+
+
 class SwitchBasics(LoginRequiredMixin, View):
     """
     "basic" switch view, i.e. interface data only.
@@ -325,6 +384,26 @@ class SwitchDetails(LoginRequiredMixin, View):
         return switch_view(request=request, group_id=group_id, switch_id=switch_id, view="arp_lldp")
 
 
+class InterfaceDetails(LoginRequiredMixin, View):
+    """
+    "details" view of a single interface, i.e. with the Ethernet/ARP/LLDP data of this interface only.
+    This only reads the parts of the device tables for this interface, see Connector.get_interface_client_data()
+    """
+
+    def get(
+        self,
+        request,
+        group_id,
+        switch_id,
+        interface_name,
+    ):
+        dprint("InterfaceDetails() - GET called")
+        counter_increment(COUNTER_DETAILVIEWS)
+        return switch_view(
+            request=request, group_id=group_id, switch_id=switch_id, view="arp_lldp", interface_name=interface_name
+        )
+
+
 class SwitchHardwareInfo(LoginRequiredMixin, View):
     """
     "hardware info" switch view, i.e. read detailed system hardware ("entity") data.
@@ -434,7 +513,46 @@ def switch_view(
             log.save()
             return error_page(request=request, group=group, switch=switch, error=conn.error)
 
-    if view == "arp_lldp":
+    if (
+        view == "arp_lldp"
+        and not interface_name
+        and settings.CLIENT_DATA_CACHE_MAX_AGE
+        and conn.cache_loaded
+        and time.time() - conn.client_data_read_timestamp < settings.CLIENT_DATA_CACHE_MAX_AGE
+    ):
+        # the client data was recently read, e.g. by the poller (see "manage.py poll_switches"), show that:
+        dprint("ARP-LLDP Info from cache")
+        conn.eth_addr_count = sum(len(iface.eth) for iface in conn.interfaces.values())
+        conn.neighbor_count = sum(len(iface.lldp) for iface in conn.interfaces.values())
+    elif view == "arp_lldp" and interface_name:
+        # the client data of a single interface:
+        iface = conn.get_interface_by_key(interface_name)
+        if not iface or not iface.visible:
+            log.type = LOG_TYPE_ERROR
+            log.description = f"Interface {interface_name} not found!"
+            log.save()
+            error = Error()
+            error.status = True
+            error.description = "Interface not found!"
+            return error_page(request=request, group=group, switch=switch, error=error)
+        log.if_name = iface.name
+        # catch errors in case not trapped in drivers
+        try:
+            if not conn.get_interface_client_data(iface):
+                log.type = LOG_TYPE_ERROR
+                log.description = "ERROR get_interface_client_data()"
+                log.save()
+            dprint("Interface ARP-LLDP Info OK")
+        except Exception as e:
+            log.type = LOG_TYPE_ERROR
+            log.description = (
+                f"CAUGHT UNTRAPPED ERROR in get_interface_client_data(): {repr(e)} ({str(type(e))})\n"
+                f"{traceback.format_exc()}"
+            )
+            dprint(log.description)
+            log.save()
+            return error_page(request=request, group=group, switch=switch, error=conn.error)
+    elif view == "arp_lldp":
         # catch errors in case not trapped in drivers
         try:
             if not conn.get_client_data():
@@ -457,6 +575,19 @@ def switch_view(
     # done with reading switch data, so save cachable/session data
     conn.save_cache()
 
+    # cached data that is getting old is shown right away, and read again in the background:
+    data_age = int(time.time() - conn.basic_info_read_timestamp)
+    refreshing = False
+    if (
+        settings.DEVICE_CACHE_SOFT_TTL
+        and conn.cache_loaded
+        and data_age > settings.DEVICE_CACHE_SOFT_TTL
+        and view == "basic"
+        and command_id == -1
+        and not command_string
+    ):
+        refreshing = start_device_refresh(conn)
+
     # does this switch have any commands defined?
     cmd = False
     # check that we can process commands, and have valid commands assigned to switch
@@ -548,14 +679,131 @@ def switch_view(
             "log_title": log_title,
             "logs_link": True,
             "view": view,
+            "client_interface": interface_name if view == "arp_lldp" else "",
             "cmd": cmd,
             "bulk_edit": bulk_edit,
             "edit_vlans": edit_vlans,
             "time_since_last_read": time_since_last_read,
+            "data_age": data_age,
+            "refreshing": refreshing,
         },
     )
 
 
+class SwitchRefreshStatus(LoginRequiredMixin, View):
+    """
+    Return the state of the background refresh of the device data (see switch_view()) as JSON.
+    The page polls this, and loads the new interface table when the refresh is done.
+    """
+
+    def get(
+        self,
+        request,
+        group_id,
+        switch_id,
+    ):
+        group, switch = get_group_and_switch(request=request, group_id=group_id, switch_id=switch_id)
+        if group is None or switch is None:
+            counter_increment(COUNTER_ACCESS_DENIED)
+            return JsonResponse({"error": "Access denied!"}, status=403)
+        return JsonResponse(
+            {
+                "refreshing": bool(is_device_refreshing(switch.id)),
+                "generation": get_device_cache_generation(switch.id),
+            }
+        )
+
+
+class SwitchInterfacesTab(LoginRequiredMixin, View):
+    """
+    Return the interface table of a device from the (refreshed) cache, to update the page.
+    This is not logged, the page view itself already is.
+    """
+
+    def get(
+        self,
+        request,
+        group_id,
+        switch_id,
+    ):
+        group, switch = get_group_and_switch(request=request, group_id=group_id, switch_id=switch_id)
+        if group is None or switch is None:
+            counter_increment(COUNTER_ACCESS_DENIED)
+            error = Error()
+            error.status = True
+            error.description = "Access denied!"
+            return error_page(request=request, group=False, switch=False, error=error)
+        try:
+            conn = get_connection_object(request, group, switch)
+            if not conn.get_basic_info():
+                return error_page(request=request, group=group, switch=switch, error=conn.error)
+        except Exception:
+            error = Error()
+            error.description = "We could not communicate with this device."
+            error.details = traceback.format_exc()
+            return error_page(request=request, group=group, switch=switch, error=error)
+        conn.save_cache()
+        return render(
+            request,
+            "_tab_if_basics.html",
+            {
+                "group": group,
+                "switch": switch,
+                "connection": conn,
+            },
+        )
+
+
+class TaskStatus(LoginRequiredMixin, View):
+    """
+    Show the progress and results of a background task, e.g. a bulk edit.
+    The page polls TaskStatusJson() until the task is finished.
+    """
+
+    def get(
+        self,
+        request,
+        group_id,
+        switch_id,
+        task_id,
+    ):
+        task = get_task_if_permitted(request=request, group_id=group_id, switch_id=switch_id, task_id=task_id)
+        if task is None:
+            counter_increment(COUNTER_ACCESS_DENIED)
+            error = Error()
+            error.status = True
+            error.description = "Access denied!"
+            return error_page(request=request, group=False, switch=False, error=error)
+        return render(
+            request,
+            "task.html",
+            {
+                "group": task.group,
+                "switch": task.switch,
+                "task": task,
+            },
+        )
+
+
+class TaskStatusJson(LoginRequiredMixin, View):
+    """
+    Return the progress and results of a background task as JSON.
+    """
+
+    def get(
+        self,
+        request,
+        group_id,
+        switch_id,
+        task_id,
+    ):
+        task = get_task_if_permitted(request=request, group_id=group_id, switch_id=switch_id, task_id=task_id)
+        if task is None:
+            counter_increment(COUNTER_ACCESS_DENIED)
+            return JsonResponse({"error": "Access denied!"}, status=403)
+        return JsonResponse(task.as_dict())
+
+
 #
 # Bulk Edit interfaces on a switch
 #
@@ -703,6 +951,27 @@ class SwitchBulkEdit(LoginRequiredMixin, View):
             if interface:
                 interfaces[if_key] = interface.name
 
+        if settings.BULKEDIT_TASKS:
+            # run by the task worker, outside of this web request, and show the progress:
+            task = Task.objects.create(
+                type=TASK_TYPE_BULKEDIT,
+                user=request.user,
+                group=group,
+                switch=switch,
+                ip_address=remote_ip,
+                description=f"Bulk Edit of {len(interfaces)} interfaces",
+                arguments={
+                    "interface_change": interface_change,
+                    "poe_choice": poe_choice,
+                    "new_pvid": new_pvid,
+                    "new_description": new_description,
+                    "new_description_type": new_description_type,
+                    "interfaces": interfaces,
+                },
+                interface_count=len(interfaces),
+            )
+            return redirect("switches:task_status", group_id=group.id, switch_id=switch.id, task_id=task.id)
+
         # handle regular submit, execute now!
         results = bulkedit_processor(
             request=request,
@@ -746,19 +1015,27 @@ def bulkedit_processor(
     new_description,
     new_description_type,
     interfaces,
+    task=None,
 ):
     """
     Function to handle the bulk edit processing, from form-submission or scheduled job.
     This will log each individual action per interface.
     Returns the number of successful action, number of error actions, and
     a list of outputs with text information about each action.
+    When run as a Task() by the task worker (see "manage.py run_tasks"), request is None, the user and ip address
+    come from the task, and the progress and outputs of each interface are saved in the task.
     """
 
-    remote_ip = get_remote_ip(request)
+    if request:
+        user = request.user
+        remote_ip = get_remote_ip(request)
+    else:
+        user = task.user
+        remote_ip = task.ip_address
 
     # log bulk edit arguments:
     log = Log(
-        user=request.user,
+        user=user,
         switch=switch,
         group=group,
         ip_address=remote_ip,
@@ -785,6 +1062,9 @@ def bulkedit_processor(
     error_count = 0
     outputs = []  # description of any errors found
     for if_key, name in interfaces.items():
+        if task:
+            # save the results of the previous interface, and show we are working on this one:
+            save_task_progress(task, outputs, success_count, error_count, next_interface=(if_key, name))
         iface = conn.get_interface_by_key(if_key)
         if not iface:
             error_count += 1
@@ -796,7 +1076,7 @@ def bulkedit_processor(
         # start with UP/DOWN state:
         if interface_change != INTERFACE_STATUS_NONE:
             log = Log(
-                user=request.user,
+                user=user,
                 ip_address=remote_ip,
                 if_name=iface.name,
                 switch=switch,
@@ -850,7 +1130,7 @@ def bulkedit_processor(
                 outputs.append(f"Interface {iface.name}: Ignored - not PoE capable")
             else:
                 log = Log(
-                    user=request.user,
+                    user=user,
                     ip_address=remote_ip,
                     if_name=iface.name,
                     switch=switch,
@@ -953,7 +1233,7 @@ def bulkedit_processor(
             if iface.lacp_master_index > 0:
                 # LACP member interface, we cannot edit the vlan!
                 log = Log(
-                    user=request.user,
+                    user=user,
                     ip_address=remote_ip,
                     if_name=iface.name,
                     switch=switch,
@@ -967,7 +1247,7 @@ def bulkedit_processor(
             else:
                 # make sure we cast the proper type here! Ie this needs an Integer()
                 log = Log(
-                    user=request.user,
+                    user=user,
                     ip_address=remote_ip,
                     if_name=iface.name,
                     switch=switch,
@@ -1025,7 +1305,7 @@ def bulkedit_processor(
             # To be implemented
 
             log = Log(
-                user=request.user,
+                user=user,
                 ip_address=remote_ip,
                 if_name=iface.name,
                 switch=switch,
@@ -1039,7 +1319,10 @@ def bulkedit_processor(
                 log.description = f"Interface {iface.name}: Descr ERROR: {conn.error.description}"
                 log.save()
                 counter_increment(COUNTER_ERRORS)
-                return error_page(request, group, switch, conn.error)
+                if request:
+                    return error_page(request, group, switch, conn.error)
+                outputs.append(log.description)
+                continue
             else:
                 success_count += 1
                 log.type = LOG_TYPE_CHANGE
@@ -1048,9 +1331,12 @@ def bulkedit_processor(
             outputs.append(log.description)
             log.save()
 
+    if task:
+        save_task_progress(task, outputs, success_count, error_count)
+
     # log final results
     log = Log(
-        user=request.user,
+        user=user,
         ip_address=remote_ip,
         switch=switch,
         group=group,
@@ -1072,6 +1358,25 @@ def bulkedit_processor(
     return results
 
 
+def save_task_progress(task, outputs: list, success_count: int, error_count: int, next_interface: tuple = None):
+    """
+    Save the progress of a bulk edit Task(), see bulkedit_processor().
+    The outputs and errors since the previous call belong to the last interface in task.results.
+    If next_interface is given as (key, name), this is added as the interface being worked on.
+    """
+    if task.results:
+        result = task.results[-1]
+        result["outputs"] = outputs[sum(len(item["outputs"]) for item in task.results[:-1]) :]
+        result["errors"] = error_count - sum(item["errors"] for item in task.results[:-1])
+    task.interfaces_done = len(task.results)
+    if next_interface:
+        (key, name) = next_interface
+        task.results.append({"key": key, "name": name, "outputs": [], "errors": 0})
+    task.success_count = success_count
+    task.error_count = error_count
+    task.save(update_fields=["results", "interfaces_done", "success_count", "error_count"])
+
+
 #
 # Manage vlans on a device
 #
@@ -1701,6 +2006,7 @@ class SwitchReload(LoginRequiredMixin, View):
         log.save()
 
         clear_switch_cache(request)
+        clear_device_cache(switch.id)
         counter_increment(COUNTER_VIEWS)
 
         return switch_view(request=request, group_id=group_id, switch_id=switch_id, view=view)
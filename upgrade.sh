@@ -127,6 +127,9 @@ echo
 echo "Updating Wireshark Ethernet database..."
 COMMAND="python3 openl2m/lib/manuf/manuf/manuf.py --update"
 eval $COMMAND || exit 1
+# and build the compiled index of it, for fast vendor lookups:
+COMMAND="python3 openl2m/lib/manuf/manuf/index.py"
+eval $COMMAND || exit 1
 
 # All done!
 echo